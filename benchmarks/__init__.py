@@ -0,0 +1 @@
+"""Performance benchmarks for the MCP Customer Service Assistant."""
@@ -0,0 +1,84 @@
+"""Benchmark: account value from JSON lists vs. compact NumPy input.
+
+Run with:
+    poetry run python -m benchmarks.bench_account_value --purchases 100000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.account_value import (
+    decode_purchases,
+    encode_purchases,
+    summarize_cohort,
+    summarize_purchases,
+)
+
+
+def python_path(payload: str) -> dict:
+    """The original tool: parse a JSON list and ``sum()`` it."""
+    purchases = json.loads(payload)
+    total = sum(purchases)
+    return {
+        "total_value": round(total, 2),
+        "average_purchase": round(total / len(purchases), 2),
+    }
+
+
+def time_calls(fn, calls: int) -> float:
+    """Return the mean seconds per call of ``fn`` over ``calls`` runs."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--purchases", type=int, default=100_000)
+    parser.add_argument("--customers", type=int, default=1_000)
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    amounts = np.round(rng.uniform(1, 500, args.purchases), 2)
+    as_json = json.dumps(amounts.tolist())
+    as_b64 = encode_purchases(amounts)
+
+    expected = python_path(as_json)
+    actual = summarize_purchases("c", decode_purchases(as_b64))
+    assert expected["total_value"] == actual["total_value"], "totals disagree"
+    assert expected["average_purchase"] == actual["average_purchase"]
+
+    json_seconds = time_calls(lambda: python_path(as_json), args.calls)
+    b64_seconds = time_calls(
+        lambda: summarize_purchases("c", decode_purchases(as_b64)), args.calls
+    )
+
+    # A cohort: every customer's purchases concatenated
+    counts = np.full(args.customers, args.purchases // args.customers)
+    ids = [str(i) for i in range(args.customers)]
+    cohort_amounts = amounts[: counts.sum()]
+    cohort_seconds = time_calls(
+        lambda: summarize_cohort(ids, counts, cohort_amounts), args.calls
+    )
+    per_customer_seconds = time_calls(
+        lambda: [
+            python_path(json.dumps(chunk.tolist()))
+            for chunk in np.split(cohort_amounts, args.customers)
+        ],
+        max(1, args.calls // 5),
+    )
+
+    print(f"Payload size (JSON / base64): {len(as_json):,} / {len(as_b64):,} bytes")
+    print(f"JSON list + sum():            {json_seconds * 1e3:10.2f} ms")
+    print(f"base64 + NumPy:               {b64_seconds * 1e3:10.2f} ms")
+    print(f"Cohort, one call per customer:{per_customer_seconds * 1e3:10.2f} ms")
+    print(f"Cohort, vectorized:           {cohort_seconds * 1e3:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
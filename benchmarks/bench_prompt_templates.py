@@ -0,0 +1,133 @@
+"""Benchmark: customer service prompt rendering, f-string vs compiled templates.
+
+Run with:
+    poetry run python -m benchmarks.bench_prompt_templates --renders 200000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from src.prompt_templates import PromptTemplate, PromptTemplateRegistry, format_steps
+
+ISSUE_TYPES = ["Billing", "Account Access", "Shipping", "Refund", "Technical"]
+STEPS = {
+    "Billing": ["Check the invoice", "Confirm the charge", "Issue a refund"],
+    "Account Access": ["Reset your password", "Clear browser cache"],
+    "Shipping": ["Check the tracking number", "Contact the carrier"],
+    "Refund": ["Confirm the order", "Process the refund", "Send a receipt"],
+    "Technical": ["Restart the app", "Update to the latest version"],
+}
+
+
+def fstring_prompt(customer_name: str, issue_type: str, resolution_steps) -> str:
+    """The original ``customer_service_response`` prompt body."""
+    if isinstance(resolution_steps, str):
+        try:
+            resolution_steps = json.loads(resolution_steps)
+        except ValueError:
+            resolution_steps = resolution_steps.splitlines()
+
+    steps_text = "\n".join(
+        [f"{i+1}. {step}" for i, step in enumerate(resolution_steps)]
+    )
+
+    return f"""
+You are a professional customer service representative.
+Generate a helpful and empathetic response for the customer.
+
+Customer: {customer_name}
+Issue Type: {issue_type}
+
+Resolution Steps:
+{steps_text}
+
+Guidelines:
+- Be professional but warm
+- Acknowledge the customer's concern
+- Provide clear, actionable steps
+- End with an offer for further assistance
+- Keep the tone positive and solution-focused
+
+Generate a complete customer service response
+following these guidelines.
+"""
+
+
+def template_prompt(registry: PromptTemplateRegistry, steps_formatter):
+    """The new prompt body: cached steps plus a registry template render."""
+
+    def render(customer_name: str, issue_type: str, resolution_steps) -> str:
+        if not isinstance(resolution_steps, str):
+            resolution_steps = tuple(resolution_steps)
+        template = registry.get("customer_service_response")
+        return template.render(
+            customer_name=customer_name,
+            issue_type=issue_type,
+            steps_text=steps_formatter(resolution_steps),
+        )
+
+    return render
+
+
+def time_calls(fn, calls: list[tuple]) -> float:
+    """Return the seconds taken to render every argument tuple in ``calls``."""
+    start = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--renders", type=int, default=200_000)
+    parser.add_argument("--customers", type=int, default=20)
+    args = parser.parse_args()
+
+    # MCP clients send the steps as a JSON-encoded string
+    rng = random.Random(42)
+    calls = []
+    for _ in range(args.renders):
+        issue_type = rng.choice(ISSUE_TYPES)
+        calls.append(
+            (
+                f"Customer {rng.randrange(args.customers)}",
+                issue_type,
+                json.dumps(STEPS[issue_type]),
+            )
+        )
+
+    memoized = template_prompt(PromptTemplateRegistry(), format_steps)
+    uncached = PromptTemplateRegistry(cache_size=0)
+    compiled = template_prompt(uncached, format_steps.__wrapped__)
+    for call in calls[:100]:
+        assert memoized(*call) == compiled(*call) == fstring_prompt(*call)
+    template = uncached.get("customer_service_response")
+    bare = PromptTemplate(template.name, template.source, cache_size=0).render
+    steps_text = format_steps(calls[0][2])
+
+    results = [
+        ("f-string", time_calls(fstring_prompt, calls)),
+        ("compiled", time_calls(compiled, calls)),
+        ("memoized", time_calls(memoized, calls)),
+    ]
+    baseline = results[0][1]
+    print(f"{args.renders:,} prompts, {args.customers * len(STEPS)} distinct")
+    for label, seconds in results:
+        print(
+            f"{label:<10} {args.renders / seconds:12,.0f} prompts/s  "
+            f"{seconds / args.renders * 1e6:6.2f} µs/prompt  "
+            f"{baseline / seconds:5.2f}x"
+        )
+    seconds = time_calls(
+        lambda name, issue, _: bare(
+            customer_name=name, issue_type=issue, steps_text=steps_text
+        ),
+        calls,
+    )
+    print(f"template body alone: {seconds / args.renders * 1e6:6.2f} µs/render")
+
+
+if __name__ == "__main__":
+    main()
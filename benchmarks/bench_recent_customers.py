@@ -0,0 +1,95 @@
+"""Benchmark: indexed recency store vs. sorting the whole table per call.
+
+Run with:
+    poetry run python -m benchmarks.bench_recent_customers --customers 1000000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from src.customer_store import CustomerStore
+from src.models import Customer
+
+
+def build_customers(count: int, seed: int = 42) -> list[Customer]:
+    """Generate ``count`` customers with random last-interaction times."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    customers = []
+    for i in range(count):
+        last_interaction = (
+            now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+            if rng.random() > 0.1
+            else None
+        )
+        customers.append(
+            Customer.model_construct(
+                id=str(i),
+                name=f"Customer {i}",
+                email=f"customer{i}@example.com",
+                phone=None,
+                account_status="active",
+                last_interaction=last_interaction,
+            )
+        )
+    return customers
+
+
+def sort_path(customers: dict[str, Customer], limit: int) -> list[Customer]:
+    """The original ``get_recent_customers`` implementation."""
+    sorted_customers = sorted(
+        customers.values(),
+        key=lambda c: c.last_interaction or datetime.min,
+        reverse=True,
+    )
+    return sorted_customers[:limit]
+
+
+def time_calls(fn, calls: int) -> float:
+    """Return the mean seconds per call of ``fn`` over ``calls`` runs."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Building {args.customers:,} customers...")
+    customers = build_customers(args.customers)
+    as_dict = {c.id: c for c in customers}
+
+    start = time.perf_counter()
+    store = CustomerStore(customers)
+    build_seconds = time.perf_counter() - start
+
+    # Both paths must agree on which timestamps come back
+    expected = [c.last_interaction for c in sort_path(as_dict, args.limit)]
+    actual = [c.last_interaction for c in store.recent(args.limit)]
+    assert expected == actual, "indexed store disagrees with the sort path"
+
+    sort_seconds = time_calls(lambda: sort_path(as_dict, args.limit), args.calls)
+    index_seconds = time_calls(lambda: store.recent(args.limit), args.calls * 1000)
+
+    ids = list(as_dict)
+    rng = random.Random(7)
+    update_seconds = time_calls(
+        lambda: store.record_interaction(rng.choice(ids)), args.calls * 100
+    )
+
+    print(f"Index build:            {build_seconds * 1e3:10.1f} ms (one-off)")
+    print(f"Sort path per call:     {sort_seconds * 1e6:10.1f} µs")
+    print(f"Indexed path per call:  {index_seconds * 1e6:10.1f} µs")
+    print(f"Record interaction:     {update_seconds * 1e6:10.1f} µs")
+    print(f"Speedup:                {sort_seconds / index_seconds:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
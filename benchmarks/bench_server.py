@@ -0,0 +1,303 @@
+"""Benchmark: latency and throughput of the real MCP server over stdio and HTTP.
+
+Starts ``src/main.py`` as a subprocess, drives each operation with
+``--concurrency`` in-flight requests and reports p50/p95/p99 latency and
+throughput. Results can be saved as a baseline and diffed on later runs.
+
+Run with:
+    poetry run python -m benchmarks.bench_server --requests 500 --concurrency 32
+    poetry run python -m benchmarks.bench_server --save benchmarks/baseline.json
+    poetry run python -m benchmarks.bench_server --compare benchmarks/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List
+
+from src.server_connections import MCPServerConnection
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Metrics compared against a baseline, and whether higher is better
+COMPARED_METRICS = {
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "throughput_rps": True,
+}
+
+
+def build_operations(session) -> Dict[str, Callable[[int], Awaitable]]:
+    """Return the benchmarked requests, keyed by the name used in reports."""
+    return {
+        "get_customer_info": lambda i: session.read_resource("customer://12345"),
+        "get_recent_customers": lambda i: session.call_tool(
+            "get_recent_customers", {"limit": 10}
+        ),
+        "create_support_ticket": lambda i: session.call_tool(
+            "create_support_ticket",
+            {
+                "request": {
+                    "customer_id": "12345",
+                    "subject": f"Benchmark ticket {i}",
+                    "description": "Generated by bench_server",
+                    "priority": "normal",
+                }
+            },
+        ),
+        "calculate_account_value": lambda i: session.call_tool(
+            "calculate_account_value",
+            {"customer_id": "12345", "purchase_history": [19.99, 5.0, 120.5] * 10},
+        ),
+        "customer_service_response": lambda i: session.get_prompt(
+            "customer_service_response",
+            {
+                "customer_name": "Alice Johnson",
+                "issue_type": "Account Access",
+                "resolution_steps": json.dumps(
+                    ["Reset your password", "Try logging in again"]
+                ),
+            },
+        ),
+    }
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, wall_seconds: float) -> dict:
+    """Reduce per-request latencies (seconds) to the reported metrics."""
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50) * 1e3, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1e3, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1e3, 3),
+        "throughput_rps": round(len(latencies) / wall_seconds, 1),
+    }
+
+
+async def run_operation(
+    operation: Callable[[int], Awaitable], requests: int, concurrency: int
+) -> dict:
+    """Issue ``requests`` calls with at most ``concurrency`` in flight."""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                result = await operation(i)
+            except Exception:
+                errors += 1
+                continue
+            if getattr(result, "isError", False):
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [REPO_ROOT, env.get("PYTHONPATH")])
+    )
+    return env
+
+
+async def connect_http(url: str, timeout: float) -> MCPServerConnection:
+    """Connect to an HTTP server, retrying until it accepts connections."""
+    deadline = time.monotonic() + timeout
+    while True:
+        connection = MCPServerConnection("bench-http", {"url": url})
+        try:
+            await connection.connect(timeout)
+            return connection
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.25)
+
+
+async def bench_transport(transport: str, args) -> Dict[str, dict]:
+    """Start a server on ``transport`` and benchmark every operation."""
+    process = None
+    if transport == "stdio":
+        config = {
+            "command": sys.executable,
+            "args": [os.path.join("src", "main.py")],
+            "env": server_env(),
+            "cwd": REPO_ROOT,
+        }
+        connection = MCPServerConnection("bench-stdio", config)
+        await connection.connect(args.timeout)
+    else:
+        port = free_port()
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                os.path.join("src", "main.py"),
+                "--transport",
+                "streamable-http",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(port),
+                "--workers",
+                str(args.workers),
+            ],
+            cwd=REPO_ROOT,
+            env=server_env(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        connection = await connect_http(f"http://127.0.0.1:{port}/mcp", args.timeout)
+
+    results = {}
+    try:
+        operations = build_operations(connection.session)
+        for name, operation in operations.items():
+            if args.operations and name not in args.operations:
+                continue
+            # Warm up imports, caches and connections before measuring
+            await run_operation(operation, args.warmup, args.concurrency)
+            results[name] = await run_operation(
+                operation, args.requests, args.concurrency
+            )
+    finally:
+        await connection.close()
+        if process is not None:
+            process.terminate()
+            process.wait()
+    return results
+
+
+def print_results(results: Dict[str, Dict[str, dict]]) -> None:
+    header = (
+        f"{'transport':<16} {'operation':<26} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'req/s':>9} {'errors':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for transport, operations in results.items():
+        for name, m in operations.items():
+            print(
+                f"{transport:<16} {name:<26} {m['p50_ms']:>9.2f} {m['p95_ms']:>9.2f} "
+                f"{m['p99_ms']:>9.2f} {m['throughput_rps']:>9.1f} {m['errors']:>7}"
+            )
+
+
+def compare(
+    results: Dict[str, Dict[str, dict]], baseline: dict, threshold: float
+) -> List[str]:
+    """Print changes against ``baseline`` and return the regressions."""
+    regressions = []
+    print(f"\nChange vs. baseline from {baseline['meta'].get('created', '?')}:")
+    for transport, operations in results.items():
+        for name, metrics in operations.items():
+            before = baseline["results"].get(transport, {}).get(name)
+            if before is None:
+                continue
+            changes = []
+            for metric, higher_is_better in COMPARED_METRICS.items():
+                old, new = before[metric], metrics[metric]
+                if not old:
+                    continue
+                change = (new - old) / old
+                changes.append(f"{metric} {change:+.1%}")
+                worse = -change if higher_is_better else change
+                if worse > threshold:
+                    regressions.append(f"{transport} {name} {metric} {change:+.1%}")
+            print(f"   {transport:<16} {name:<26} " + ", ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "streamable-http"],
+        action="append",
+        help="transport to benchmark (repeatable; default: both)",
+    )
+    parser.add_argument("--operations", nargs="*", help="subset of operations to run")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1, help="HTTP server workers")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--save", help="write results to this baseline JSON file")
+    parser.add_argument("--compare", help="diff results against a baseline JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown reported as a regression",
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for transport in args.transport or ["stdio", "streamable-http"]:
+        print(f"Benchmarking {transport} (concurrency {args.concurrency})...")
+        results[transport] = asyncio.run(bench_transport(transport, args))
+
+    print()
+    print_results(results)
+
+    if args.save:
+        report = {
+            "meta": {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "workers": args.workers,
+            },
+            "results": results,
+        }
+        with open(args.save, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions over {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
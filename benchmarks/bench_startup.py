@@ -0,0 +1,142 @@
+"""Benchmark: MCP server cold start, from spawn to a listed tool set.
+
+Each run starts a fresh stdio server process and times until the client
+has initialized the session and listed the tools, which is what a client
+waits for before its first request. ``--profile-imports`` instead imports
+the server once under ``python -X importtime`` and reports where the time
+goes.
+
+Run with:
+    .venv/bin/python -m benchmarks.bench_startup --runs 5
+    .venv/bin/python -m benchmarks.bench_startup --profile-imports --top 15
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+from src.server_connections import MCPServerConnection
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time: <self us> | <cumulative us> | <indented module name>"
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def server_env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [REPO_ROOT, env.get("PYTHONPATH")])
+    )
+    return env
+
+
+def commands() -> dict:
+    """Server commands to compare, keyed by the label used in the report."""
+    candidates = {"python src/main.py": [sys.executable, "src/main.py"]}
+    poetry = shutil.which("poetry")
+    if poetry:
+        candidates["poetry run python src/main.py"] = [
+            poetry,
+            "run",
+            "python",
+            "src/main.py",
+        ]
+    return candidates
+
+
+async def time_startup(command: list, timeout: float) -> float:
+    """Seconds from spawning ``command`` until its tools are listed."""
+    config = {
+        "command": command[0],
+        "args": command[1:],
+        "env": server_env(),
+        "cwd": REPO_ROOT,
+    }
+    connection = MCPServerConnection("bench-startup", config)
+    start = time.perf_counter()
+    try:
+        await connection.connect(timeout)
+        return time.perf_counter() - start
+    finally:
+        await connection.close()
+
+
+def profile_imports(module: str = "src.main") -> List[Tuple[str, int, int, int]]:
+    """Import ``module`` in a fresh interpreter under ``-X importtime``.
+
+    Returns ``(name, depth, self_us, cumulative_us)`` for every module the
+    import loaded, in load order.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=server_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return modules
+
+
+def format_import_profile(
+    modules: List[Tuple[str, int, int, int]], module: str = "src.main", top: int = 15
+) -> str:
+    """Summarize a ``profile_imports`` result as a small text report."""
+    total = next((c for name, _, _, c in modules if name == module), 0)
+    # importtime lists a module after everything it imported, so the
+    # depth-1 entries just before the top-level module are its direct imports
+    direct, pending = [], []
+    for entry in modules:
+        if entry[1] == 1:
+            pending.append(entry)
+        elif entry[1] == 0:
+            if entry[0] == module:
+                direct = pending
+            pending = []
+    lines = [f"Importing {module}: {total / 1000:.0f} ms", "", "Direct imports:"]
+    for name, _, _, cumulative in sorted(direct, key=lambda m: -m[3])[:top]:
+        lines.append(f"  {cumulative / 1000:8.1f} ms  {name}")
+    lines += ["", "Slowest module bodies:"]
+    for name, _, self_us, _ in sorted(modules, key=lambda m: -m[2])[:top]:
+        lines.append(f"  {self_us / 1000:8.1f} ms  {name}")
+    return "\n".join(lines)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--profile-imports", action="store_true")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    if args.profile_imports:
+        print(format_import_profile(profile_imports(), top=args.top))
+        return
+
+    for label, command in commands().items():
+        # One untimed run so every command starts with warm bytecode caches
+        await time_startup(command, args.timeout)
+        times = [await time_startup(command, args.timeout) for _ in range(args.runs)]
+        print(
+            f"{label:<32} median {statistics.median(times) * 1000:7.0f} ms  "
+            f"min {min(times) * 1000:7.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""Benchmark: ticket ID generation rate, uniqueness and ordering.
+
+Run with:
+    poetry run python -m benchmarks.bench_ticket_ids --ids 1000000 --threads 4
+"""
+
+import argparse
+import threading
+import time
+from datetime import datetime
+
+from src.ticket_ids import TicketIdGenerator
+
+
+def timestamp_id() -> str:
+    """The original ``create_support_ticket`` ID scheme."""
+    return f"TICKET-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+
+def generate(fn, count: int) -> tuple[list[str], float]:
+    """Return ``count`` IDs from ``fn`` and the seconds taken."""
+    start = time.perf_counter()
+    ids = [fn() for _ in range(count)]
+    return ids, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ids", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    old_ids, old_seconds = generate(timestamp_id, args.ids)
+    generator = TicketIdGenerator(worker_id=0)
+    new_ids, new_seconds = generate(generator, args.ids)
+    assert len(set(new_ids)) == len(new_ids), "duplicate ticket IDs"
+    assert new_ids == sorted(new_ids), "ticket IDs out of order"
+
+    # Threads share one generator without a lock
+    per_thread = args.ids // args.threads
+    results = [[] for _ in range(args.threads)]
+    threads = [
+        threading.Thread(
+            target=lambda out=out: out.extend(generate(generator, per_thread)[0])
+        )
+        for out in results
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    threaded_seconds = time.perf_counter() - start
+    threaded_ids = [ticket_id for out in results for ticket_id in out]
+    assert len(set(threaded_ids)) == len(threaded_ids), "duplicate IDs across threads"
+
+    print(
+        f"Timestamp IDs:  {args.ids / old_seconds:12,.0f} IDs/s, "
+        f"{args.ids - len(set(old_ids)):,} duplicates"
+    )
+    print(f"Generator IDs:  {args.ids / new_seconds:12,.0f} IDs/s, 0 duplicates")
+    print(
+        f"{args.threads} threads:      {len(threaded_ids) / threaded_seconds:12,.0f} IDs/s, "
+        f"0 duplicates"
+    )
+
+
+if __name__ == "__main__":
+    main()
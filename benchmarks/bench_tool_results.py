@@ -0,0 +1,86 @@
+"""Benchmark: tool result text for the model, str(content) vs compact encoding.
+
+Run with:
+    poetry run python -m benchmarks.bench_tool_results --customers 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pydantic_core
+from fastmcp.tools.tool import default_serializer
+from mcp.types import CallToolResult, TextContent
+
+from src.models import Customer
+
+# The encoder is a client module, which imports its siblings from src/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+from tool_results import encode_tool_result  # noqa: E402
+
+
+def recent_customers_result(count: int, compact: bool) -> CallToolResult:
+    """A get_recent_customers(limit=count) result as a server sends it.
+
+    ``compact`` matches this server's ``compact_json`` serializer, otherwise
+    FastMCP's indented default.
+    """
+    now = datetime.now()
+    customers = [
+        Customer(
+            id=str(10000 + i),
+            name=f"Customer {i}",
+            email=f"customer{i}@example.com",
+            phone="+1-555-0100" if i % 2 else None,
+            account_status="active" if i % 5 else "suspended",
+            last_interaction=now - timedelta(minutes=i) if i % 3 else None,
+        )
+        for i in range(count)
+    ]
+    if compact:
+        text = pydantic_core.to_json(customers, exclude_none=True).decode()
+    else:
+        text = default_serializer(customers)
+    return CallToolResult(content=[TextContent(type="text", text=text)])
+
+
+def time_calls(fn, repeats: int) -> float:
+    """Return the seconds taken per call of ``fn`` over ``repeats`` calls."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--drop-fields", default="email,phone")
+    args = parser.parse_args()
+
+    indented = recent_customers_result(args.customers, compact=False)
+    compact = recent_customers_result(args.customers, compact=True)
+    drop = args.drop_fields.split(",") if args.drop_fields else []
+    encoders = [
+        ("str(content), indented", lambda: str(indented.content)),
+        ("encoded, indented", lambda: encode_tool_result(indented, ())),
+        ("encoded, compact server", lambda: encode_tool_result(compact, ())),
+        (f"  without {','.join(drop)}", lambda: encode_tool_result(compact, drop)),
+    ]
+
+    print(f"get_recent_customers(limit={args.customers})")
+    baseline = len(encoders[0][1]())
+    for label, encode in encoders:
+        size = len(encode())
+        seconds = time_calls(encode, args.repeats)
+        print(
+            f"{label:<26} {size:10,} chars (~{size // 4:,} tokens)  "
+            f"{size / baseline:6.1%}  {seconds * 1000:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,64 @@
 
 import asyncio
 import json
+import logging
 from contextlib import AsyncExitStack
+from typing import List, Optional
 
-from anthropic import Anthropic
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from anthropic import AsyncAnthropic
+from anthropic.types import ContentBlock
+from pydantic import TypeAdapter
 
+from completion_cache import CompletionCache, completion_key, get_completion_cache
 from config import Config
+from history import compact_history
+from logging_setup import configure_logging, tool_log
+from server_connections import (
+    MCPServerConnection,
+    connect_servers,
+    format_connect_report,
+)
+from tool_execution import ToolCall, ToolCallScheduler, execute_tool_calls
+from tool_result_cache import ToolResultCache
+from tool_results import encode_tool_result
+from tool_schema_cache import ToolSchemaCache, get_tool_schema_cache
+
+logger = logging.getLogger(__name__)
+
+# Rebuilds response content blocks from their cached JSON
+_content_blocks = TypeAdapter(List[ContentBlock])
 
 
 class AnthropicMCPChatBot:
-    def __init__(self, api_key: str):
-        self.anthropic = Anthropic(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        parallel_tool_calls: bool = True,
+        max_tool_concurrency: int = Config.TOOL_CONCURRENCY,
+        stream: bool = Config.STREAM_RESPONSES,
+        connect_timeout: float = Config.SERVER_CONNECT_TIMEOUT,
+        schema_cache: Optional[ToolSchemaCache] = None,
+        completion_cache: Optional[CompletionCache] = None,
+        result_cache: Optional[ToolResultCache] = None,
+        history_budget: int = Config.HISTORY_TOKEN_BUDGET,
+    ):
+        self.anthropic = AsyncAnthropic(api_key=api_key)
+        # Print text deltas and start tools while the response is streaming
+        self.stream = stream
+        # Run the tool_use blocks of one model turn concurrently (or one at a time)
+        self.max_tool_concurrency = max_tool_concurrency if parallel_tool_calls else 1
+        # Per-server limit for startup, initialize and list_tools
+        self.connect_timeout = connect_timeout
+        self.schema_cache = schema_cache or get_tool_schema_cache()
+        # Repeated requests (same messages, model and tools) skip the API call
+        self.completion_cache = (
+            completion_cache if completion_cache is not None else get_completion_cache()
+        )
+        # Results of tools the servers annotate as cacheable
+        self.result_cache = result_cache or ToolResultCache()
+        # Estimated tokens of history sent per request before old tool
+        # results are truncated
+        self.history_budget = history_budget
         self.sessions = []
         self.exit_stack = AsyncExitStack()
         self.available_tools = []
@@ -21,109 +67,203 @@ class AnthropicMCPChatBot:
 
     async def connect_to_server(self, server_name: str, server_config: dict) -> None:
         """Connect to a single MCP server."""
+        connection = MCPServerConnection(server_name, server_config)
         try:
-            server_params = StdioServerParameters(**server_config)
-            stdio_transport = await self.exit_stack.enter_async_context(
-                stdio_client(server_params)
+            await connection.connect(self.connect_timeout)
+        except Exception:
+            pass  # recorded on connection.error
+        self.add_connection(connection)
+
+    def add_connection(self, connection: MCPServerConnection) -> None:
+        """Register a connected server's session and tools."""
+        self.exit_stack.push_async_callback(connection.close)
+        if not connection.connected:
+            logger.warning(
+                "Failed to connect to %s: %r", connection.name, connection.error
             )
-            read, write = stdio_transport
-            session = await self.exit_stack.enter_async_context(
-                ClientSession(read, write)
+            return
+
+        self.sessions.append(connection.session)
+        print(
+            f"Connected to {connection.name} with tools:",
+            [t.name for t in connection.tools],
+        )
+
+        for tool in connection.tools:
+            self.tool_to_session[tool.name] = connection.session
+        self.result_cache.register(connection.tools)
+        # Converted schemas are reused while the server's tool list is unchanged
+        self.available_tools.extend(
+            self.schema_cache.provider_tools(
+                connection.server_id,
+                connection.tools,
+                "anthropic",
+                digest=connection.tools_digest,
             )
-            await session.initialize()
-            self.sessions.append(session)
-
-            # List available tools for this session
-            response = await session.list_tools()
-            tools = response.tools
-            print(f"Connected to {server_name} with tools:", [t.name for t in tools])
-
-            for tool in tools:
-                self.tool_to_session[tool.name] = session
-                self.available_tools.append(
-                    {
-                        "name": tool.name,
-                        "description": tool.description,
-                        "input_schema": tool.inputSchema,
-                    }
-                )
-        except Exception as e:
-            print(f"Failed to connect to {server_name}: {e}")
+        )
 
     async def connect_to_servers(self):
-        """Connect to all configured MCP servers."""
+        """Connect to all configured MCP servers concurrently."""
         try:
             with open("server_config.json", "r") as file:
                 data = json.load(file)
 
             servers = data.get("mcpServers", {})
-            for server_name, server_config in servers.items():
-                await self.connect_to_server(server_name, server_config)
+            connections = await connect_servers(servers, self.connect_timeout)
+            # Register in configuration order so tool precedence is stable
+            for connection in connections:
+                self.add_connection(connection)
+            print(format_connect_report(connections))
         except Exception as e:
             print(f"Error loading server configuration: {e}")
             raise
 
-    async def process_query(self, query: str):
-        """Process a query using Claude with MCP tools."""
-        messages = [{"role": "user", "content": query}]
+    async def call_tool(self, call: ToolCall):
+        """Call a tool on the session that provides it, via the result cache."""
+        session = self.tool_to_session[call.name]
+        return await self.result_cache.call(
+            call.name,
+            call.arguments,
+            lambda: session.call_tool(call.name, arguments=call.arguments),
+        )
 
-        response = self.anthropic.messages.create(
+    def _cache_key(self, messages: list) -> str:
+        return completion_key(
+            "anthropic",
+            Config.ANTHROPIC_MODEL,
+            messages,
+            self.available_tools,
             max_tokens=2024,
-            model=Config.ANTHROPIC_MODEL,
-            tools=self.available_tools,
-            messages=messages,
         )
 
-        process_query = True
-        while process_query:
-            assistant_content = []
-            for content in response.content:
-                if content.type == "text":
-                    print(content.text)
-                    assistant_content.append(content)
-                    if len(response.content) == 1:
-                        process_query = False
-
-                elif content.type == "tool_use":
-                    assistant_content.append(content)
-                    messages.append({"role": "assistant", "content": assistant_content})
-
-                    tool_id = content.id
-                    tool_args = content.input
-                    tool_name = content.name
-
-                    print(f"Calling tool {tool_name} with args {tool_args}")
-
-                    # Use the correct session for this tool
-                    session = self.tool_to_session[tool_name]
-                    result = await session.call_tool(tool_name, arguments=tool_args)
-
-                    messages.append(
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "tool_result",
-                                    "tool_use_id": tool_id,
-                                    "content": result.content,
-                                }
-                            ],
-                        }
-                    )
-
-                    response = self.anthropic.messages.create(
-                        max_tokens=2024,
-                        model=Config.ANTHROPIC_MODEL,
-                        tools=self.available_tools,
-                        messages=messages,
-                    )
-
-                    if (
-                        len(response.content) == 1
-                        and response.content[0].type == "text"
+    async def process_query(self, query: str, use_cache: bool = True):
+        """Process a query using Claude with MCP tools.
+
+        With the completion cache enabled, each model turn is looked up in
+        it first unless ``use_cache`` is False. A cached turn is replayed
+        without a network call; its tool_use blocks still run against the MCP
+        servers.
+        """
+        messages = [{"role": "user", "content": query}]
+
+        while True:
+            compact_history(messages, self.history_budget)
+            key = None
+            if use_cache and self.completion_cache.enabled:
+                key = self._cache_key(messages)
+            cached = await self.completion_cache.get(key) if key else None
+            if self.stream and cached is None:
+                content, outcomes = await self._stream_turn(messages, key)
+            else:
+                content, outcomes = await self._complete_turn(messages, key, cached)
+
+            if not outcomes:
+                break
+
+            messages.append({"role": "assistant", "content": content})
+
+            # Every tool_result for this turn goes back in a single user message
+            tool_results = []
+            for outcome in outcomes:
+                tool_result = {"type": "tool_result", "tool_use_id": outcome.call.id}
+                if outcome.ok:
+                    tool_result["content"] = encode_tool_result(outcome.result)
+                else:
+                    tool_result["content"] = f"Error: {outcome.error}"
+                    tool_result["is_error"] = True
+                tool_results.append(tool_result)
+            messages.append({"role": "user", "content": tool_results})
+
+    async def _complete_turn(
+        self, messages: list, key: Optional[str] = None, cached: Optional[list] = None
+    ):
+        """Request a full response, then run its tool_use blocks concurrently.
+
+        ``cached`` content is used instead of the API; otherwise, with a
+        cache ``key``, the fresh response is stored.
+        """
+        if cached is not None:
+            blocks = _content_blocks.validate_python(cached)
+        else:
+            response = await self.anthropic.messages.create(
+                max_tokens=2024,
+                model=Config.ANTHROPIC_MODEL,
+                tools=self.available_tools,
+                messages=messages,
+            )
+            blocks = response.content
+            if key:
+                await self._store(key, blocks)
+
+        calls = []
+        for content in blocks:
+            if content.type == "text":
+                print(content.text)
+            elif content.type == "tool_use":
+                calls.append(
+                    ToolCall(id=content.id, name=content.name, arguments=content.input)
+                )
+
+        for call in calls:
+            tool_log.info("Calling tool %s with args %s", call.name, call.arguments)
+
+        outcomes = await execute_tool_calls(
+            calls, self.call_tool, self.max_tool_concurrency
+        )
+        return blocks, outcomes
+
+    async def _store(self, key: str, blocks: list) -> None:
+        await self.completion_cache.put(
+            key, [block.model_dump(mode="json", exclude_none=True) for block in blocks]
+        )
+
+    async def _stream_turn(self, messages: list, key: Optional[str] = None):
+        """Stream a response, printing text and starting tools as they finish.
+
+        Each tool_use block starts running as soon as its block stops, while
+        the rest of the message is still streaming. The final content is
+        stored under the cache ``key``, if given.
+        """
+        scheduler = ToolCallScheduler(self.call_tool, self.max_tool_concurrency)
+        mid_line = False
+
+        try:
+            async with self.anthropic.messages.stream(
+                max_tokens=2024,
+                model=Config.ANTHROPIC_MODEL,
+                tools=self.available_tools,
+                messages=messages,
+            ) as stream:
+                async for event in stream:
+                    if event.type == "text":
+                        print(event.text, end="", flush=True)
+                        mid_line = True
+                    elif (
+                        event.type == "content_block_stop"
+                        and event.content_block.type == "tool_use"
                     ):
-                        print(response.content[0].text)
-                        process_query = False
+                        block = event.content_block
+                        call = ToolCall(
+                            id=block.id, name=block.name, arguments=block.input
+                        )
+                        if mid_line:
+                            print()
+                            mid_line = False
+                        tool_log.info(
+                            "Calling tool %s with args %s", call.name, call.arguments
+                        )
+                        scheduler.submit(call)
+                response = await stream.get_final_message()
+        except BaseException:
+            scheduler.cancel()
+            raise
+
+        if mid_line:
+            print()
+        if key:
+            await self._store(key, response.content)
+
+        return response.content, await scheduler.outcomes()
 
     async def chat_loop(self):
         """Run an interactive chat loop"""
@@ -148,6 +288,9 @@ class AnthropicMCPChatBot:
 async def main():
     Config.LLM_PROVIDER = "anthropic"
     Config.validate()
+    configure_logging(
+        Config.LOG_LEVEL, Config.LOG_FORMAT, Config.LOG_TOOL_CALL_SAMPLE_RATE
+    )
 
     chatbot = AnthropicMCPChatBot(api_key=Config.ANTHROPIC_API_KEY)
     try:
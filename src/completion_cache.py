@@ -0,0 +1,191 @@
+"""SQLite-backed cache of LLM completions for the chatbot integrations."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def _plain(value: Any) -> Any:
+    """Reduce messages, including SDK model objects, to plain JSON values."""
+    if hasattr(value, "model_dump"):
+        value = value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def completion_key(
+    provider: str, model: str, messages: list, tools: Optional[list] = None, **params
+) -> str:
+    """Exact-match key for a completion request.
+
+    Covers the provider, model, request parameters, the messages exactly
+    as sent and a hash of the tool schemas, so a changed tool list or any
+    new tool result in the conversation produces a different key.
+    """
+    tools_digest = hashlib.sha256(
+        json.dumps(tools or [], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    payload = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "params": params,
+            "tools": tools_digest,
+            "messages": _plain(messages),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CompletionCache:
+    """Completions stored as JSON by ``completion_key``, with TTL and LRU eviction.
+
+    Entries older than ``ttl`` seconds are treated as missing, and once the
+    cache holds more than ``max_entries`` the least recently used entries
+    are evicted. An empty ``path`` keeps the cache in memory and
+    ``max_entries=0`` disables it. ``get`` and ``put`` run the SQLite work
+    on a thread, so lookups do not block the event loop. SQLite errors are
+    logged and treated as misses, since the cache is an optimization.
+    """
+
+    def __init__(
+        self,
+        path: str = Config.COMPLETION_CACHE_PATH,
+        ttl: float = Config.COMPLETION_CACHE_TTL,
+        max_entries: int = Config.COMPLETION_CACHE_SIZE,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        # Serializes the connection between the threads get and put run on
+        self._lock = threading.Lock()
+        if max_entries > 0:
+            self._connection = self._connect()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether lookups can hit; callers skip building keys otherwise."""
+        return self._connection is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(
+            self.path or ":memory:", isolation_level=None, check_same_thread=False
+        )
+        if self.path:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created REAL NOT NULL, used REAL NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS completions_used ON completions (used)"
+        )
+        return connection
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached completion for ``key``, or None."""
+        if self._connection is None:
+            return None
+        return await asyncio.to_thread(self._get, key)
+
+    def _get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT value FROM completions WHERE key = ? AND created > ?",
+                    (key, now - self.ttl),
+                ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        "UPDATE completions SET used = ? WHERE key = ?", (now, key)
+                    )
+        except sqlite3.Error:
+            logger.warning("Completion cache read failed", exc_info=True)
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    async def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable completion, evicting the oldest if full."""
+        if self._connection is None:
+            return
+        await asyncio.to_thread(self._put, key, json.dumps(value))
+
+    def _put(self, key: str, value: str) -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._connection.execute(
+                    "DELETE FROM completions WHERE created <= ?", (now - self.ttl,)
+                )
+                self._connection.execute(
+                    "DELETE FROM completions WHERE key IN ("
+                    "SELECT key FROM completions ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error:
+            logger.warning("Completion cache write failed", exc_info=True)
+
+    def __len__(self) -> int:
+        if self._connection is None:
+            return 0
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM completions"
+            ).fetchone()
+        return count
+
+    def clear(self) -> None:
+        if self._connection is not None:
+            with self._lock:
+                self._connection.execute("DELETE FROM completions")
+
+    def close(self) -> None:
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+                self._connection = None
+
+
+_default_cache = None
+
+
+def get_completion_cache() -> CompletionCache:
+    """Return the process-wide completion cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CompletionCache()
+    return _default_cache
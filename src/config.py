@@ -27,9 +27,112 @@ class Config:
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "gemma3:27b")
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 
+    # Maximum tool calls a chatbot runs concurrently within one model turn
+    TOOL_CONCURRENCY: int = int(os.getenv("TOOL_CONCURRENCY", "8"))
+
+    # Stream model responses in the chatbot integrations
+    STREAM_RESPONSES: bool = os.getenv("STREAM_RESPONSES", "false").lower() == "true"
+
+    # Logging for the server and chatbots, written to stderr by a background thread
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # Choose one: text, json
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    # Fraction of per-call tool logs kept (warnings and errors are always kept)
+    LOG_TOOL_CALL_SAMPLE_RATE: float = float(
+        os.getenv("LOG_TOOL_CALL_SAMPLE_RATE", "1.0")
+    )
+
+    # Seconds a chatbot waits for each MCP server to start and list its tools
+    SERVER_CONNECT_TIMEOUT: float = float(os.getenv("SERVER_CONNECT_TIMEOUT", "30"))
+
+    # Shared MCP session pool used by the framework integrations
+    SESSION_POOL_SIZE: int = int(os.getenv("SESSION_POOL_SIZE", "2"))
+    SESSION_HEALTH_CHECK_INTERVAL: float = float(
+        os.getenv("SESSION_HEALTH_CHECK_INTERVAL", "30")
+    )
+
+    # On-disk cache of provider-format tool schemas
+    TOOL_SCHEMA_CACHE_PATH: str = os.getenv(
+        "TOOL_SCHEMA_CACHE_PATH", ".cache/tool_schemas.json"
+    )
+
+    # Results of tools the server marks cacheable, per chatbot (0 disables it)
+    TOOL_RESULT_CACHE_SIZE: int = int(os.getenv("TOOL_RESULT_CACHE_SIZE", "256"))
+
+    # Comma-separated fields dropped from JSON tool results sent to the model
+    TOOL_RESULT_DROP_FIELDS: str = os.getenv("TOOL_RESULT_DROP_FIELDS", "")
+
+    # Estimated prompt tokens before old tool results in a chatbot conversation
+    # are truncated (0 disables compaction), and the characters each keeps
+    HISTORY_TOKEN_BUDGET: int = int(os.getenv("HISTORY_TOKEN_BUDGET", "8000"))
+    HISTORY_TRUNCATED_RESULT_CHARS: int = int(
+        os.getenv("HISTORY_TRUNCATED_RESULT_CHARS", "500")
+    )
+
+    # Cache of LLM completions for the chatbots, off by default (size 0
+    # disables it, empty path keeps it in memory); TTL is in seconds
+    COMPLETION_CACHE_PATH: str = os.getenv(
+        "COMPLETION_CACHE_PATH", ".cache/completions.db"
+    )
+    COMPLETION_CACHE_TTL: float = float(os.getenv("COMPLETION_CACHE_TTL", "3600"))
+    COMPLETION_CACHE_SIZE: int = int(os.getenv("COMPLETION_CACHE_SIZE", "0"))
+
     # MCP Server Configuration
     MCP_SERVER_HOST: str = os.getenv("MCP_SERVER_HOST", "localhost")
     MCP_SERVER_PORT: int = int(os.getenv("MCP_SERVER_PORT", "8000"))
+    # Choose one: stdio, streamable-http, sse
+    MCP_TRANSPORT: str = os.getenv("MCP_TRANSPORT", "stdio")
+    MCP_HTTP_PATH: str = os.getenv("MCP_HTTP_PATH", "/mcp")
+    # Worker processes for streamable-http (more than 1 needs the sqlite backend)
+    MCP_WORKERS: int = int(os.getenv("MCP_WORKERS", "1"))
+
+    # Request Metrics Configuration (served at METRICS_PATH over HTTP)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_PATH: str = os.getenv("METRICS_PATH", "/metrics")
+    # Seconds between metric summaries in the log (0 disables them)
+    METRICS_LOG_INTERVAL: float = float(os.getenv("METRICS_LOG_INTERVAL", "0"))
+
+    # Ticket ID worker (0-65535); by default each process leases a free one
+    # from the ticket database, holding it for TICKET_WORKER_LEASE_TTL seconds
+    TICKET_WORKER_ID: Optional[int] = (
+        int(os.environ["TICKET_WORKER_ID"]) if os.getenv("TICKET_WORKER_ID") else None
+    )
+    TICKET_WORKER_LEASE_TTL: float = float(os.getenv("TICKET_WORKER_LEASE_TTL", "60"))
+
+    # Ticket Store Configuration
+    # Choose one: sqlite, jsonl (path defaults to tickets.db / tickets.jsonl)
+    TICKET_BACKEND: str = os.getenv("TICKET_BACKEND", "sqlite")
+    TICKET_STORE_PATH: str = os.getenv("TICKET_STORE_PATH", "")
+    # Choose one: always, batch, interval
+    TICKET_FSYNC: str = os.getenv("TICKET_FSYNC", "batch")
+    TICKET_BATCH_SIZE: int = int(os.getenv("TICKET_BATCH_SIZE", "100"))
+    TICKET_FLUSH_INTERVAL: float = float(os.getenv("TICKET_FLUSH_INTERVAL", "0.05"))
+    TICKET_FSYNC_INTERVAL: float = float(os.getenv("TICKET_FSYNC_INTERVAL", "1.0"))
+
+    # Purchase Ledger Configuration
+    # Choose one: memory (saved to PURCHASE_LEDGER_PATH), sqlite
+    PURCHASE_BACKEND: str = os.getenv("PURCHASE_BACKEND", "memory")
+    PURCHASE_DB_PATH: str = os.getenv("PURCHASE_DB_PATH", "purchases.db")
+    # Snapshot file of the memory backend (empty keeps it in memory only)
+    PURCHASE_LEDGER_PATH: str = os.getenv("PURCHASE_LEDGER_PATH", "purchases.npz")
+    PURCHASE_LEDGER_SAVE_INTERVAL: float = float(
+        os.getenv("PURCHASE_LEDGER_SAVE_INTERVAL", "30")
+    )
+
+    # Prompt Template Configuration (empty dir uses the bundled templates)
+    PROMPT_TEMPLATE_DIR: str = os.getenv("PROMPT_TEMPLATE_DIR", "")
+    PROMPT_RELOAD_INTERVAL: float = float(os.getenv("PROMPT_RELOAD_INTERVAL", "2.0"))
+    PROMPT_CACHE_SIZE: int = int(os.getenv("PROMPT_CACHE_SIZE", "1024"))
+
+    # Customer Repository Configuration
+    # Choose one: memory, sqlite
+    CUSTOMER_BACKEND: str = os.getenv("CUSTOMER_BACKEND", "memory")
+    CUSTOMER_DB_PATH: str = os.getenv("CUSTOMER_DB_PATH", "customers.db")
+    CUSTOMER_DB_POOL_SIZE: int = int(os.getenv("CUSTOMER_DB_POOL_SIZE", "4"))
+
+    # Customer Cache Configuration (size 0 disables the cache)
+    CUSTOMER_CACHE_SIZE: int = int(os.getenv("CUSTOMER_CACHE_SIZE", "1024"))
+    CUSTOMER_CACHE_TTL: float = float(os.getenv("CUSTOMER_CACHE_TTL", "30"))
 
     @classmethod
     def validate(cls) -> None:
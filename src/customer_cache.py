@@ -0,0 +1,165 @@
+"""LRU + TTL read-through cache with request coalescing for customers."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.customer_repository import CustomerRepository
+from src.customer_store import RecencyKey
+from src.models import Customer
+
+
+class CachedCustomerRepository(CustomerRepository):
+    """Repository wrapper that caches customers by ID.
+
+    Entries live for ``ttl_seconds`` and the least recently used entry is
+    evicted once ``max_size`` is reached. Concurrent misses for the same ID
+    share a single backend fetch. Writes go straight to the backend and
+    invalidate the affected entry, so readers never see a stale customer
+    after a write through this repository has returned.
+    """
+
+    def __init__(
+        self,
+        backend: CustomerRepository,
+        max_size: int = 1024,
+        ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.backend = backend
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Customer, float]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Task[Optional[Customer]]"] = {}
+        # Bumped on every invalidation; a fetch that overlaps a write must not
+        # repopulate the cache with what it read before the write landed
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, customer_id: str) -> Optional[Customer]:
+        entry = self._entries.get(customer_id)
+        if entry is None:
+            return None
+        customer, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[customer_id]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(customer_id)
+        return customer
+
+    def _store(self, customer: Customer) -> None:
+        self._entries[customer.id] = (customer, self._clock() + self.ttl_seconds)
+        self._entries.move_to_end(customer.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, customer_id: str) -> None:
+        """Drop a cached customer and detach any in-flight fetch for it."""
+        self._version += 1
+        self._entries.pop(customer_id, None)
+        self._inflight.pop(customer_id, None)
+
+    def clear(self) -> None:
+        """Drop every cached customer."""
+        self._version += 1
+        self._entries.clear()
+        self._inflight.clear()
+
+    async def _load(self, customer_id: str) -> Optional[Customer]:
+        version = self._version
+        try:
+            customer = await self.backend.get(customer_id)
+        finally:
+            if self._inflight.get(customer_id) is asyncio.current_task():
+                del self._inflight[customer_id]
+        if customer is not None and version == self._version:
+            self._store(customer)
+        return customer
+
+    async def get(self, customer_id: str) -> Optional[Customer]:
+        customer = self._lookup(customer_id)
+        if customer is not None:
+            self.hits += 1
+            return customer
+
+        task = self._inflight.get(customer_id)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(customer_id))
+            self._inflight[customer_id] = task
+        else:
+            self.coalesced += 1
+        # Shield so one cancelled caller does not cancel the shared fetch
+        return await asyncio.shield(task)
+
+    async def get_many(self, customer_ids: Iterable[str]) -> Dict[str, Customer]:
+        found: Dict[str, Customer] = {}
+        missing: List[str] = []
+        for customer_id in customer_ids:
+            customer = self._lookup(customer_id)
+            if customer is not None:
+                self.hits += 1
+                found[customer_id] = customer
+            else:
+                self.misses += 1
+                missing.append(customer_id)
+
+        if missing:
+            version = self._version
+            fetched = await self.backend.get_many(missing)
+            if version == self._version:
+                for customer in fetched.values():
+                    self._store(customer)
+            found.update(fetched)
+        return found
+
+    async def exists(self, customer_id: str) -> bool:
+        # Routed through get() so the lookup also warms the cache
+        return await self.get(customer_id) is not None
+
+    async def recent(
+        self, limit: int = 10, before: Optional[RecencyKey] = None
+    ) -> List[Customer]:
+        return await self.backend.recent(limit, before)
+
+    async def upsert(self, customer: Customer) -> None:
+        try:
+            await self.backend.upsert(customer)
+        finally:
+            self.invalidate(customer.id)
+
+    async def record_interaction(
+        self, customer_id: str, when: Optional[datetime] = None
+    ) -> Customer:
+        try:
+            return await self.backend.record_interaction(customer_id, when)
+        finally:
+            self.invalidate(customer_id)
+
+    async def close(self) -> None:
+        self.clear()
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        """Return cache counters for tuning ``max_size`` and ``ttl_seconds``."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,30 @@
+"""Walk the server's paginated recent-customer list from an MCP client."""
+
+import json
+from typing import AsyncIterator, List, Optional
+
+
+async def iter_recent_customers(
+    session, page_size: int = 100, fields: Optional[List[str]] = None
+) -> AsyncIterator[dict]:
+    """Yield every customer, most recently active first, one page at a time.
+
+    ``session`` is an MCP ``ClientSession`` (or anything with its
+    ``call_tool``). Only one page of ``page_size`` customers is held at a
+    time on either side, so the whole set can be walked with bounded
+    memory. ``fields`` limits each customer to the named fields plus id.
+    """
+    arguments: dict = {"limit": page_size}
+    if fields is not None:
+        arguments["fields"] = fields
+    while True:
+        result = await session.call_tool("get_recent_customers", arguments)
+        text = result.content[0].text if result.content else ""
+        if result.isError:
+            raise RuntimeError(f"get_recent_customers failed: {text}")
+        page = json.loads(text)
+        for customer in page["customers"]:
+            yield customer
+        if page["next_cursor"] is None:
+            return
+        arguments["cursor"] = page["next_cursor"]
@@ -0,0 +1,326 @@
+"""Async customer repository with in-memory and SQLite backends."""
+
+import asyncio
+import json
+import queue
+import sqlite3
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from src.customer_store import CustomerStore, RecencyKey
+from src.models import Customer
+
+T = TypeVar("T")
+
+
+class CustomerRepository(ABC):
+    """Storage interface used by the MCP resource and tools."""
+
+    @abstractmethod
+    async def get(self, customer_id: str) -> Optional[Customer]:
+        """Return the customer with ``customer_id``, or ``None``."""
+
+    @abstractmethod
+    async def get_many(self, customer_ids: Iterable[str]) -> Dict[str, Customer]:
+        """Return the customers found for ``customer_ids`` in one query."""
+
+    @abstractmethod
+    async def exists(self, customer_id: str) -> bool:
+        """Return whether a customer with ``customer_id`` exists."""
+
+    @abstractmethod
+    async def recent(
+        self, limit: int = 10, before: Optional[RecencyKey] = None
+    ) -> List[Customer]:
+        """Return up to ``limit`` customers, most recently active first.
+
+        ``before`` is the ``recency_key`` of the last customer of the
+        previous page; only customers ordered after it are returned.
+        """
+
+    @abstractmethod
+    async def upsert(self, customer: Customer) -> None:
+        """Insert or replace a customer."""
+
+    @abstractmethod
+    async def record_interaction(
+        self, customer_id: str, when: Optional[datetime] = None
+    ) -> Customer:
+        """Set a customer's last interaction time and return the update."""
+
+    async def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class InMemoryCustomerRepository(CustomerRepository):
+    """Repository backed by an in-process ``CustomerStore``."""
+
+    def __init__(self, store: CustomerStore):
+        self.store = store
+
+    async def get(self, customer_id: str) -> Optional[Customer]:
+        return self.store.get(customer_id)
+
+    async def get_many(self, customer_ids: Iterable[str]) -> Dict[str, Customer]:
+        store = self.store
+        return {cid: store[cid] for cid in customer_ids if cid in store}
+
+    async def exists(self, customer_id: str) -> bool:
+        return customer_id in self.store
+
+    async def recent(
+        self, limit: int = 10, before: Optional[RecencyKey] = None
+    ) -> List[Customer]:
+        return self.store.recent(limit, before)
+
+    async def upsert(self, customer: Customer) -> None:
+        self.store.upsert(customer)
+
+    async def record_interaction(
+        self, customer_id: str, when: Optional[datetime] = None
+    ) -> Customer:
+        if customer_id not in self.store:
+            raise ValueError(f"Customer {customer_id} not found")
+        return self.store.record_interaction(customer_id, when)
+
+
+# Statements are kept as constants so each pooled connection's statement
+# cache compiles them once and reuses the prepared form afterwards.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    phone TEXT,
+    account_status TEXT NOT NULL DEFAULT 'active',
+    last_interaction TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_customers_recency
+    ON customers (last_interaction DESC, id DESC);
+"""
+_COLUMNS = "id, name, email, phone, account_status, last_interaction"
+_SELECT_BY_ID = f"SELECT {_COLUMNS} FROM customers WHERE id = ?"
+# json_each keeps one prepared statement for any number of IDs
+_SELECT_MANY = (
+    f"SELECT {_COLUMNS} FROM customers WHERE id IN (SELECT value FROM json_each(?))"
+)
+_EXISTS = "SELECT 1 FROM customers WHERE id = ?"
+_SELECT_RECENT = (
+    f"SELECT {_COLUMNS} FROM customers ORDER BY last_interaction DESC, id DESC LIMIT ?"
+)
+# Keyset pages: a row-value comparison seeks straight to the cursor in the
+# recency index. NULL never compares, so customers without an interaction
+# (ordered last) are paged by ID separately.
+_SELECT_RECENT_BEFORE = (
+    f"SELECT {_COLUMNS} FROM customers "
+    "WHERE (last_interaction, id) < (?, ?) "
+    "ORDER BY last_interaction DESC, id DESC LIMIT ?"
+)
+_SELECT_NEVER_ACTIVE = (
+    f"SELECT {_COLUMNS} FROM customers WHERE last_interaction IS NULL "
+    "ORDER BY id DESC LIMIT ?"
+)
+_SELECT_NEVER_ACTIVE_BEFORE = (
+    f"SELECT {_COLUMNS} FROM customers WHERE last_interaction IS NULL AND id < ? "
+    "ORDER BY id DESC LIMIT ?"
+)
+_UPSERT = (
+    f"INSERT INTO customers ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET name = excluded.name, "
+    "email = excluded.email, phone = excluded.phone, "
+    "account_status = excluded.account_status, "
+    "last_interaction = excluded.last_interaction"
+)
+_INSERT_IF_MISSING = (
+    f"INSERT OR IGNORE INTO customers ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+)
+_TOUCH = "UPDATE customers SET last_interaction = ? WHERE id = ?"
+
+
+def _format_timestamp(value: Optional[datetime]) -> Optional[str]:
+    # Fixed-width ISO strings sort chronologically as plain text
+    return value.isoformat(timespec="microseconds") if value else None
+
+
+def _to_row(customer: Customer) -> tuple:
+    return (
+        customer.id,
+        customer.name,
+        customer.email,
+        customer.phone,
+        customer.account_status,
+        _format_timestamp(customer.last_interaction),
+    )
+
+
+def _from_row(row: tuple) -> Customer:
+    return Customer(
+        id=row[0],
+        name=row[1],
+        email=row[2],
+        phone=row[3],
+        account_status=row[4],
+        last_interaction=row[5],
+    )
+
+
+class SQLiteConnectionPool:
+    """Fixed-size pool of SQLite connections opened in WAL mode."""
+
+    def __init__(self, path: str, size: int = 4, cached_statements: int = 64):
+        self.path = path
+        self.size = size
+        self._connections: queue.Queue[sqlite3.Connection] = queue.Queue()
+        for _ in range(size):
+            self._connections.put(self._connect(cached_statements))
+
+    def _connect(self, cached_statements: int) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            cached_statements=cached_statements,
+            isolation_level=None,
+        )
+        # WAL lets readers proceed while a writer holds the database
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, blocking until one is free."""
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        for _ in range(self.size):
+            self._connections.get().close()
+
+
+class SQLiteCustomerRepository(CustomerRepository):
+    """Repository backed by an SQLite database file.
+
+    Queries run on a thread pool sized to the connection pool, so blocking
+    SQLite calls never run on the event loop. Only the rows a query asks
+    for are materialized, which keeps memory flat for large tables.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4):
+        self.pool = SQLiteConnectionPool(path, size=pool_size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="customer-db"
+        )
+        with self.pool.connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def seed(self, customers: Iterable[Customer]) -> None:
+        """Insert customers that are not already present."""
+        with self.pool.connection() as connection:
+            with connection:
+                connection.execute("BEGIN")
+                connection.executemany(
+                    _INSERT_IF_MISSING, [_to_row(c) for c in customers]
+                )
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        def call() -> T:
+            with self.pool.connection() as connection:
+                return fn(connection)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, call)
+
+    async def get(self, customer_id: str) -> Optional[Customer]:
+        row = await self._run(
+            lambda c: c.execute(_SELECT_BY_ID, (customer_id,)).fetchone()
+        )
+        return _from_row(row) if row else None
+
+    async def get_many(self, customer_ids: Iterable[str]) -> Dict[str, Customer]:
+        ids = json.dumps(list(customer_ids))
+        rows = await self._run(lambda c: c.execute(_SELECT_MANY, (ids,)).fetchall())
+        return {row[0]: _from_row(row) for row in rows}
+
+    async def exists(self, customer_id: str) -> bool:
+        row = await self._run(lambda c: c.execute(_EXISTS, (customer_id,)).fetchone())
+        return row is not None
+
+    async def recent(
+        self, limit: int = 10, before: Optional[RecencyKey] = None
+    ) -> List[Customer]:
+        if limit <= 0:
+            return []
+        if before is None:
+            rows = await self._run(
+                lambda c: c.execute(_SELECT_RECENT, (limit,)).fetchall()
+            )
+            return [_from_row(row) for row in rows]
+
+        when, customer_id = before
+        if when == datetime.min:
+            rows = await self._run(
+                lambda c: c.execute(
+                    _SELECT_NEVER_ACTIVE_BEFORE, (customer_id, limit)
+                ).fetchall()
+            )
+            return [_from_row(row) for row in rows]
+
+        def page(connection: sqlite3.Connection) -> list:
+            params = (_format_timestamp(when), customer_id, limit)
+            rows = connection.execute(_SELECT_RECENT_BEFORE, params).fetchall()
+            if len(rows) < limit:
+                rows += connection.execute(
+                    _SELECT_NEVER_ACTIVE, (limit - len(rows),)
+                ).fetchall()
+            return rows
+
+        return [_from_row(row) for row in await self._run(page)]
+
+    async def upsert(self, customer: Customer) -> None:
+        row = _to_row(customer)
+        await self._run(lambda c: c.execute(_UPSERT, row))
+
+    async def record_interaction(
+        self, customer_id: str, when: Optional[datetime] = None
+    ) -> Customer:
+        timestamp = _format_timestamp(when or datetime.now())
+
+        def touch(connection: sqlite3.Connection) -> Optional[tuple]:
+            with connection:
+                connection.execute("BEGIN")
+                connection.execute(_TOUCH, (timestamp, customer_id))
+                return connection.execute(_SELECT_BY_ID, (customer_id,)).fetchone()
+
+        row = await self._run(touch)
+        if row is None:
+            raise ValueError(f"Customer {customer_id} not found")
+        return _from_row(row)
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+
+def create_customer_repository(
+    backend: str,
+    seed: Iterable[Customer] = (),
+    db_path: str = "customers.db",
+    pool_size: int = 4,
+) -> CustomerRepository:
+    """Build the repository selected by ``backend`` ("memory" or "sqlite")."""
+    if backend == "memory":
+        store = seed if isinstance(seed, CustomerStore) else CustomerStore(seed)
+        return InMemoryCustomerRepository(store)
+    if backend == "sqlite":
+        repository = SQLiteCustomerRepository(db_path, pool_size=pool_size)
+        repository.seed(seed.values() if isinstance(seed, CustomerStore) else seed)
+        return repository
+    raise ValueError(f"Unknown customer backend: {backend}")
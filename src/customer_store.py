@@ -0,0 +1,115 @@
+"""In-memory customer store with an ordered recency index."""
+
+import base64
+import json
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.models import Customer
+
+# Index key: (last_interaction or datetime.min, customer id). The index is
+# kept in ascending order, so the most recent customers sit at the tail.
+RecencyKey = Tuple[datetime, str]
+
+
+def recency_key(customer: Customer) -> RecencyKey:
+    """Return the index key used to order a customer by recency."""
+    return (customer.last_interaction or datetime.min, customer.id)
+
+
+def encode_cursor(key: RecencyKey) -> str:
+    """Encode a recency key as an opaque, URL-safe page cursor."""
+    when, customer_id = key
+    payload = [None if when == datetime.min else when.isoformat(), customer_id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> RecencyKey:
+    """Decode a cursor from ``encode_cursor``; raises ValueError if malformed."""
+    try:
+        when, customer_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (
+            datetime.fromisoformat(when) if when is not None else datetime.min,
+            str(customer_id),
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class CustomerStore(Mapping):
+    """Customer lookup table that keeps customers ordered by last interaction.
+
+    Lookups by ID are O(1). The recency index is a sorted list of
+    ``(last_interaction, id)`` keys maintained with ``bisect``, so fetching
+    the ``limit`` most recent customers costs O(limit) instead of sorting
+    the whole table on every call. Customers that tie on
+    ``last_interaction`` are returned in descending ID order.
+    """
+
+    def __init__(self, customers: Iterable[Customer] = ()):
+        self._customers: dict[str, Customer] = {c.id: c for c in customers}
+        # Bulk load with a single sort rather than one insort per customer
+        self._index: List[RecencyKey] = sorted(
+            recency_key(c) for c in self._customers.values()
+        )
+
+    def __getitem__(self, customer_id: str) -> Customer:
+        return self._customers[customer_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._customers)
+
+    def __len__(self) -> int:
+        return len(self._customers)
+
+    def __contains__(self, customer_id: object) -> bool:
+        return customer_id in self._customers
+
+    def upsert(self, customer: Customer) -> None:
+        """Insert or replace a customer, keeping the recency index in sync."""
+        previous = self._customers.get(customer.id)
+        if previous is not None:
+            self._remove_from_index(previous)
+        self._customers[customer.id] = customer
+        insort(self._index, recency_key(customer))
+
+    def remove(self, customer_id: str) -> None:
+        """Remove a customer from the store."""
+        customer = self._customers.pop(customer_id)
+        self._remove_from_index(customer)
+
+    def record_interaction(
+        self, customer_id: str, when: Optional[datetime] = None
+    ) -> Customer:
+        """Mark a customer as having just interacted and reindex them."""
+        customer = self._customers[customer_id]
+        updated = customer.model_copy(
+            update={"last_interaction": when or datetime.now()}
+        )
+        self.upsert(updated)
+        return updated
+
+    def recent(
+        self, limit: int = 10, before: Optional[RecencyKey] = None
+    ) -> List[Customer]:
+        """Return up to ``limit`` customers, most recently active first.
+
+        With ``before``, the page starts after that recency key, so passing
+        the key of the last customer returned fetches the next page.
+        """
+        if limit <= 0:
+            return []
+        end = len(self._index) if before is None else bisect_left(self._index, before)
+        customers = self._customers
+        return [
+            customers[key[1]]
+            for key in reversed(self._index[max(end - limit, 0) : end])
+        ]
+
+    def _remove_from_index(self, customer: Customer) -> None:
+        key = recency_key(customer)
+        position = bisect_left(self._index, key)
+        if position < len(self._index) and self._index[position] == key:
+            del self._index[position]
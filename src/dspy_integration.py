@@ -1,12 +1,12 @@
 """DSPy integration with MCP server."""
 
 import asyncio
+from typing import Optional
 
 import dspy
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
 
 from config import Config
+from session_pool import MCPSessionPool, get_session_pool, load_server_config
 
 
 # Define a DSPy signature for our customer service tasks
@@ -17,7 +17,7 @@ class CustomerServiceSignature(dspy.Signature):
     response: str = dspy.OutputField(desc="Helpful customer service response")
 
 
-async def setup_dspy_mcp_integration():
+async def setup_dspy_mcp_integration(pool: Optional[MCPSessionPool] = None):
     """Set up DSPy with MCP tools."""
 
     # Configure DSPy with your preferred language model
@@ -33,39 +33,37 @@ async def setup_dspy_mcp_integration():
 
     dspy.configure(lm=llm)
 
-    # Create MCP client connection
-    server_params = StdioServerParameters(
-        command="poetry", args=["run", "python", "src/main.py"]
-    )
+    # Borrow a warm MCP session from the shared pool
+    pool = pool or get_session_pool()
+    server_config = load_server_config("customer-service")
 
-    async with stdio_client(server_params) as (read, write):
-        async with ClientSession(read, write) as session:
-            # Initialize the MCP connection
-            await session.initialize()
+    async with pool.session(server_config, name="customer-service") as session:
+        # List available tools
+        tools = await session.list_tools()
 
-            # List available tools
-            tools = await session.list_tools()
+        # Convert MCP tools to DSPy tools
+        dspy_tools = []
+        for tool in tools.tools:
+            dspy_tools.append(dspy.Tool.from_mcp_tool(session, tool))
 
-            # Convert MCP tools to DSPy tools
-            dspy_tools = []
-            for tool in tools.tools:
-                dspy_tools.append(dspy.Tool.from_mcp_tool(session, tool))
+        # Create a ReAct agent with the tools
+        react = dspy.ReAct(CustomerServiceSignature, tools=dspy_tools)
 
-            # Create a ReAct agent with the tools
-            react = dspy.ReAct(CustomerServiceSignature, tools=dspy_tools)
-
-            # Test the integration
-            result = await react.acall(
-                request="Look up customer 12345 and create a support ticket as the bbq grill that she bought is defective."
-            )
+        # Test the integration
+        result = await react.acall(
+            request="Look up customer 12345 and create a support ticket as the bbq grill that she bought is defective."
+        )
 
-            print(f"DSPy Result: {result}")
+        print(f"DSPy Result: {result}")
 
 
 async def main():
     """Main entry point."""
     Config.validate()
-    await setup_dspy_mcp_integration()
+    try:
+        await setup_dspy_mcp_integration()
+    finally:
+        await get_session_pool().close()
 
 
 if __name__ == "__main__":
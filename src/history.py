@@ -0,0 +1,114 @@
+"""Token-budgeted compaction of chatbot conversation history."""
+
+import json
+from typing import Any, List, Tuple
+
+from config import Config
+
+# Rough characters per token for English text and JSON
+CHARS_PER_TOKEN = 4
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if hasattr(value, "model_dump_json"):
+        return value.model_dump_json(exclude_none=True)
+    if isinstance(value, (list, tuple)):
+        return "".join(_text(item) for item in value)
+    if isinstance(value, dict):
+        return "".join(_text(item) for item in value.values())
+    return json.dumps(value, default=str)
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the tokens in a message, content block or list of them."""
+    return len(_text(value)) // CHARS_PER_TOKEN + 1
+
+
+def _result_text(content: Any) -> str:
+    """Plain text of a tool result, from a string or MCP content items."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, (list, tuple)):
+        return "\n".join(getattr(item, "text", None) or _text(item) for item in content)
+    return _text(content)
+
+
+# Slack over the character limit, so an already truncated result (text
+# plus the truncation note) is not truncated again on the next pass
+_TRUNCATION_SLACK = 64
+
+
+def _truncate(content: Any, max_chars: int) -> str:
+    text = _result_text(content)
+    if len(text) <= max_chars + _TRUNCATION_SLACK:
+        return text
+    return f"{text[:max_chars]}... [truncated {len(text) - max_chars} characters]"
+
+
+def _old_tool_results(messages: list, keep_rounds: int) -> List[Tuple[int, Any]]:
+    """Locate tool results older than the last ``keep_rounds`` assistant turns.
+
+    Returns ``(message index, block index)`` pairs oldest first; the block
+    index is None for OpenAI ``tool`` messages and the position of the
+    ``tool_result`` block in an Anthropic user message otherwise.
+    """
+    assistant_turns = [
+        i for i, message in enumerate(messages) if message.get("role") == "assistant"
+    ]
+    if len(assistant_turns) <= keep_rounds:
+        return []
+    cutoff = assistant_turns[-keep_rounds] if keep_rounds else len(messages)
+
+    located = []
+    for i, message in enumerate(messages[:cutoff]):
+        if message.get("role") == "tool":
+            located.append((i, None))
+        elif message.get("role") == "user" and isinstance(message["content"], list):
+            for j, block in enumerate(message["content"]):
+                if isinstance(block, dict) and block.get("type") == "tool_result":
+                    located.append((i, j))
+    return located
+
+
+def compact_history(
+    messages: list,
+    max_tokens: int = Config.HISTORY_TOKEN_BUDGET,
+    keep_rounds: int = 1,
+    truncated_chars: int = Config.HISTORY_TRUNCATED_RESULT_CHARS,
+) -> int:
+    """Shrink old tool results in place until ``messages`` fit ``max_tokens``.
+
+    Tool results are truncated to ``truncated_chars`` characters, oldest
+    first, skipping the results of the last ``keep_rounds`` assistant
+    turns. Messages are never dropped or reordered, so each tool call
+    keeps its result (OpenAI ``tool_call_id``, Anthropic ``tool_use`` /
+    ``tool_result`` pairing). Changed messages are replaced by copies, not
+    mutated. ``max_tokens=0`` disables compaction. Returns the estimated
+    token count afterwards.
+    """
+    total = sum(estimate_tokens(message) for message in messages)
+    if max_tokens <= 0 or total <= max_tokens:
+        return total
+
+    for i, j in _old_tool_results(messages, keep_rounds):
+        message = messages[i]
+        before = estimate_tokens(message)
+        if j is None:
+            message = {
+                **message,
+                "content": _truncate(message["content"], truncated_chars),
+            }
+        else:
+            blocks = list(message["content"])
+            blocks[j] = {
+                **blocks[j],
+                "content": _truncate(blocks[j]["content"], truncated_chars),
+            }
+            message = {**message, "content": blocks}
+        messages[i] = message
+        total += estimate_tokens(message) - before
+        if total <= max_tokens:
+            break
+    return total
@@ -1,48 +1,50 @@
 """LangChain integration with MCP server."""
 
 import asyncio
+from typing import Optional
 
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
 from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import create_react_agent
+from mcp import ClientSession
 
 from config import Config
+from session_pool import MCPSessionPool, get_session_pool, load_server_config
 
 
-async def setup_langchain_mcp_agent():
-    """Set up a LangChain agent with MCP tools."""
+async def setup_langchain_mcp_agent(session: ClientSession):
+    """Set up a LangChain agent with MCP tools bound to ``session``."""
 
     # Initialize the language model
     llm = ChatOpenAI(
         model=Config.OPENAI_MODEL, temperature=0.1, api_key=Config.OPENAI_API_KEY
     )
 
-    # Connect to our MCP server using MultiServerMCPClient
-    client = MultiServerMCPClient(
-        {
-            "customer-service": {
-                "command": "poetry",
-                "args": ["run", "python", "src/main.py"],
-                "transport": "stdio",
-            }
-        }
-    )
-
-    # Get all available tools from MCP servers
-    tools = await client.get_tools()
+    # Load tools from the pooled session so every tool call reuses it
+    # instead of starting a new server session per call
+    tools = await load_mcp_tools(session)
 
     # Create a ReAct agent with the tools
     agent = create_react_agent(llm, tools)
 
-    return agent, client
+    return agent
 
 
-async def run_customer_service_scenarios():
+async def run_customer_service_scenarios(pool: Optional[MCPSessionPool] = None):
     """Demonstrate LangChain + MCP integration."""
     print("🔗 Setting up LangChain + MCP integration...")
 
-    agent, client = await setup_langchain_mcp_agent()
+    # Borrow a warm MCP session from the shared pool
+    pool = pool or get_session_pool()
+    server_config = load_server_config("customer-service")
+
+    async with pool.session(server_config, name="customer-service") as session:
+        agent = await setup_langchain_mcp_agent(session)
+        await run_scenarios(agent)
+
 
+async def run_scenarios(agent):
+    """Run the example customer service scenarios against ``agent``."""
     # Example customer service scenarios
     scenarios = [
         "Look up customer 12345 and summarize their account status",
@@ -74,7 +76,10 @@ async def main():
     """Main entry point."""
     Config.validate()
 
-    await run_customer_service_scenarios()
+    try:
+        await run_customer_service_scenarios()
+    finally:
+        await get_session_pool().close()
 
 
 if __name__ == "__main__":
@@ -2,125 +2,156 @@
 
 import asyncio
 import json
+from typing import Optional
 
 import litellm
-from litellm import experimental_mcp_client
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
 
+from completion_cache import CompletionCache, completion_key, get_completion_cache
 from config import Config
-
-
-async def setup_litellm_mcp():
+from server_connections import server_key
+from session_pool import MCPSessionPool, get_session_pool, load_server_config
+from tool_result_cache import ToolResultCache
+from tool_results import encode_tool_result
+from tool_schema_cache import get_tool_schema_cache
+
+
+async def cached_acompletion(
+    model: str,
+    messages: list,
+    tools: list,
+    cache: Optional[CompletionCache] = None,
+    use_cache: bool = True,
+):
+    """``litellm.acompletion`` that answers repeated requests from the cache."""
+    if cache is None:
+        cache = get_completion_cache()
+    key = None
+    if use_cache and cache.enabled:
+        key = completion_key("litellm", model, messages, tools)
+    cached = await cache.get(key) if key else None
+    if cached is not None:
+        return litellm.ModelResponse(**cached)
+
+    response = await litellm.acompletion(model=model, messages=messages, tools=tools)
+    if key:
+        await cache.put(key, response.model_dump(mode="json", exclude_none=True))
+    return response
+
+
+async def setup_litellm_mcp(
+    pool: Optional[MCPSessionPool] = None, use_cache: bool = True
+):
     """Set up LiteLLM with MCP tools."""
-
-    # Create MCP server connection
-    server_params = StdioServerParameters(
-        command="poetry", args=["run", "python", "src/main.py"]
-    )
-
-    async with stdio_client(server_params) as (read, write):
-        async with ClientSession(read, write) as session:
-            # Initialize the MCP connection
-            await session.initialize()
-
-            # Load MCP tools in OpenAI format
-            tools = await experimental_mcp_client.load_mcp_tools(
-                session=session, format="openai"
-            )
-
-            print(f"Loaded {len(tools)} MCP tools")
-
-            # Use tools with different models
-            models_to_test = []
-
-            if Config.LLM_PROVIDER == "openai":
-                models_to_test.append(Config.OPENAI_MODEL)
-            elif Config.LLM_PROVIDER == "anthropic":
-                models_to_test.append(Config.ANTHROPIC_MODEL)
-            else:
-                models_to_test = [Config.OPENAI_MODEL, Config.ANTHROPIC_MODEL]
-
-            for model in models_to_test:
-                try:
-                    print(f"\nTesting with {model}...")
-
-                    # Initial conversation
-                    messages = [
+    pool = pool or get_session_pool()
+
+    # Borrow a warm MCP session from the shared pool
+    server_config = load_server_config("customer-service")
+
+    async with pool.session(server_config, name="customer-service") as session:
+        # Load MCP tools in OpenAI format, reusing cached conversions
+        response = await session.list_tools()
+        tools = get_tool_schema_cache().provider_tools(
+            f"customer-service:{server_key(server_config)}", response.tools, "openai"
+        )
+
+        print(f"Loaded {len(tools)} MCP tools")
+
+        # Reuses results of tools the server annotates as cacheable
+        result_cache = ToolResultCache()
+        result_cache.register(response.tools)
+
+        # Use tools with different models
+        models_to_test = []
+
+        if Config.LLM_PROVIDER == "openai":
+            models_to_test.append(Config.OPENAI_MODEL)
+        elif Config.LLM_PROVIDER == "anthropic":
+            models_to_test.append(Config.ANTHROPIC_MODEL)
+        else:
+            models_to_test = [Config.OPENAI_MODEL, Config.ANTHROPIC_MODEL]
+
+        for model in models_to_test:
+            try:
+                print(f"\nTesting with {model}...")
+
+                # Initial conversation
+                messages = [
+                    {
+                        "role": "user",
+                        "content": "Customer 67890 recently purchases were $150, $300, $13 and $89. "
+                        "Calculate their total account value.",
+                    }
+                ]
+
+                # First call to get tool requests
+                response = await cached_acompletion(
+                    model, messages, tools, use_cache=use_cache
+                )
+
+                # Extract the response
+                message = response.choices[0].message
+
+                # Check if the model made tool calls
+                if hasattr(message, "tool_calls") and message.tool_calls:
+                    print(f"🔧 Tool calls made: {len(message.tool_calls)}")
+
+                    # Add assistant's message with tool calls to conversation
+                    messages.append(
                         {
-                            "role": "user",
-                            "content": "Customer 67890 recently purchases were $150, $300, $13 and $89. "
-                            "Calculate their total account value.",
+                            "role": "assistant",
+                            "content": message.content,
+                            "tool_calls": message.tool_calls,
                         }
-                    ]
-
-                    # First call to get tool requests
-                    response = await litellm.acompletion(
-                        model=model,
-                        messages=messages,
-                        tools=tools,
                     )
 
-                    # Extract the response
-                    message = response.choices[0].message
-
-                    # Check if the model made tool calls
-                    if hasattr(message, "tool_calls") and message.tool_calls:
-                        print(f"🔧 Tool calls made: {len(message.tool_calls)}")
+                    # Execute each tool call
+                    for call in message.tool_calls:
+                        print(f"   - Executing {call.function.name}")
+
+                        # Execute the tool through MCP
+                        name = call.function.name
+                        arguments = json.loads(call.function.arguments)
+                        result = await result_cache.call(
+                            name,
+                            arguments,
+                            lambda: session.call_tool(name, arguments),
+                        )
 
-                        # Add assistant's message with tool calls to conversation
+                        # Add tool result to conversation
                         messages.append(
                             {
-                                "role": "assistant",
-                                "content": message.content,
-                                "tool_calls": message.tool_calls,
+                                "role": "tool",
+                                "content": encode_tool_result(result),
+                                "tool_call_id": call.id,
                             }
                         )
 
-                        # Execute each tool call
-                        for call in message.tool_calls:
-                            print(f"   - Executing {call.function.name}")
-
-                            # Execute the tool through MCP
-                            arguments = json.loads(call.function.arguments)
-                            result = await session.call_tool(
-                                call.function.name, arguments
-                            )
-
-                            # Add tool result to conversation
-                            messages.append(
-                                {
-                                    "role": "tool",
-                                    "content": str(result.content),
-                                    "tool_call_id": call.id,
-                                }
-                            )
-
-                        # Get final response from model with tool results
-                        final_response = await litellm.acompletion(
-                            model=model,
-                            messages=messages,
-                            tools=tools,
-                        )
+                    # Get final response from model with tool results
+                    final_response = await cached_acompletion(
+                        model, messages, tools, use_cache=use_cache
+                    )
 
-                        final_content = final_response.choices[0].message.content
-                        print(f"🤖 Final Response: {final_content}")
+                    final_content = final_response.choices[0].message.content
+                    print(f"🤖 Final Response: {final_content}")
 
+                else:
+                    # Display content if available (no tools called)
+                    if message.content:
+                        print(f"🤖 Response: {message.content}")
                     else:
-                        # Display content if available (no tools called)
-                        if message.content:
-                            print(f"🤖 Response: {message.content}")
-                        else:
-                            print("🤖 Response: (No response)")
+                        print("🤖 Response: (No response)")
 
-                except Exception as e:
-                    print(f"Error with {model}: {e}")
+            except Exception as e:
+                print(f"Error with {model}: {e}")
 
 
 async def main():
     """Main entry point."""
     Config.validate()
-    await setup_litellm_mcp()
+    try:
+        await setup_litellm_mcp()
+    finally:
+        await get_session_pool().close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+"""Queue-backed, optionally JSON and sampled logging for server and clients."""
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Name of the logger behind ``tool_log``
+TOOL_CALL_LOGGER = "tool_calls"
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else was passed with ``extra=``
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any ``extra=`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+# Renders tracebacks before records cross to the listener thread
+_exception_formatter = logging.Formatter()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueues records with only their content fixed, leaving the layout.
+
+    The standard ``QueueHandler.prepare`` runs the whole formatter in the
+    logging thread. Here the caller's thread only merges ``msg % args`` and
+    renders any traceback to ``exc_text``, since the arguments and the
+    exception's frames may change once the call returns; the format string,
+    timestamp and JSON encoding are applied on the listener thread. Fields
+    passed with ``extra=`` stay on the record.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SampledLogger(logging.LoggerAdapter):
+    """Logs a ``rate`` fraction of INFO and lower calls; warnings always pass.
+
+    The sampling decision is made before a log record is created, so a
+    dropped call costs one random number.
+    """
+
+    def __init__(self, logger: logging.Logger, rate: float = 1.0):
+        super().__init__(logger, {})
+        self.rate = rate
+
+    def isEnabledFor(self, level: int) -> bool:  # noqa: N802
+        if level < logging.WARNING and self.rate < 1.0 and random.random() >= self.rate:
+            return False
+        return self.logger.isEnabledFor(level)
+
+
+# Per-call tool logs, sampled at the configured LOG_TOOL_CALL_SAMPLE_RATE
+tool_log = SampledLogger(logging.getLogger(TOOL_CALL_LOGGER))
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(
+    level: str = "INFO", log_format: str = "text", tool_call_sample_rate: float = 1.0
+) -> None:
+    """Route all logging through a queue to a background writer thread.
+
+    Log calls then only build a record, merge its message and enqueue it;
+    formatting (text or JSON, chosen by ``log_format``) and the write to
+    stderr happen on the listener thread. Records skip the caller, process
+    and thread lookups, which neither format prints. ``tool_log`` keeps a
+    ``tool_call_sample_rate`` fraction of tool-call logs. Calling this
+    again replaces the previous configuration.
+    """
+    global _listener
+    if log_format not in ("text", "json"):
+        raise ValueError(f"Unknown log format: {log_format}")
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(
+        JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+    )
+    records: queue.SimpleQueue = queue.SimpleQueue()
+
+    root = logging.getLogger()
+    if _listener is not None:
+        _listener.stop()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(_DeferredQueueHandler(records))
+    root.setLevel(level.upper())
+
+    tool_log.rate = tool_call_sample_rate
+
+    # The logging HOWTO's switches for skipping unused record fields
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    _listener = QueueListener(records, handler)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -1,120 +1,332 @@
+import argparse
 import asyncio
-import logging
+import atexit
+import sys
 from datetime import datetime
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Union
 
 from fastmcp import FastMCP
-from pydantic import BaseModel, field_validator
-from pydantic_core import PydanticCustomError
 
-# Configure logging for better debugging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+from src.config import Config
+from src.customer_store import (
+    CustomerStore,
+    decode_cursor,
+    encode_cursor,
+    recency_key,
+)
+from src.logging_setup import configure_logging, tool_log
+from src.models import Customer, TicketRequest
+from src.prompt_templates import format_steps, get_prompt_templates
+from src.ticket_ids import new_ticket_id
+
+if TYPE_CHECKING:
+    from starlette.requests import Request
+    from starlette.responses import PlainTextResponse
+
+    from src.customer_cache import CachedCustomerRepository
+    from src.customer_repository import CustomerRepository
+    from src.metrics import MetricsRegistry
+    from src.purchase_ledger import PurchaseLedger, SQLitePurchaseLedger
+    from src.ticket_store import TicketStore
+
+
+def compact_json(data) -> str:
+    """Serialize a tool result as compact JSON, leaving out null model fields.
+
+    FastMCP's default indents by two spaces, which for long customer lists
+    is a third of the text a client passes on to its model.
+    """
+    import pydantic_core
+
+    return pydantic_core.to_json(data, fallback=str, exclude_none=True).decode()
+
 
 # Initialize FastMCP server
-mcp = FastMCP("Customer Service Assistant")
-
-
-# Data models for type safety and validation
-class Customer(BaseModel):
-    id: str
-    name: str
-    email: str
-    phone: Optional[str] = None
-    account_status: str = "active"
-    last_interaction: Optional[datetime] = None
-
-    @field_validator("email", mode="after")  # noqa
-    @classmethod
-    def email_must_be_valid(cls, v: str) -> str:
-        if "@" not in v:
-            raise PydanticCustomError(
-                "invalid_email",
-                "Invalid email format: {email} must contain @",
-                {"email": v},
-            )
-        return v
-
-
-class TicketRequest(BaseModel):
-    customer_id: str
-    subject: str
-    description: str
-    priority: str = "normal"
-
-    @field_validator("priority", mode="after")  # noqa
-    @classmethod
-    def priority_must_be_valid(cls, v: str) -> str:
-        valid_priorities = ["low", "normal", "high", "urgent"]
-        if v not in valid_priorities:
-            raise PydanticCustomError(
-                "invalid_priority",
-                "Priority must be one of: {valid_priorities}, got {priority}",
-                {"valid_priorities": ", ".join(valid_priorities), "priority": v},
-            )
-        return v
-
-
-# Simulated customer database
-CUSTOMERS_DB = {
-    "12345": Customer(
-        id="12345",
-        name="Alice Johnson",
-        email="alice@example.com",
-        phone="+1-555-0123",
-        account_status="active",
-        last_interaction=datetime.now(),
-    ),
-    "67890": Customer(
-        id="67890",
-        name="Bob Smith",
-        email="bob@example.com",
-        account_status="suspended",
-    ),
+mcp = FastMCP("Customer Service Assistant", tool_serializer=compact_json)
+
+# Per-tool, resource and prompt call counts, errors, latency and sizes.
+# Created on first use; main() instruments the server's handlers with it.
+_metrics: Optional["MetricsRegistry"] = None
+
+
+def get_metrics() -> "MetricsRegistry":
+    """Return the request metrics registry, creating it on first use."""
+    global _metrics
+    if _metrics is None:
+        from src.metrics import MetricsRegistry
+
+        _metrics = MetricsRegistry(log_interval=Config.METRICS_LOG_INTERVAL)
+    return _metrics
+
+
+# Simulated customer database, indexed by last interaction
+CUSTOMERS_DB = CustomerStore(
+    [
+        Customer(
+            id="12345",
+            name="Alice Johnson",
+            email="alice@example.com",
+            phone="+1-555-0123",
+            account_status="active",
+            last_interaction=datetime.now(),
+        ),
+        Customer(
+            id="67890",
+            name="Bob Smith",
+            email="bob@example.com",
+            account_status="suspended",
+        ),
+    ]
+)
+
+# Upper bound on IDs accepted by a single get_customers call
+MAX_BATCH_LOOKUP = 100
+
+# Upper bound on customers returned by one get_recent_customers page
+MAX_RECENT_PAGE = 1000
+
+# Upper bound on customers valued by a single calculate_cohort_account_values call
+MAX_COHORT_ACCOUNTS = 10_000
+
+# Tool annotations for client-side result caching: read-only tools give
+# clients a cacheTtl in seconds, and tools that change state list the
+# tools whose cached results they make stale
+CUSTOMER_READ = {"readOnlyHint": True, "cacheTtl": 30}
+RECENT_CUSTOMERS_READ = {"readOnlyHint": True, "cacheTtl": 5}
+ACCOUNT_VALUE_READ = {"readOnlyHint": True, "cacheTtl": 60}
+TICKET_WRITE = {
+    "readOnlyHint": False,
+    "destructiveHint": False,
+    "invalidates": ["get_customers", "get_recent_customers"],
+}
+PURCHASE_WRITE = {
+    "readOnlyHint": False,
+    "destructiveHint": False,
+    "invalidates": ["calculate_account_value", "calculate_cohort_account_values"],
 }
 
+# Repository used by the resource and tools; the seed data above backs the
+# in-memory backend and is inserted into SQLite when missing. Opened on
+# first use, like the ticket store and purchase ledger below.
+_customers: Optional["CustomerRepository"] = None
+
+# Hot customers are served from an LRU + TTL cache in front of the backend
+_customer_cache: Optional["CachedCustomerRepository"] = None
+
+
+def get_customer_repository() -> "CustomerRepository":
+    """Return the customer repository, opening it on first use."""
+    global _customers, _customer_cache
+    if _customers is None:
+        from src.customer_repository import create_customer_repository
+
+        repository = create_customer_repository(
+            Config.CUSTOMER_BACKEND,
+            seed=CUSTOMERS_DB,
+            db_path=Config.CUSTOMER_DB_PATH,
+            pool_size=Config.CUSTOMER_DB_POOL_SIZE,
+        )
+        if Config.CUSTOMER_CACHE_SIZE > 0:
+            from src.customer_cache import CachedCustomerRepository
+
+            repository = _customer_cache = CachedCustomerRepository(
+                repository,
+                max_size=Config.CUSTOMER_CACHE_SIZE,
+                ttl_seconds=Config.CUSTOMER_CACHE_TTL,
+            )
+        _customers = repository
+    return _customers
+
+
+# Created tickets are queued and written to disk in batches; anything still
+# queued when the process exits is written before it goes. Opened on first
+# use, so importing the server (tests, tool listing) creates no database.
+_tickets: Optional["TicketStore"] = None
+
+
+def get_ticket_store() -> "TicketStore":
+    """Return the ticket store, opening it on first use."""
+    global _tickets
+    if _tickets is None:
+        from src.ticket_store import create_ticket_store
+
+        _tickets = create_ticket_store(
+            Config.TICKET_BACKEND,
+            path=Config.TICKET_STORE_PATH,
+            fsync=Config.TICKET_FSYNC,
+            batch_size=Config.TICKET_BATCH_SIZE,
+            flush_interval=Config.TICKET_FLUSH_INTERVAL,
+            fsync_interval=Config.TICKET_FSYNC_INTERVAL,
+        )
+    return _tickets
+
+
+def _shutdown_tickets() -> None:
+    if _tickets is not None:
+        _tickets.shutdown()
+
+
+atexit.register(_shutdown_tickets)
+
+# Sample purchases recorded for the demo customers when the ledger is empty
+SAMPLE_PURCHASES = [
+    ("12345", 100.0, datetime(2025, 1, 15, 10, 30)),
+    ("12345", 250.0, datetime(2025, 2, 3, 14, 5)),
+    ("12345", 75.0, datetime(2025, 3, 21, 9, 45)),
+    ("67890", 49.99, datetime(2025, 2, 11, 16, 20)),
+]
+
+# Purchases per customer, so account values can be calculated from an ID
+# instead of the model copying whole histories into tool arguments. Opened
+# on first use, which keeps NumPy off the server's startup path.
+_purchases: Optional[Union["PurchaseLedger", "SQLitePurchaseLedger"]] = None
+
+
+def get_purchase_ledger() -> Union["PurchaseLedger", "SQLitePurchaseLedger"]:
+    """Return the purchase ledger, loading it on first use."""
+    global _purchases
+    if _purchases is None:
+        from src.purchase_ledger import create_purchase_ledger
+
+        _purchases = create_purchase_ledger(
+            Config.PURCHASE_BACKEND,
+            path=Config.PURCHASE_LEDGER_PATH,
+            db_path=Config.PURCHASE_DB_PATH,
+            seed=SAMPLE_PURCHASES,
+        )
+    return _purchases
+
+
+async def _ledger_call(method: Callable[..., Any], *args) -> Any:
+    """Call a ledger method, on a thread if the ledger blocks (SQLite)."""
+    if get_purchase_ledger().blocking:
+        return await asyncio.to_thread(method, *args)
+    return method(*args)
+
+
+def _save_purchases() -> None:
+    if Config.PURCHASE_LEDGER_PATH and _purchases is not None and _purchases.dirty:
+        _purchases.save(Config.PURCHASE_LEDGER_PATH)
+
+
+atexit.register(_save_purchases)
+
 
 # MCP Resource: Customer Data Access
 @mcp.resource("customer://{customer_id}")
 async def get_customer_info(customer_id: str) -> Customer:
     """Retrieve customer information by ID."""
-    logger.info(f"Retrieving customer info for ID: {customer_id}")
+    tool_log.info("Retrieving customer info for ID: %s", customer_id)
 
-    if customer_id not in CUSTOMERS_DB:
+    customer = await get_customer_repository().get(customer_id)
+    if customer is None:
         raise ValueError(f"Customer {customer_id} not found")
 
-    # Simulate database delay
-    await asyncio.sleep(0.1)
-    return CUSTOMERS_DB[customer_id]
+    return customer
+
+
+# MCP Resource: Customer Cache Statistics
+@mcp.resource("stats://customer-cache")
+async def get_customer_cache_stats() -> dict:
+    """Report customer cache hit, miss and eviction counters."""
+    get_customer_repository()  # creates the cache, if one is configured
+    if _customer_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **_customer_cache.stats()}
+
+
+# MCP Resource: Request Metrics
+@mcp.resource("stats://metrics")
+async def get_request_metrics() -> dict:
+    """Report call counts, errors and latency per tool, resource and prompt."""
+    if not Config.METRICS_ENABLED:
+        return {"enabled": False}
+    return {"enabled": True, **get_metrics().summary()}
+
 
+# Prometheus scrape endpoint, served alongside the HTTP transports
+@mcp.custom_route(Config.METRICS_PATH, methods=["GET"], include_in_schema=False)
+async def prometheus_metrics(request: "Request") -> "PlainTextResponse":
+    """Expose request metrics in the Prometheus text format."""
+    from starlette.responses import PlainTextResponse
 
-@mcp.tool()
-async def get_recent_customers(limit: int = 10) -> List[Customer]:
-    """Retrieve recently active customers."""
-    logger.info(f"Retrieving {limit} recent customers")
+    return PlainTextResponse(
+        get_metrics().render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
+# MCP Tool: Batched Customer Lookup
+@mcp.tool(annotations=CUSTOMER_READ)
+async def get_customers(customer_ids: List[str]) -> dict:
+    """Retrieve several customers by ID in a single request."""
+    tool_log.info("Retrieving %d customers", len(customer_ids))
+
+    if len(customer_ids) > MAX_BATCH_LOOKUP:
+        raise ValueError(
+            f"Cannot look up more than {MAX_BATCH_LOOKUP} customers at once"
+        )
+
+    # Deduplicate while keeping the caller's order
+    requested = list(dict.fromkeys(customer_ids))
+    found = await get_customer_repository().get_many(requested)
 
-    # Sort by last interaction, return most recent
-    sorted_customers = sorted(
-        CUSTOMERS_DB.values(),
-        key=lambda c: c.last_interaction or datetime.min,
-        reverse=True,
+    return {
+        "customers": [found[cid] for cid in requested if cid in found],
+        "missing_ids": [cid for cid in requested if cid not in found],
+    }
+
+
+@mcp.tool(annotations=RECENT_CUSTOMERS_READ)
+async def get_recent_customers(
+    limit: int = 10, cursor: Optional[str] = None, fields: Optional[List[str]] = None
+) -> dict:
+    """Retrieve recently active customers, most recent first, one page at a time.
+
+    Returns up to limit customers and a next_cursor; pass it back as cursor
+    for the next page, until next_cursor is null. fields limits each
+    customer to the named fields (id is always included).
+    """
+    tool_log.info("Retrieving %d recent customers", limit)
+
+    if limit > MAX_RECENT_PAGE:
+        raise ValueError(f"Cannot return more than {MAX_RECENT_PAGE} customers at once")
+    include = None
+    if fields is not None:
+        unknown = set(fields) - set(Customer.model_fields)
+        if unknown:
+            raise ValueError(f"Unknown customer fields: {', '.join(sorted(unknown))}")
+        include = {"id", *fields}
+
+    # A keyset page served from the backend's recency index
+    before = decode_cursor(cursor) if cursor else None
+    page = await get_customer_repository().recent(limit, before)
+    next_cursor = (
+        encode_cursor(recency_key(page[-1])) if page and len(page) == limit else None
     )
 
-    return sorted_customers[:limit]
+    return {
+        "customers": (
+            page
+            if include is None
+            else [c.model_dump(include=include, exclude_none=True) for c in page]
+        ),
+        "next_cursor": next_cursor,
+    }
 
 
 # MCP Tool: Create Support Ticket
-@mcp.tool()
+@mcp.tool(annotations=TICKET_WRITE)
 async def create_support_ticket(request: TicketRequest) -> dict:
     """Create a new customer support ticket."""
-    logger.info(f"Creating ticket for customer {request.customer_id}")
+    tool_log.info("Creating ticket for customer %s", request.customer_id)
 
     # Validate customer exists
-    if request.customer_id not in CUSTOMERS_DB:
+    customers = get_customer_repository()
+    if not await customers.exists(request.customer_id):
         raise ValueError(f"Customer {request.customer_id} not found")
 
-    # Simulate ticket creation
-    ticket_id = f"TICKET-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    # Time-ordered and unique across workers, even within one millisecond
+    ticket_id = new_ticket_id()
 
     ticket = {
         "ticket_id": ticket_id,
@@ -126,84 +338,238 @@ async def create_support_ticket(request: TicketRequest) -> dict:
         "created_at": datetime.now().isoformat(),
     }
 
-    return ticket
+    # A retried call with the same idempotency key gets the original ticket
+    stored = await get_ticket_store().add(ticket, request.idempotency_key)
+
+    # Opening a ticket counts as an interaction for recency ordering; a
+    # retry that got the original ticket back opened nothing
+    if stored["ticket_id"] == ticket_id:
+        await customers.record_interaction(request.customer_id)
+    return stored
+
+
+# MCP Tool: Record Purchase
+@mcp.tool(annotations=PURCHASE_WRITE)
+async def record_purchase(
+    customer_id: str, amount: float, purchased_at: Optional[datetime] = None
+) -> dict:
+    """Record a customer purchase in the server-side ledger."""
+    tool_log.info("Recording purchase for customer %s", customer_id)
+
+    if not await get_customer_repository().exists(customer_id):
+        raise ValueError(f"Customer {customer_id} not found")
+
+    from src.purchase_ledger import write_snapshot
+
+    purchases = get_purchase_ledger()
+    await _ledger_call(purchases.record, customer_id, amount, purchased_at)
+
+    # Persist the in-memory ledger periodically, off the event loop
+    path = Config.PURCHASE_LEDGER_PATH
+    if path and purchases.save_due(Config.PURCHASE_LEDGER_SAVE_INTERVAL):
+        await asyncio.to_thread(write_snapshot, path, purchases.checkpoint())
+
+    return await _ledger_call(purchases.summary, customer_id)
 
 
 # MCP Tool: Calculate Account Value
-@mcp.tool()
+@mcp.tool(annotations=ACCOUNT_VALUE_READ)
 async def calculate_account_value(
-    customer_id: str, purchase_history: List[float]
+    customer_id: str,
+    purchase_history: Optional[List[float]] = None,
+    purchase_history_b64: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
 ) -> dict:
-    """Calculate total account value and average purchase."""
-    logger.info(f"Calculating account value for {customer_id}")
-
-    if not purchase_history:
-        return {
-            "customer_id": customer_id,
-            "total_value": 0.0,
-            "average_purchase": 0.0,
-            "purchase_count": 0,
-        }
+    """Calculate total account value and average purchase.
+
+    By default the customer's recorded purchases are used, optionally
+    limited to start_date (inclusive) through end_date (exclusive). To value
+    other amounts, pass purchase_history, or for long histories
+    purchase_history_b64: base64-encoded little-endian float64 amounts.
+    """
+    tool_log.info("Calculating account value for %s", customer_id)
+    from src.account_value import decode_purchases, summarize_purchases
+
+    if purchase_history_b64 is not None:
+        return summarize_purchases(customer_id, decode_purchases(purchase_history_b64))
+    if purchase_history is not None:
+        return summarize_purchases(customer_id, purchase_history)
+    return await _ledger_call(
+        get_purchase_ledger().summary, customer_id, start_date, end_date
+    )
 
-    total = sum(purchase_history)
-    average = total / len(purchase_history)
 
-    return {
-        "customer_id": customer_id,
-        "total_value": round(total, 2),
-        "average_purchase": round(average, 2),
-        "purchase_count": len(purchase_history),
-    }
+# MCP Tool: Calculate Account Values for a Cohort
+@mcp.tool(annotations=ACCOUNT_VALUE_READ)
+async def calculate_cohort_account_values(
+    customer_ids: List[str],
+    purchase_counts: Optional[List[int]] = None,
+    purchases_b64: Optional[str] = None,
+    purchase_amounts: Optional[List[float]] = None,
+    percentiles: Optional[List[float]] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> dict:
+    """Calculate account values for many customers in one call.
+
+    By default each customer's recorded purchases are used, optionally
+    limited to start_date (inclusive) through end_date (exclusive). To value
+    other amounts, concatenate them in customer_ids order, give per-customer
+    purchase_counts and send them as purchase_amounts or purchases_b64
+    (base64 little-endian float64). Returns each customer's total, average,
+    count, min/max and percentiles (default p50, p90, p99), plus cohort-wide
+    totals.
+    """
+    tool_log.info("Calculating account values for %d customers", len(customer_ids))
+
+    if len(customer_ids) > MAX_COHORT_ACCOUNTS:
+        raise ValueError(
+            f"Cannot value more than {MAX_COHORT_ACCOUNTS} customers at once"
+        )
+    from src.account_value import decode_purchases, summarize_cohort
+
+    if purchases_b64 is not None:
+        amounts = decode_purchases(purchases_b64)
+    elif purchase_amounts is not None:
+        amounts = purchase_amounts
+    else:
+        purchase_counts, amounts = await _ledger_call(
+            get_purchase_ledger().cohort_purchases, customer_ids, start_date, end_date
+        )
+    if purchase_counts is None:
+        raise ValueError("purchase_counts is required with explicit purchases")
+    # Large cohorts are CPU-bound; keep the event loop free while NumPy works
+    return await asyncio.to_thread(
+        summarize_cohort, customer_ids, purchase_counts, amounts, percentiles
+    )
 
 
 # MCP Prompt: Customer Service Response Template
 @mcp.prompt("customer_service_response")
 async def generate_service_response_prompt(
-    customer_name: str, issue_type: str, resolution_steps: List[str]
+    customer_name: str, issue_type: str, resolution_steps: Union[List[str], str]
 ) -> str:
     """Generate a professional customer service response."""
-
-    steps_text = "\n".join(
-        [f"{i+1}. {step}" for i, step in enumerate(resolution_steps)]
+    if not isinstance(resolution_steps, str):
+        resolution_steps = tuple(resolution_steps)
+    # Rendered from a compiled, memoized template that reloads when edited
+    template = get_prompt_templates().get("customer_service_response")
+    return template.render(
+        customer_name=customer_name,
+        issue_type=issue_type,
+        steps_text=format_steps(resolution_steps),
     )
 
-    return f"""
-You are a professional customer service representative.
-Generate a helpful and empathetic response for the customer.
 
-Customer: {customer_name}
-Issue Type: {issue_type}
+BANNER = """🚀 Starting Customer Service MCP Server...
+📋 Available Resources:
+   - customer://{customer_id} - Get customer info
+   - stats://customer-cache - Customer cache counters
+   - stats://metrics - Request counts and latency
+🔧 Available Tools:
+   - get_customers - Get several customers by ID
+   - get_recent_customers - Page through recent customers
+   - create_support_ticket - Create support ticket
+   - record_purchase - Record a purchase in the ledger
+   - calculate_account_value - Calculate account value
+   - calculate_cohort_account_values - Value many accounts at once
+📝 Available Prompts:
+   - customer_service_response - Generate responses
+
+✅ Server ready for connections!"""
+
+# Transports accepted by main(); the HTTP ones listen on host:port
+TRANSPORTS = ("stdio", "streamable-http", "sse")
 
-Resolution Steps:
-{steps_text}
 
-Guidelines:
-- Be professional but warm
-- Acknowledge the customer's concern
-- Provide clear, actionable steps
-- End with an offer for further assistance
-- Keep the tone positive and solution-focused
+def _prepare_server() -> None:
+    """Configure logging and instrument the request handlers before serving."""
+    configure_logging(
+        Config.LOG_LEVEL, Config.LOG_FORMAT, Config.LOG_TOOL_CALL_SAMPLE_RATE
+    )
+    if Config.METRICS_ENABLED:
+        from src.metrics import instrument
+
+        instrument(mcp, get_metrics())
 
-Generate a complete customer service response
-following these guidelines.
-"""
 
+def create_http_app():
+    """Build the ASGI app served by each uvicorn worker process.
 
-def main():
+    Used as a uvicorn factory when running more than one worker. Sessions
+    are stateless so any worker can answer any request without a sticky
+    load balancer; customer data is shared through the SQLite backend.
+    """
+    _prepare_server()
+    return mcp.http_app(
+        path=Config.MCP_HTTP_PATH,
+        transport="streamable-http",
+        stateless_http=True,
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the server's command line, defaulting to the configuration."""
+    parser = argparse.ArgumentParser(description="Customer Service MCP Server")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=Config.MCP_TRANSPORT)
+    parser.add_argument("--host", default=Config.MCP_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=Config.MCP_SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=Config.MCP_WORKERS)
+    args = parser.parse_args(argv)
+
+    if args.workers > 1:
+        if args.transport != "streamable-http":
+            parser.error("--workers > 1 requires the streamable-http transport")
+        if Config.CUSTOMER_BACKEND != "sqlite":
+            # Each worker would otherwise hold its own copy of the customers
+            parser.error("--workers > 1 requires CUSTOMER_BACKEND=sqlite")
+        if Config.TICKET_BACKEND != "sqlite":
+            # Idempotency keys are only enforced across processes by SQLite
+            parser.error("--workers > 1 requires TICKET_BACKEND=sqlite")
+        if Config.TICKET_WORKER_ID is not None:
+            # Every worker would inherit it; unset, each leases its own ID
+            parser.error("--workers > 1 requires TICKET_WORKER_ID to be unset")
+        if Config.PURCHASE_BACKEND != "sqlite":
+            # The in-memory ledger would diverge per worker, and each worker
+            # would overwrite the others' purchases when saving it
+            parser.error("--workers > 1 requires PURCHASE_BACKEND=sqlite")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point for the MCP server."""
-    print("🚀 Starting Customer Service MCP Server...")
-    print("📋 Available Resources:")
-    print("   - customer://{customer_id} - Get customer info")
-    print("🔧 Available Tools:")
-    print("   - get_recent_customers - Get recent customers")
-    print("   - create_support_ticket - Create support ticket")
-    print("   - calculate_account_value - Calculate account value")
-    print("📝 Available Prompts:")
-    print("   - customer_service_response - Generate responses")
-    print("\n✅ Server ready for connections!")
+    args = parse_args(argv)
+    _prepare_server()
+
+    # To stderr: over stdio, stdout carries the JSON-RPC messages
+    print(BANNER, file=sys.stderr)
 
     # Run the server
-    mcp.run()
+    if args.transport == "stdio":
+        mcp.run()
+    elif args.workers > 1:
+        import uvicorn
+
+        print(
+            f"🌐 Serving {Config.MCP_HTTP_PATH} on {args.host}:{args.port} "
+            f"with {args.workers} workers",
+            file=sys.stderr,
+        )
+        uvicorn.run(
+            "src.main:create_http_app",
+            factory=True,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+        )
+    else:
+        mcp.run(
+            transport=args.transport,
+            host=args.host,
+            port=args.port,
+            path=Config.MCP_HTTP_PATH if args.transport == "streamable-http" else None,
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,332 @@
+"""Per-tool, per-resource and per-prompt request metrics for the MCP server."""
+
+import asyncio
+import json
+import logging
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from mcp import types
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; one more bucket counts everything slower
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Upper bounds in bytes of JSON arguments or returned text
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is one bisect and two additions."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile as the upper bound of its bucket."""
+        total = self.count
+        if not total:
+            return None
+        rank, seen = q * total, 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class _Series:
+    """Counters and histograms for one tool, resource or prompt."""
+
+    __slots__ = ("calls", "errors", "latency", "request_bytes", "response_bytes")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.request_bytes = Histogram(SIZE_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Request metrics keyed by ``(kind, name)``.
+
+    Updates happen on the server's event loop, so the counters need no
+    lock. ``render_prometheus`` produces the Prometheus text exposition
+    format and ``summary`` a compact dict, which is logged every
+    ``log_interval`` seconds when that is set (for stdio servers, which
+    have no metrics endpoint).
+    """
+
+    def __init__(self, log_interval: float = 0) -> None:
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self.log_interval = log_interval
+        self._log_task: Optional[asyncio.Task] = None
+
+    def _start_logging(self) -> None:
+        # Started lazily from the first request, on the serving event loop
+        if self._log_task is None and self.log_interval > 0:
+            self._log_task = asyncio.get_running_loop().create_task(
+                self._log_periodically()
+            )
+
+    async def _log_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.log_interval)
+            logger.info("MCP metrics %s", json.dumps(self.summary()))
+
+    def series(self, kind: str, name: str) -> _Series:
+        key = (kind, name)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def observe(
+        self,
+        kind: str,
+        name: str,
+        seconds: float,
+        error: bool,
+        request_bytes: int,
+        response_bytes: int,
+    ) -> None:
+        """Record one completed request."""
+        series = self.series(kind, name)
+        series.calls += 1
+        if error:
+            series.errors += 1
+        series.latency.observe(seconds)
+        series.request_bytes.observe(request_bytes)
+        series.response_bytes.observe(response_bytes)
+
+    def summary(self) -> dict:
+        """Calls, errors, mean and approximate p50/p99 latency per series."""
+        summary = {}
+        for (kind, name), series in sorted(self._series.items()):
+            latency = series.latency
+            summary[f"{kind}:{name}"] = {
+                "calls": series.calls,
+                "errors": series.errors,
+                "mean_ms": round(latency.sum / series.calls * 1000, 3),
+                "p50_ms": _milliseconds(latency.quantile(0.5)),
+                "p99_ms": _milliseconds(latency.quantile(0.99)),
+                "response_bytes": int(series.response_bytes.sum),
+            }
+        return summary
+
+    def render_prometheus(self) -> str:
+        """Render every series in the Prometheus text exposition format."""
+        items = sorted(self._series.items())
+        lines = []
+
+        def counter(metric: str, help_text: str, attribute: str) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for (kind, name), series in items:
+                labels = f'kind="{kind}",name="{_escape(name)}"'
+                lines.append(f"{metric}{{{labels}}} {getattr(series, attribute)}")
+
+        def histogram(metric: str, help_text: str, attribute: str) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for (kind, name), series in items:
+                labels = f'kind="{kind}",name="{_escape(name)}"'
+                values: Histogram = getattr(series, attribute)
+                cumulative = 0
+                for bound, count in zip(values.bounds, values.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                cumulative += values.counts[-1]
+                lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{labels}}} {values.sum}")
+                lines.append(f"{metric}_count{{{labels}}} {cumulative}")
+
+        counter("mcp_requests_total", "MCP requests handled.", "calls")
+        counter("mcp_request_errors_total", "MCP requests that failed.", "errors")
+        histogram(
+            "mcp_request_duration_seconds",
+            "Time spent handling MCP requests.",
+            "latency",
+        )
+        histogram(
+            "mcp_request_payload_bytes",
+            "Size of MCP request arguments as JSON.",
+            "request_bytes",
+        )
+        histogram(
+            "mcp_response_payload_bytes",
+            "Size of the text and binary content returned.",
+            "response_bytes",
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _milliseconds(seconds: Optional[float]) -> Optional[float]:
+    if seconds is None or seconds == float("inf"):
+        return None
+    return round(seconds * 1000, 3)
+
+
+# Reused because json.dumps with options builds a new encoder per call
+_encoder = json.JSONEncoder(separators=(",", ":"), default=str)
+
+
+def _arguments_size(arguments: Optional[Dict[str, Any]]) -> int:
+    if not arguments:
+        return 0
+    try:
+        return len(_encoder.encode(arguments))
+    except (TypeError, ValueError):
+        return 0
+
+
+# Content types and the field holding their text or base64 data; looked
+# up by exact type because isinstance on pydantic models is comparatively slow
+_CONTENT_FIELDS = {
+    types.TextContent: "text",
+    types.TextResourceContents: "text",
+    types.BlobResourceContents: "blob",
+    types.ImageContent: "data",
+    types.AudioContent: "data",
+}
+# Wrappers and the field holding their content
+_CONTENT_WRAPPERS = {types.PromptMessage: "content", types.EmbeddedResource: "resource"}
+
+
+def _content_size(items: Sequence[Any]) -> int:
+    """Characters of text plus base64 data in MCP content items."""
+    size = 0
+    for item in items:
+        while (wrapper := _CONTENT_WRAPPERS.get(type(item))) is not None:
+            item = getattr(item, wrapper)
+        field = _CONTENT_FIELDS.get(type(item))
+        if field is not None:
+            size += len(getattr(item, field))
+    return size
+
+
+# Resolved resource URIs remembered per handler before starting over
+_MAX_RESOURCE_LABELS = 4096
+
+
+class _Instrumented:
+    """Wraps a low-level request handler to time and size each request."""
+
+    def __init__(self, server, registry: MetricsRegistry, kind: str, handler):
+        self.server = server
+        self.registry = registry
+        self.kind = kind
+        self.handler = handler
+        self._resource_labels: Dict[str, str] = {}
+
+    async def _name(self, request) -> str:
+        if self.kind != "resource":
+            return request.params.name
+        uri = str(request.params.uri)
+        label = self._resource_labels.get(uri)
+        if label is None:
+            label = await self._resource_label(uri)
+            if len(self._resource_labels) >= _MAX_RESOURCE_LABELS:
+                self._resource_labels.clear()
+            self._resource_labels[uri] = label
+        return label
+
+    async def _resource_label(self, uri: str) -> str:
+        # Label templated resources by template so IDs don't become series
+        if uri in await self.server.get_resources():
+            return uri
+        for key, template in (await self.server.get_resource_templates()).items():
+            if template.matches(uri):
+                return key
+        return uri
+
+    async def __call__(self, request):
+        if self.registry._log_task is None:
+            self.registry._start_logging()
+        start = time.perf_counter()
+        response = None
+        try:
+            response = await self.handler(request)
+            return response
+        finally:
+            seconds = time.perf_counter() - start
+            try:
+                name = await self._name(request)
+                error, request_bytes, response_bytes = self._sizes(request, response)
+                self.registry.observe(
+                    self.kind, name, seconds, error, request_bytes, response_bytes
+                )
+            except Exception:  # metrics must never fail a request
+                logger.debug("Could not record request metrics", exc_info=True)
+
+    def _sizes(self, request, response) -> Tuple[bool, int, int]:
+        """Whether the request failed, and its argument and result sizes."""
+        if self.kind == "resource":
+            if response is None:
+                return True, 0, 0
+            return False, 0, _content_size(response.root.contents)
+        request_bytes = _arguments_size(request.params.arguments)
+        if response is None:
+            return True, request_bytes, 0
+        result = response.root
+        if self.kind == "tool":
+            # Tool failures come back as results flagged isError
+            return result.isError, request_bytes, _content_size(result.content)
+        return False, request_bytes, _content_size(result.messages)
+
+
+_REQUEST_KINDS = (
+    (types.CallToolRequest, "tool"),
+    (types.ReadResourceRequest, "resource"),
+    (types.GetPromptRequest, "prompt"),
+)
+
+
+def instrument(server, registry: MetricsRegistry) -> MetricsRegistry:
+    """Record metrics for every tool, resource and prompt request.
+
+    Wraps the low-level MCP request handlers of a FastMCP ``server``, so
+    the timing covers argument validation, the function itself and result
+    conversion, and new tools are covered without decorating each one.
+    """
+    handlers = server._mcp_server.request_handlers
+    for request_type, kind in _REQUEST_KINDS:
+        handler = handlers[request_type]
+        if not isinstance(handler, _Instrumented):
+            handlers[request_type] = _Instrumented(server, registry, kind, handler)
+    return registry
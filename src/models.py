@@ -0,0 +1,49 @@
+"""Data models shared by the MCP server and its storage backends."""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, field_validator
+from pydantic_core import PydanticCustomError
+
+
+# Data models for type safety and validation
+class Customer(BaseModel):
+    id: str
+    name: str
+    email: str
+    phone: Optional[str] = None
+    account_status: str = "active"
+    last_interaction: Optional[datetime] = None
+
+    @field_validator("email", mode="after")  # noqa
+    @classmethod
+    def email_must_be_valid(cls, v: str) -> str:
+        if "@" not in v:
+            raise PydanticCustomError(
+                "invalid_email",
+                "Invalid email format: {email} must contain @",
+                {"email": v},
+            )
+        return v
+
+
+class TicketRequest(BaseModel):
+    customer_id: str
+    subject: str
+    description: str
+    priority: str = "normal"
+    # Retries with the same key return the original ticket
+    idempotency_key: Optional[str] = None
+
+    @field_validator("priority", mode="after")  # noqa
+    @classmethod
+    def priority_must_be_valid(cls, v: str) -> str:
+        valid_priorities = ["low", "normal", "high", "urgent"]
+        if v not in valid_priorities:
+            raise PydanticCustomError(
+                "invalid_priority",
+                "Priority must be one of: {valid_priorities}, got {priority}",
+                {"valid_priorities": ", ".join(valid_priorities), "priority": v},
+            )
+        return v
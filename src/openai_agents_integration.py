@@ -1,25 +1,71 @@
 """OpenAI Agents SDK integration with MCP server."""
 
 import asyncio
+from typing import Any, Optional
+
 from agents import Agent, Runner
-from agents.mcp import MCPServerStdio
+from agents.mcp import MCPServer
+from mcp.types import CallToolResult
+from mcp.types import Tool as MCPTool
 
 from config import Config
+from session_pool import MCPSessionPool, get_session_pool, load_server_config
+
+
+class PooledMCPServer(MCPServer):
+    """Agents SDK MCP server whose requests go through the shared pool.
+
+    No session is held between requests: each tool call borrows one via
+    ``MCPSessionPool.call_tool``, which repeats the call on a fresh server
+    if the connection drops and the tool is safe to repeat.
+    """
+
+    def __init__(self, pool: MCPSessionPool, config: dict, name: str):
+        self.pool = pool
+        self.config = config
+        self._name = name
+        self._tools: Optional[list[MCPTool]] = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def connect(self):
+        # Starts the server, or reuses a warm pooled session, and lists tools
+        await self.list_tools()
 
+    async def cleanup(self):
+        # Sessions belong to the pool, which closes them on shutdown
+        self._tools = None
 
-async def run_customer_service_scenarios():
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.cleanup()
+
+    async def list_tools(self) -> list[MCPTool]:
+        if self._tools is None:
+            async with self.pool.session(self.config, self._name) as session:
+                self._tools = (await session.list_tools()).tools
+        return self._tools
+
+    async def call_tool(
+        self, tool_name: str, arguments: dict[str, Any] | None
+    ) -> CallToolResult:
+        return await self.pool.call_tool(self.config, tool_name, arguments)
+
+
+async def run_customer_service_scenarios(pool: Optional[MCPSessionPool] = None):
     """Demonstrate OpenAI Agents + MCP integration."""
     print("🤖 Setting up OpenAI Agents + MCP integration...")
 
-    # Create MCP server connection with proper async context manager
-    mcp_server = MCPServerStdio(
-        params={
-            "command": "poetry",
-            "args": ["run", "python", "src/main.py"]
-        },
-        cache_tools_list=True,
+    # Borrow a warm MCP session from the shared pool
+    mcp_server = PooledMCPServer(
+        pool or get_session_pool(),
+        load_server_config("customer-service"),
         name="Customer Service Server",
-        client_session_timeout_seconds=30  # Increase timeout for startup
     )
 
     # Use the MCP server within an async context manager
@@ -30,25 +76,28 @@ async def run_customer_service_scenarios():
             instructions="""You are a helpful customer service assistant.
             Use the available tools to help customers with their requests.
             Always be professional and empathetic.
-            
+
             Available tools:
-            - get_recent_customers: Get a list of recent customers
+            - get_customers: Look up several customers by ID in one call
+            - get_recent_customers: Get recent customers a page at a time (pass next_cursor back as cursor; fields picks columns)
             - create_support_ticket: Create support tickets for customers
-            - calculate_account_value: Calculate customer account values
-            
+            - record_purchase: Record a purchase for a customer
+            - calculate_account_value: Calculate a customer's account value from their recorded purchases
+            - calculate_cohort_account_values: Value many customers' accounts at once
+
             When helping customers:
             1. Look up their information first when possible
             2. Create tickets for issues that need follow-up
             3. Calculate account values when discussing billing or purchases
             4. Always provide clear, helpful responses""",
-            mcp_servers=[server]
+            mcp_servers=[server],
         )
 
         # Example customer service scenarios
         scenarios = [
             "Get a list of recent customers and summarize their status",
             "Create a high-priority support ticket for customer 67890 about billing issues",
-            "Calculate the account value for customer 12345 with purchases: $150, $300, $89"
+            "Calculate the account value for customer 12345 with purchases: $150, $300, $89",
         ]
 
         for i, scenario in enumerate(scenarios, 1):
@@ -70,8 +119,11 @@ async def main():
         print("OpenAI Agents example requires OpenAI. Set LLM_PROVIDER=openai in .env")
         return
 
-    await run_customer_service_scenarios()
+    try:
+        await run_customer_service_scenarios()
+    finally:
+        await get_session_pool().close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -2,18 +2,60 @@
 
 import asyncio
 import json
+import logging
 from contextlib import AsyncExitStack
+from typing import Optional
 
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
 from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionMessage
 
+from completion_cache import CompletionCache, completion_key, get_completion_cache
 from config import Config
+from history import compact_history
+from logging_setup import configure_logging, tool_log
+from server_connections import (
+    MCPServerConnection,
+    connect_servers,
+    format_connect_report,
+)
+from tool_execution import ToolCall, ToolCallScheduler
+from tool_result_cache import ToolResultCache
+from tool_results import encode_tool_result
+from tool_schema_cache import ToolSchemaCache, get_tool_schema_cache
+
+logger = logging.getLogger(__name__)
 
 
 class OpenAIMCPChatBot:
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        parallel_tool_calls: bool = True,
+        max_tool_concurrency: int = Config.TOOL_CONCURRENCY,
+        stream: bool = Config.STREAM_RESPONSES,
+        connect_timeout: float = Config.SERVER_CONNECT_TIMEOUT,
+        schema_cache: Optional[ToolSchemaCache] = None,
+        completion_cache: Optional[CompletionCache] = None,
+        result_cache: Optional[ToolResultCache] = None,
+        history_budget: int = Config.HISTORY_TOKEN_BUDGET,
+    ):
         self.client = AsyncOpenAI(api_key=api_key)
+        # Print text deltas and start tools while the response is streaming
+        self.stream = stream
+        # Run the tool calls of one model turn concurrently (or one at a time)
+        self.max_tool_concurrency = max_tool_concurrency if parallel_tool_calls else 1
+        # Per-server limit for startup, initialize and list_tools
+        self.connect_timeout = connect_timeout
+        self.schema_cache = schema_cache or get_tool_schema_cache()
+        # Repeated requests (same messages, model and tools) skip the API call
+        self.completion_cache = (
+            completion_cache if completion_cache is not None else get_completion_cache()
+        )
+        # Results of tools the servers annotate as cacheable
+        self.result_cache = result_cache or ToolResultCache()
+        # Estimated tokens of history sent per request before old tool
+        # results are truncated
+        self.history_budget = history_budget
         self.sessions = []
         self.exit_stack = AsyncExitStack()
         self.available_tools = []
@@ -21,104 +63,265 @@ class OpenAIMCPChatBot:
 
     async def connect_to_server(self, server_name: str, server_config: dict) -> None:
         """Connect to a single MCP server."""
+        connection = MCPServerConnection(server_name, server_config)
         try:
-            server_params = StdioServerParameters(**server_config)
-            stdio_transport = await self.exit_stack.enter_async_context(
-                stdio_client(server_params)
+            await connection.connect(self.connect_timeout)
+        except Exception:
+            pass  # recorded on connection.error
+        self.add_connection(connection)
+
+    def add_connection(self, connection: MCPServerConnection) -> None:
+        """Register a connected server's session and tools."""
+        self.exit_stack.push_async_callback(connection.close)
+        if not connection.connected:
+            logger.warning(
+                "Failed to connect to %s: %r", connection.name, connection.error
             )
-            read, write = stdio_transport
-            session = await self.exit_stack.enter_async_context(
-                ClientSession(read, write)
+            return
+
+        self.sessions.append(connection.session)
+        print(
+            f"Connected to {connection.name} with tools:",
+            [t.name for t in connection.tools],
+        )
+
+        for tool in connection.tools:
+            self.tool_to_session[tool.name] = connection.session
+        self.result_cache.register(connection.tools)
+        # Converted schemas are reused while the server's tool list is unchanged
+        self.available_tools.extend(
+            self.schema_cache.provider_tools(
+                connection.server_id,
+                connection.tools,
+                "openai",
+                digest=connection.tools_digest,
             )
-            await session.initialize()
-            self.sessions.append(session)
-
-            # List available tools for this session
-            response = await session.list_tools()
-            tools = response.tools
-            print(f"Connected to {server_name} with tools:", [t.name for t in tools])
-
-            for tool in tools:
-                self.tool_to_session[tool.name] = session
-                # Convert MCP tool to OpenAI tool format
-                openai_tool = {
-                    "type": "function",
-                    "function": {
-                        "name": tool.name,
-                        "description": tool.description,
-                        "parameters": tool.inputSchema,
-                    },
-                }
-                self.available_tools.append(openai_tool)
-        except Exception as e:
-            print(f"Failed to connect to {server_name}: {e}")
+        )
 
     async def connect_to_servers(self):
-        """Connect to all configured MCP servers."""
+        """Connect to all configured MCP servers concurrently."""
         try:
             with open("server_config.json", "r") as file:
                 data = json.load(file)
 
             servers = data.get("mcpServers", {})
-            for server_name, server_config in servers.items():
-                await self.connect_to_server(server_name, server_config)
+            connections = await connect_servers(servers, self.connect_timeout)
+            # Register in configuration order so tool precedence is stable
+            for connection in connections:
+                self.add_connection(connection)
+            print(format_connect_report(connections))
         except Exception as e:
             print(f"Error loading server configuration: {e}")
             raise
 
-    async def process_query(self, query: str):
-        """Process a query using OpenAI with MCP tools."""
-        messages = [{"role": "user", "content": query}]
+    async def call_tool(self, call: ToolCall):
+        """Call a tool on the session that provides it, via the result cache."""
+        session = self.tool_to_session[call.name]
+        return await self.result_cache.call(
+            call.name,
+            call.arguments,
+            lambda: session.call_tool(call.name, arguments=call.arguments),
+        )
 
-        response = await self.client.chat.completions.create(
-            model=Config.OPENAI_MODEL,
-            messages=messages,
-            tools=self.available_tools if self.available_tools else None,
+    def _submit(
+        self, scheduler: ToolCallScheduler, call_id: str, name: str, arguments: str
+    ) -> None:
+        """Start a tool call, or record it as failed if its arguments are bad.
+
+        Models occasionally emit malformed JSON; only that call fails, and
+        the model sees the error in its tool message.
+        """
+        try:
+            parsed = json.loads(arguments or "{}")
+            if not isinstance(parsed, dict):
+                raise ValueError("arguments must be a JSON object")
+        except ValueError as e:  # includes json.JSONDecodeError
+            tool_log.warning("Invalid arguments for tool %s: %s", name, e)
+            error = ValueError(f"Invalid arguments for {name}: {e}")
+            scheduler.reject(ToolCall(id=call_id, name=name, arguments={}), error)
+            return
+        call = ToolCall(id=call_id, name=name, arguments=parsed)
+        tool_log.info("Calling tool %s with args %s", call.name, call.arguments)
+        scheduler.submit(call)
+
+    def _cache_key(self, messages: list) -> str:
+        return completion_key(
+            "openai", Config.OPENAI_MODEL, messages, self.available_tools
         )
 
-        process_query = True
-        while process_query:
-            message = response.choices[0].message
+    async def process_query(self, query: str, use_cache: bool = True):
+        """Process a query using OpenAI with MCP tools.
 
-            if message.content:
-                print(message.content)
+        With the completion cache enabled, each model turn is looked up in
+        it first unless ``use_cache`` is False. A cached turn is replayed
+        without a network call; its tool calls still run against the MCP
+        servers.
+        """
+        messages = [{"role": "user", "content": query}]
 
-            # Handle tool calls
-            if message.tool_calls:
+        while True:
+            compact_history(messages, self.history_budget)
+            key = None
+            if use_cache and self.completion_cache.enabled:
+                key = self._cache_key(messages)
+            cached = await self.completion_cache.get(key) if key else None
+            if self.stream and cached is None:
+                assistant_message, outcomes = await self._stream_turn(messages, key)
+            else:
+                assistant_message, outcomes = await self._complete_turn(
+                    messages, key, cached
+                )
+
+            if assistant_message is None:
+                break
+
+            messages.append(assistant_message)
+
+            # Outcomes keep the order of the assistant message's tool_calls
+            for outcome in outcomes:
+                content = (
+                    encode_tool_result(outcome.result)
+                    if outcome.ok
+                    else f"Error: {outcome.error}"
+                )
                 messages.append(
                     {
-                        "role": "assistant",
-                        "content": message.content,
-                        "tool_calls": message.tool_calls,
+                        "role": "tool",
+                        "tool_call_id": outcome.call.id,
+                        "content": content,
                     }
                 )
 
-                for tool_call in message.tool_calls:
-                    tool_name = tool_call.function.name
-                    tool_args = json.loads(tool_call.function.arguments)
-
-                    print(f"Calling tool {tool_name} with args {tool_args}")
-
-                    # Use the correct session for this tool
-                    session = self.tool_to_session[tool_name]
-                    result = await session.call_tool(tool_name, arguments=tool_args)
-
-                    messages.append(
-                        {
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": str(result.content),
-                        }
-                    )
-
-                # Get the next response
-                response = await self.client.chat.completions.create(
-                    model=Config.OPENAI_MODEL,
-                    messages=messages,
-                    tools=self.available_tools if self.available_tools else None,
+    async def _complete_turn(
+        self, messages: list, key: Optional[str] = None, cached: Optional[dict] = None
+    ):
+        """Request a full completion, then run any tool calls it contains.
+
+        A ``cached`` message is used instead of the API; otherwise, with a
+        cache ``key``, the fresh message is stored.
+        """
+        if cached is not None:
+            message = ChatCompletionMessage.model_validate(cached)
+        else:
+            response = await self.client.chat.completions.create(
+                model=Config.OPENAI_MODEL,
+                messages=messages,
+                tools=self.available_tools if self.available_tools else None,
+            )
+            message = response.choices[0].message
+            if key:
+                await self.completion_cache.put(
+                    key, message.model_dump(mode="json", exclude_none=True)
                 )
-            else:
-                process_query = False
+
+        if message.content:
+            print(message.content)
+
+        if not message.tool_calls:
+            return None, []
+
+        scheduler = ToolCallScheduler(self.call_tool, self.max_tool_concurrency)
+        for tool_call in message.tool_calls:
+            self._submit(
+                scheduler,
+                tool_call.id,
+                tool_call.function.name,
+                tool_call.function.arguments,
+            )
+        outcomes = await scheduler.outcomes()
+        assistant_message = {
+            "role": "assistant",
+            "content": message.content,
+            "tool_calls": message.tool_calls,
+        }
+        return assistant_message, outcomes
+
+    async def _stream_turn(self, messages: list, key: Optional[str] = None):
+        """Stream a completion, printing text and starting tools as they finish.
+
+        Tool call arguments arrive as fragments keyed by index. A tool call
+        is complete once the stream moves on to the next index (or ends), at
+        which point it starts running while the rest of the message streams.
+        The assembled message is stored under the cache ``key``, if given.
+        """
+        stream = await self.client.chat.completions.create(
+            model=Config.OPENAI_MODEL,
+            messages=messages,
+            tools=self.available_tools if self.available_tools else None,
+            stream=True,
+        )
+        scheduler = ToolCallScheduler(self.call_tool, self.max_tool_concurrency)
+        text_parts = []
+        pending = {}
+        tool_calls = []
+        mid_line = False
+
+        def start(index: int) -> None:
+            nonlocal mid_line
+            fragment = pending.pop(index)
+            tool_calls.append(
+                {
+                    "id": fragment["id"],
+                    "type": "function",
+                    "function": {
+                        "name": fragment["name"],
+                        "arguments": fragment["arguments"],
+                    },
+                }
+            )
+            if mid_line:
+                print()
+                mid_line = False
+            self._submit(
+                scheduler, fragment["id"], fragment["name"], fragment["arguments"]
+            )
+
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+
+                if delta.content:
+                    print(delta.content, end="", flush=True)
+                    text_parts.append(delta.content)
+                    mid_line = True
+
+                for tool_delta in delta.tool_calls or []:
+                    index = tool_delta.index
+                    if index not in pending:
+                        # A new index means earlier tool calls are complete
+                        for done in sorted(i for i in pending if i < index):
+                            start(done)
+                        pending[index] = {"id": "", "name": "", "arguments": ""}
+                    fragment = pending[index]
+                    if tool_delta.id:
+                        fragment["id"] = tool_delta.id
+                    if tool_delta.function:
+                        fragment["name"] += tool_delta.function.name or ""
+                        fragment["arguments"] += tool_delta.function.arguments or ""
+
+            for index in sorted(pending):
+                start(index)
+        except BaseException:
+            scheduler.cancel()
+            raise
+
+        if mid_line:
+            print()
+
+        assistant_message = {
+            "role": "assistant",
+            "content": "".join(text_parts) or None,
+        }
+        if tool_calls:
+            assistant_message["tool_calls"] = tool_calls
+        if key:
+            await self.completion_cache.put(key, assistant_message)
+
+        if not tool_calls:
+            return None, []
+        return assistant_message, await scheduler.outcomes()
 
     async def chat_loop(self):
         """Run an interactive chat loop"""
@@ -143,6 +346,9 @@ class OpenAIMCPChatBot:
 async def main():
     Config.LLM_PROVIDER = "openai"
     Config.validate()
+    configure_logging(
+        Config.LOG_LEVEL, Config.LOG_FORMAT, Config.LOG_TOOL_CALL_SAMPLE_RATE
+    )
     chatbot = OpenAIMCPChatBot(api_key=Config.OPENAI_API_KEY)
     try:
         await chatbot.connect_to_servers()
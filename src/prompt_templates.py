@@ -0,0 +1,183 @@
+"""Precompiled, memoized and hot-reloadable prompt templates."""
+
+import functools
+import hashlib
+import json
+import keyword
+import os
+import string
+import time
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from src.config import Config
+
+BUNDLED_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "prompt_templates")
+
+
+def _parse_fields(name: str, source: str) -> frozenset:
+    """Names of the plain ``{field}`` references in ``source``."""
+    fields = set()
+    for _, field, spec, conversion in string.Formatter().parse(source):
+        if field is None:
+            continue
+        if spec or conversion:
+            raise ValueError(
+                f"Template {name} uses a format spec or conversion in {{{field}}}"
+            )
+        if not field.isidentifier() or keyword.iskeyword(field):
+            raise ValueError(f"Template {name} has an invalid field {{{field}}}")
+        fields.add(field)
+    return frozenset(fields)
+
+
+def _compile(source: str, fields: frozenset) -> Callable[..., str]:
+    """Compile ``source`` into a keyword-only function returning an f-string.
+
+    Field names are checked to be plain identifiers and literal text is
+    embedded with ``repr``, so nothing from the template is executed.
+    """
+    pieces = []
+    for literal, field, _, _ in string.Formatter().parse(source):
+        if literal:
+            pieces.append("f" + repr(literal.replace("{", "{{").replace("}", "}}")))
+        if field is not None:
+            pieces.append(f"f'{{{field}}}'")
+    parameters = ", ".join(["*", *sorted(fields)]) if fields else ""
+    body = " ".join(pieces) or "''"
+    namespace: dict = {}
+    code = f"def render({parameters}):\n    return {body}\n"
+    exec(compile(code, "<prompt template>", "exec"), namespace)
+    return namespace["render"]
+
+
+class PromptTemplate:
+    """A template compiled once into a Python function, with memoized renders.
+
+    The source's literal text and ``{field}`` references become a single
+    f-string expression, so a render runs the same bytecode as a
+    hand-written f-string. Results are memoized per argument tuple in an
+    LRU cache of ``cache_size`` entries (0 disables it). ``version`` is a
+    hash of the source; a changed file gets a new version and a fresh cache.
+    """
+
+    def __init__(self, name: str, source: str, cache_size: int = 1024):
+        self.name = name
+        self.source = source
+        self.version = hashlib.sha256(source.encode()).hexdigest()[:12]
+        self.fields = _parse_fields(name, source)
+        compiled = _compile(source, self.fields)
+        # render(**fields) -> str; a missing or unknown field raises TypeError
+        self.render: Callable[..., str] = (
+            functools.lru_cache(maxsize=cache_size)(compiled)
+            if cache_size
+            else compiled
+        )
+
+    def cache_info(self):
+        """Hit and miss counts of the render cache, or None if it is disabled."""
+        cache_info = getattr(self.render, "cache_info", None)
+        return cache_info() if cache_info else None
+
+
+class PromptTemplateRegistry:
+    """Templates loaded from ``<directory>/<name>.txt``, reloaded on change.
+
+    The file's modification time is checked at most every
+    ``reload_interval`` seconds; when it changes the template is recompiled
+    under a new version, so edits take effect without a server restart.
+    """
+
+    def __init__(
+        self,
+        directory: str = BUNDLED_TEMPLATE_DIR,
+        reload_interval: float = 2.0,
+        cache_size: int = 1024,
+    ):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.cache_size = cache_size
+        # name -> (template, file mtime, monotonic time of the last check)
+        self._templates: Dict[str, Tuple[PromptTemplate, int, float]] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.txt")
+
+    def _load(self, name: str, now: float) -> PromptTemplate:
+        path = self._path(name)
+        mtime = os.stat(path).st_mtime_ns
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            template = PromptTemplate(name, file.read(), self.cache_size)
+        self._templates[name] = (template, mtime, now)
+        return template
+
+    def get(self, name: str) -> PromptTemplate:
+        """Return the current version of template ``name``."""
+        now = time.monotonic()
+        entry = self._templates.get(name)
+        if entry is None:
+            return self._load(name, now)
+
+        template, mtime, checked_at = entry
+        if now - checked_at < self.reload_interval:
+            return template
+        try:
+            changed = os.stat(self._path(name)).st_mtime_ns != mtime
+        except OSError:
+            changed = False  # keep serving the last good version
+        if changed:
+            return self._load(name, now)
+        self._templates[name] = (template, mtime, now)
+        return template
+
+    def render(self, name: str, /, **values: str) -> str:
+        """Render the current version of template ``name``."""
+        return self.get(name).render(**values)
+
+    def versions(self) -> Dict[str, dict]:
+        """Describe the loaded templates and their render caches."""
+        versions = {}
+        for name, (template, _, _) in self._templates.items():
+            info = template.cache_info()
+            versions[name] = {
+                "version": template.version,
+                "cached": info.currsize if info else 0,
+                "hits": info.hits if info else 0,
+                "misses": info.misses if info else 0,
+            }
+        return versions
+
+
+@functools.lru_cache(maxsize=Config.PROMPT_CACHE_SIZE or None)
+def format_steps(steps: Union[str, Tuple[str, ...]]) -> str:
+    """Number resolution steps one per line, memoized per argument.
+
+    MCP clients send prompt arguments as strings, so ``steps`` may be a
+    JSON list of strings or newline-separated steps as well as a tuple.
+    Any other string, including other JSON such as ``42`` or ``"Reset"``,
+    is taken as newline-separated steps.
+    """
+    if isinstance(steps, str):
+        try:
+            decoded = json.loads(steps)
+        except ValueError:
+            decoded = None
+        if isinstance(decoded, list) and all(isinstance(step, str) for step in decoded):
+            steps = decoded
+        else:
+            steps = steps.splitlines()
+    return "\n".join([f"{i+1}. {step}" for i, step in enumerate(steps)])
+
+
+_default_registry: Optional[PromptTemplateRegistry] = None
+
+
+def get_prompt_templates() -> PromptTemplateRegistry:
+    """Return the process-wide template registry."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = PromptTemplateRegistry(
+            Config.PROMPT_TEMPLATE_DIR or BUNDLED_TEMPLATE_DIR,
+            reload_interval=Config.PROMPT_RELOAD_INTERVAL,
+            cache_size=Config.PROMPT_CACHE_SIZE,
+        )
+    return _default_registry
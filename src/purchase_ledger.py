@@ -0,0 +1,431 @@
+"""Server-side purchase history keyed by customer ID."""
+
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.account_value import summarize_purchases
+
+# Sentinel bounds for open-ended date ranges, in epoch microseconds
+_MIN_TIME = np.iinfo(np.int64).min
+_MAX_TIME = np.iinfo(np.int64).max
+
+
+def _to_micros(when: datetime) -> int:
+    return round(when.timestamp() * 1_000_000)
+
+
+class _Account:
+    """One customer's purchases as growable float64/int64 arrays.
+
+    The running total is accumulated with the same compensated (Neumaier)
+    steps as Python's ``sum()`` over floats, so it equals ``sum()`` of the
+    amounts in recording order bit for bit.
+    """
+
+    __slots__ = ("amounts", "timestamps", "count", "_high", "_compensation")
+
+    def __init__(self, capacity: int = 8):
+        self.amounts = np.empty(capacity, dtype=np.float64)
+        self.timestamps = np.empty(capacity, dtype=np.int64)
+        self.count = 0
+        self._high = 0.0
+        self._compensation = 0.0
+
+    def _accumulate(self, amount: float) -> None:
+        high = self._high
+        total = high + amount
+        if abs(high) >= abs(amount):
+            self._compensation += (high - total) + amount
+        else:
+            self._compensation += (amount - total) + high
+        self._high = total
+
+    @property
+    def total(self) -> float:
+        compensation = self._compensation
+        if compensation and math.isfinite(compensation):
+            return self._high + compensation
+        return self._high
+
+    def append(self, amount: float, timestamp: int) -> None:
+        if self.count == len(self.amounts):
+            # Double the capacity so appends stay amortized O(1)
+            capacity = max(8, 2 * self.count)
+            self.amounts = np.resize(self.amounts, capacity)
+            self.timestamps = np.resize(self.timestamps, capacity)
+        self.amounts[self.count] = amount
+        self.timestamps[self.count] = timestamp
+        self.count += 1
+        self._accumulate(amount)
+
+    def extend(self, amounts: np.ndarray, timestamps: np.ndarray) -> None:
+        for amount, timestamp in zip(amounts.tolist(), timestamps.tolist()):
+            self.append(amount, timestamp)
+
+    def select(self, start: Optional[int], end: Optional[int]) -> np.ndarray:
+        """Amounts recorded in ``[start, end)``, in recording order."""
+        amounts = self.amounts[: self.count]
+        if start is None and end is None:
+            return amounts
+        timestamps = self.timestamps[: self.count]
+        low = _MIN_TIME if start is None else start
+        high = _MAX_TIME if end is None else end
+        return amounts[(timestamps >= low) & (timestamps < high)]
+
+
+class PurchaseLedger:
+    """Purchases per customer, aggregated without shipping histories around.
+
+    Each customer's amounts and purchase times live in compact NumPy arrays
+    with an incrementally maintained total, so an all-time account value is
+    O(1) and a date-range value is one vectorized pass over that customer's
+    purchases. The ledger persists to a columnar ``.npz`` file.
+    """
+
+    # Calls are fast in-memory operations, safe to make on the event loop
+    blocking = False
+
+    def __init__(self) -> None:
+        self._accounts: Dict[str, _Account] = {}
+        self.dirty = False
+        self.saved_at = time.monotonic()
+
+    def __contains__(self, customer_id: str) -> bool:
+        return customer_id in self._accounts
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def record(
+        self, customer_id: str, amount: float, when: Optional[datetime] = None
+    ) -> None:
+        """Append a purchase of ``amount`` made at ``when`` (default now)."""
+        amount = float(amount)
+        if not math.isfinite(amount):
+            raise ValueError("Purchase amount must be a finite number")
+        account = self._accounts.get(customer_id)
+        if account is None:
+            account = self._accounts[customer_id] = _Account()
+        account.append(amount, _to_micros(when or datetime.now()))
+        self.dirty = True
+
+    def history(self, customer_id: str) -> List[float]:
+        """Return a customer's purchase amounts in recording order."""
+        account = self._accounts.get(customer_id)
+        return [] if account is None else account.amounts[: account.count].tolist()
+
+    def summary(
+        self,
+        customer_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> dict:
+        """Total, average and count of purchases in ``[start, end)``.
+
+        Results match ``calculate_account_value`` given the same purchases
+        as a list: the all-time total is the running total, and date-range
+        totals go through the same rounding-stable NumPy path.
+        """
+        account = self._accounts.get(customer_id)
+        if account is None:
+            return summarize_purchases(customer_id, [])
+        if start is None and end is None:
+            total, count = account.total, account.count
+            return {
+                "customer_id": customer_id,
+                "total_value": round(total, 2),
+                "average_purchase": round(total / count, 2) if count else 0.0,
+                "purchase_count": count,
+            }
+        selected = account.select(
+            None if start is None else _to_micros(start),
+            None if end is None else _to_micros(end),
+        )
+        return summarize_purchases(customer_id, selected)
+
+    def cohort_purchases(
+        self,
+        customer_ids: Sequence[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[List[int], np.ndarray]:
+        """Concatenated purchases and per-customer counts for a cohort."""
+        low = None if start is None else _to_micros(start)
+        high = None if end is None else _to_micros(end)
+        chunks = []
+        for customer_id in customer_ids:
+            account = self._accounts.get(customer_id)
+            if account is not None:
+                chunks.append(account.select(low, high))
+            else:
+                chunks.append(np.empty(0))
+        counts = [len(chunk) for chunk in chunks]
+        purchases = np.concatenate(chunks) if chunks else np.empty(0)
+        return counts, purchases
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """Copy the ledger into flat columnar arrays."""
+        ids = list(self._accounts)
+        accounts = [self._accounts[customer_id] for customer_id in ids]
+        counts = np.array([a.count for a in accounts], dtype=np.int64)
+        amounts = [a.amounts[: a.count] for a in accounts]
+        timestamps = [a.timestamps[: a.count] for a in accounts]
+        return {
+            "customer_ids": np.array(ids, dtype=str),
+            "counts": counts,
+            "amounts": np.concatenate(amounts) if amounts else np.empty(0),
+            "timestamps": (
+                np.concatenate(timestamps)
+                if timestamps
+                else np.empty(0, dtype=np.int64)
+            ),
+        }
+
+    def save_due(self, interval: float) -> bool:
+        """Whether unsaved purchases are older than ``interval`` seconds."""
+        return self.dirty and time.monotonic() - self.saved_at >= interval
+
+    def checkpoint(self) -> Dict[str, np.ndarray]:
+        """Snapshot the ledger for saving and mark it clean."""
+        arrays = self.snapshot()
+        self.dirty = False
+        self.saved_at = time.monotonic()
+        return arrays
+
+    def save(self, path: str) -> None:
+        """Write the ledger to ``path`` atomically."""
+        write_snapshot(path, self.checkpoint())
+
+    @classmethod
+    def load(cls, path: str) -> "PurchaseLedger":
+        """Read a ledger written by ``save``."""
+        ledger = cls()
+        with np.load(path) as data:
+            offsets = np.cumsum(data["counts"]) - data["counts"]
+            amounts, timestamps = data["amounts"], data["timestamps"]
+            for customer_id, offset, count in zip(
+                data["customer_ids"].tolist(),
+                offsets.tolist(),
+                data["counts"].tolist(),
+            ):
+                account = ledger._accounts[customer_id] = _Account(max(8, count))
+                account.extend(
+                    amounts[offset : offset + count],
+                    timestamps[offset : offset + count],
+                )
+        return ledger
+
+
+def write_snapshot(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """Atomically write ``PurchaseLedger.snapshot`` arrays to ``path``.
+
+    Split from ``save`` so the snapshot can be taken on the event loop and
+    the file written on a worker thread.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # A unique temporary file, so concurrent writers never share one
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory or ".", prefix=f".{os.path.basename(path)}.", suffix=".npz"
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS purchases (
+    id INTEGER PRIMARY KEY,
+    customer_id TEXT NOT NULL,
+    amount REAL NOT NULL,
+    purchased_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_purchases_customer ON purchases (customer_id);
+"""
+
+_INSERT = "INSERT INTO purchases (customer_id, amount, purchased_at) VALUES (?, ?, ?)"
+_SELECT_AMOUNTS = (
+    "SELECT amount FROM purchases WHERE customer_id = ? "
+    "AND purchased_at >= ? AND purchased_at < ? ORDER BY id"
+)
+
+
+class SQLitePurchaseLedger:
+    """Purchases in a SQLite table, shared by every process that opens it.
+
+    Offers the ``PurchaseLedger`` interface, but each purchase is committed
+    as it is recorded, so nothing needs saving and HTTP workers see each
+    other's purchases. Totals are summed in recording order as by the
+    in-memory ledger. Calls block; callers on an event loop should run them
+    on a thread (``blocking`` is True).
+    """
+
+    blocking = True
+    # Always saved, so there is never anything for save() to write
+    dirty = False
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA busy_timeout=5000")
+        self._connection.executescript(_SCHEMA)
+
+    def seed(self, purchases: Iterable[Tuple[str, float, datetime]]) -> None:
+        """Record ``purchases`` if the table is empty, once across processes."""
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                if (
+                    self._connection.execute(
+                        "SELECT 1 FROM purchases LIMIT 1"
+                    ).fetchone()
+                    is None
+                ):
+                    self._connection.executemany(
+                        _INSERT,
+                        [
+                            (customer_id, float(amount), _to_micros(when))
+                            for customer_id, amount, when in purchases
+                        ],
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def __contains__(self, customer_id: str) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM purchases WHERE customer_id = ? LIMIT 1",
+                (customer_id,),
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(DISTINCT customer_id) FROM purchases"
+            ).fetchone()[0]
+
+    def record(
+        self, customer_id: str, amount: float, when: Optional[datetime] = None
+    ) -> None:
+        """Append a purchase of ``amount`` made at ``when`` (default now)."""
+        amount = float(amount)
+        if not math.isfinite(amount):
+            raise ValueError("Purchase amount must be a finite number")
+        with self._lock:
+            self._connection.execute(
+                _INSERT, (customer_id, amount, _to_micros(when or datetime.now()))
+            )
+
+    def _amounts(
+        self, customer_id: str, start: Optional[int], end: Optional[int]
+    ) -> List[float]:
+        low = int(_MIN_TIME) if start is None else start
+        high = int(_MAX_TIME) if end is None else end
+        with self._lock:
+            rows = self._connection.execute(
+                _SELECT_AMOUNTS, (customer_id, low, high)
+            ).fetchall()
+        return [amount for (amount,) in rows]
+
+    def history(self, customer_id: str) -> List[float]:
+        """Return a customer's purchase amounts in recording order."""
+        return self._amounts(customer_id, None, None)
+
+    def summary(
+        self,
+        customer_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> dict:
+        """Total, average and count of purchases in ``[start, end)``."""
+        return summarize_purchases(
+            customer_id,
+            self._amounts(
+                customer_id,
+                None if start is None else _to_micros(start),
+                None if end is None else _to_micros(end),
+            ),
+        )
+
+    def cohort_purchases(
+        self,
+        customer_ids: Sequence[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[List[int], np.ndarray]:
+        """Concatenated purchases and per-customer counts for a cohort."""
+        low = None if start is None else _to_micros(start)
+        high = None if end is None else _to_micros(end)
+        chunks = [self._amounts(customer_id, low, high) for customer_id in customer_ids]
+        counts = [len(chunk) for chunk in chunks]
+        purchases = np.fromiter(
+            (amount for chunk in chunks for amount in chunk),
+            dtype=np.float64,
+            count=sum(counts),
+        )
+        return counts, purchases
+
+    def save_due(self, interval: float) -> bool:
+        return False
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def open_purchase_ledger(
+    path: str, seed: Iterable[Tuple[str, float, datetime]] = ()
+) -> PurchaseLedger:
+    """Load the ledger at ``path``, or start one from ``seed`` purchases."""
+    if path and os.path.exists(path):
+        return PurchaseLedger.load(path)
+    ledger = PurchaseLedger()
+    for customer_id, amount, when in seed:
+        ledger.record(customer_id, amount, when)
+    ledger.dirty = False
+    return ledger
+
+
+def create_purchase_ledger(
+    backend: str,
+    path: str = "",
+    db_path: str = "purchases.db",
+    seed: Iterable[Tuple[str, float, datetime]] = (),
+) -> Union[PurchaseLedger, SQLitePurchaseLedger]:
+    """Open the ledger selected by ``backend`` ("memory" or "sqlite").
+
+    The memory ledger is loaded from and saved to the ``.npz`` file at
+    ``path``; the SQLite ledger lives in ``db_path``. ``seed`` purchases
+    are recorded when the ledger starts out empty.
+    """
+    if backend == "memory":
+        return open_purchase_ledger(path, seed)
+    if backend == "sqlite":
+        ledger = SQLitePurchaseLedger(db_path)
+        ledger.seed(seed)
+        return ledger
+    raise ValueError(f"Unknown purchase ledger backend: {backend}")
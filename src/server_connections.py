@@ -0,0 +1,164 @@
+"""Concurrent connections to the MCP servers listed in server_config.json."""
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Dict, List, Optional
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+
+def server_key(config: dict) -> str:
+    """Identify a server by a stable hash of its launch configuration."""
+    encoded = json.dumps(config, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def tools_hash(tools: list) -> str:
+    """Return a content hash of a server's tool list.
+
+    Each tool is serialized by pydantic's JSON encoder, without building
+    an intermediate dict. Connections compute it once, as ``tools_digest``.
+    """
+    digest = hashlib.sha256()
+    for tool in tools:
+        digest.update(tool.model_dump_json(exclude_none=True).encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class MCPServerConnection:
+    """An MCP server and its initialized client session.
+
+    Servers configured with a ``url`` are reached over streamable HTTP;
+    otherwise the configuration launches a stdio server process.
+
+    The transport and session are entered and exited inside one background
+    task, as the MCP client requires, which lets many servers start in
+    parallel and each be closed (or abandoned on timeout) independently.
+    """
+
+    def __init__(self, name: str, config: dict):
+        self.name = name
+        self.config = config
+        self.session: Optional[ClientSession] = None
+        self.tools: list = []
+        self._tools_digest: Optional[str] = None
+        self.connect_seconds: float = 0.0
+        self.error: Optional[BaseException] = None
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Future] = None
+        self._closing = asyncio.Event()
+
+    @property
+    def server_id(self) -> str:
+        """Name plus launch-config hash, stable across reconnects."""
+        return f"{self.name}:{server_key(self.config)}"
+
+    @property
+    def tools_digest(self) -> str:
+        """``tools_hash`` of the tool list, computed once per connection."""
+        if self._tools_digest is None:
+            self._tools_digest = tools_hash(self.tools)
+        return self._tools_digest
+
+    @property
+    def connected(self) -> bool:
+        return self.session is not None and self.error is None
+
+    async def connect(self, timeout: Optional[float] = None) -> None:
+        """Start the server, initialize the session and list its tools.
+
+        Raises ``asyncio.TimeoutError`` if this takes longer than
+        ``timeout`` seconds; the half-started server is shut down.
+        """
+        start = time.perf_counter()
+        self._ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(), name=f"mcp-server:{self.name}")
+        try:
+            await asyncio.wait_for(asyncio.shield(self._ready), timeout)
+        except BaseException as e:
+            self.connect_seconds = time.perf_counter() - start
+            self.error = e
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            raise
+        self.connect_seconds = time.perf_counter() - start
+
+    async def _run(self) -> None:
+        try:
+            async with self._transport() as streams:
+                read, write = streams[0], streams[1]
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    response = await session.list_tools()
+                    self.session = session
+                    self.tools = response.tools
+                    self._ready.set_result(None)
+                    await self._closing.wait()
+        except asyncio.CancelledError:
+            if not self._ready.done():
+                self._ready.cancel()
+            raise
+        except Exception as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                self.error = e
+        finally:
+            self.session = None
+
+    def _transport(self):
+        if "url" in self.config:
+            return streamablehttp_client(
+                self.config["url"], headers=self.config.get("headers")
+            )
+        return stdio_client(StdioServerParameters(**self.config))
+
+    async def close(self) -> None:
+        """Shut down the session and the server process."""
+        if self._task is None:
+            return
+        self._closing.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+async def connect_servers(
+    servers: Dict[str, dict], timeout: Optional[float] = None
+) -> List[MCPServerConnection]:
+    """Connect to every server concurrently, each under its own timeout.
+
+    Returns one connection per server in configuration order. A server
+    that fails or times out has ``error`` set and does not delay the rest.
+    """
+    connections = [
+        MCPServerConnection(name, config) for name, config in servers.items()
+    ]
+
+    async def connect(connection: MCPServerConnection) -> None:
+        try:
+            await connection.connect(timeout)
+        except Exception:
+            pass  # recorded on connection.error
+
+    await asyncio.gather(*(connect(connection) for connection in connections))
+    return connections
+
+
+def format_connect_report(connections: List[MCPServerConnection]) -> str:
+    """Summarize per-server connect timings for display."""
+    lines = ["Server connect timings:"]
+    for connection in connections:
+        if connection.connected:
+            status = f"{len(connection.tools)} tools"
+        elif isinstance(connection.error, asyncio.TimeoutError):
+            status = "timed out"
+        else:
+            status = f"failed: {connection.error}"
+        lines.append(
+            f"   - {connection.name}: {connection.connect_seconds:.2f}s ({status})"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,213 @@
+"""Shared pool of warm MCP client sessions keyed by server configuration."""
+
+import asyncio
+import json
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, FrozenSet, Optional
+
+from mcp import ClientSession
+
+from config import Config
+from server_connections import MCPServerConnection, server_key
+
+
+def load_server_config(name: str, path: str = "server_config.json") -> dict:
+    """Return the configuration of server ``name`` from ``server_config.json``."""
+    with open(path, "r") as file:
+        data = json.load(file)
+    return data["mcpServers"][name]
+
+
+class _ServerSessions:
+    """Idle connections and bookkeeping for one server configuration."""
+
+    def __init__(self) -> None:
+        self.idle: Deque[MCPServerConnection] = deque()
+        self.open = 0
+        self.available = asyncio.Condition()
+
+
+class MCPSessionPool:
+    """Pool of initialized ``ClientSession``s shared by every integration.
+
+    Up to ``size`` connections are kept per server configuration. Idle
+    sessions are pinged before reuse once ``health_check_interval`` seconds
+    have passed since they were last checked; dead ones are replaced by a
+    fresh connection, so callers pay the subprocess and initialize cost
+    only when the pool is cold or a server has died.
+    """
+
+    def __init__(
+        self,
+        size: int = Config.SESSION_POOL_SIZE,
+        connect_timeout: float = Config.SERVER_CONNECT_TIMEOUT,
+        health_check_interval: float = Config.SESSION_HEALTH_CHECK_INTERVAL,
+        health_check_timeout: float = 5.0,
+    ):
+        self.size = size
+        self.connect_timeout = connect_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self._servers: Dict[str, _ServerSessions] = {}
+        self._last_checked: Dict[int, float] = {}
+        # Server key -> tools whose annotations make a repeated call safe
+        self._retry_safe: Dict[str, FrozenSet[str]] = {}
+        self._closed = False
+
+    def _sessions_for(self, config: dict) -> _ServerSessions:
+        key = server_key(config)
+        if key not in self._servers:
+            self._servers[key] = _ServerSessions()
+        return self._servers[key]
+
+    async def _is_healthy(self, connection: MCPServerConnection) -> bool:
+        if not connection.connected:
+            return False
+        last_checked = self._last_checked.get(id(connection), 0.0)
+        if time.monotonic() - last_checked < self.health_check_interval:
+            return True
+        try:
+            await asyncio.wait_for(
+                connection.session.send_ping(), self.health_check_timeout
+            )
+        except Exception:
+            return False
+        self._last_checked[id(connection)] = time.monotonic()
+        return True
+
+    async def _discard(self, sessions: _ServerSessions, connection) -> None:
+        self._last_checked.pop(id(connection), None)
+        await connection.close()
+        async with sessions.available:
+            sessions.open -= 1
+            sessions.available.notify()
+
+    async def acquire(self, config: dict, name: str = "mcp") -> MCPServerConnection:
+        """Borrow a healthy connection, starting a server if none is idle."""
+        if self._closed:
+            raise RuntimeError("Session pool is closed")
+        sessions = self._sessions_for(config)
+
+        while True:
+            async with sessions.available:
+                while not sessions.idle and sessions.open >= self.size:
+                    await sessions.available.wait()
+                if sessions.idle:
+                    connection = sessions.idle.popleft()
+                else:
+                    sessions.open += 1
+                    connection = None
+
+            if connection is None:
+                connection = MCPServerConnection(name, config)
+                try:
+                    await connection.connect(self.connect_timeout)
+                except BaseException:
+                    async with sessions.available:
+                        sessions.open -= 1
+                        sessions.available.notify()
+                    raise
+                self._last_checked[id(connection)] = time.monotonic()
+                return connection
+
+            if await self._is_healthy(connection):
+                return connection
+            # Dead session: drop it and loop round to reconnect
+            await self._discard(sessions, connection)
+
+    async def release(
+        self, connection: MCPServerConnection, healthy: bool = True
+    ) -> None:
+        """Return a borrowed connection; unhealthy ones are shut down."""
+        sessions = self._sessions_for(connection.config)
+        if not healthy or not connection.connected or self._closed:
+            await self._discard(sessions, connection)
+            return
+        async with sessions.available:
+            sessions.idle.append(connection)
+            sessions.available.notify()
+
+    @asynccontextmanager
+    async def session(
+        self, config: dict, name: str = "mcp"
+    ) -> AsyncIterator[ClientSession]:
+        """Borrow a session for the duration of a ``async with`` block.
+
+        If the block fails because the connection broke, the connection is
+        discarded so the next borrower gets a fresh one.
+        """
+        connection = await self.acquire(config, name)
+        try:
+            yield connection.session
+        except BaseException:
+            await self.release(connection, healthy=connection.connected)
+            raise
+        await self.release(connection)
+
+    async def _is_retry_safe(self, config: dict, tool_name: str) -> bool:
+        """Whether the server annotates ``tool_name`` read-only or idempotent."""
+        key = server_key(config)
+        if key not in self._retry_safe:
+            async with self.session(config) as session:
+                tools = (await session.list_tools()).tools
+            self._retry_safe[key] = frozenset(
+                tool.name
+                for tool in tools
+                if tool.annotations is not None
+                and (tool.annotations.readOnlyHint or tool.annotations.idempotentHint)
+            )
+        return tool_name in self._retry_safe[key]
+
+    async def call_tool(
+        self,
+        config: dict,
+        tool_name: str,
+        arguments: Optional[dict] = None,
+        retry_safe: Optional[bool] = None,
+    ):
+        """Call a tool on a pooled session.
+
+        If the connection dies during the call, the server may already have
+        run the tool, so the call is repeated on a fresh connection only if
+        that is safe: when ``retry_safe`` is True or, by default, when the
+        server's tool annotations mark it read-only or idempotent. Otherwise
+        the error is raised.
+        """
+        connection = await self.acquire(config)
+        try:
+            result = await connection.session.call_tool(tool_name, arguments)
+        except Exception:
+            alive = connection.connected
+            await self.release(connection, healthy=alive)
+            if alive:
+                raise
+            if retry_safe is None:
+                retry_safe = await self._is_retry_safe(config, tool_name)
+            if not retry_safe:
+                raise
+        else:
+            await self.release(connection)
+            return result
+
+        async with self.session(config) as session:
+            return await session.call_tool(tool_name, arguments)
+
+    async def close(self) -> None:
+        """Shut down every idle connection and refuse new borrowers."""
+        self._closed = True
+        for sessions in self._servers.values():
+            while sessions.idle:
+                await self._discard(sessions, sessions.idle.popleft())
+
+
+_default_pool: Optional[MCPSessionPool] = None
+
+
+def get_session_pool() -> MCPSessionPool:
+    """Return the process-wide session pool shared by all integrations."""
+    global _default_pool
+    if _default_pool is None or _default_pool._closed:
+        _default_pool = MCPSessionPool()
+    return _default_pool
@@ -0,0 +1,235 @@
+"""Time-ordered, collision-free support ticket IDs."""
+
+import atexit
+import itertools
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+
+from src.config import Config
+
+PREFIX = "TICKET-"
+
+WORKER_BITS = 16
+SEQUENCE_BITS = 32
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+_SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+
+
+class TicketIdParts(NamedTuple):
+    """The fields encoded in a ticket ID."""
+
+    created_at: datetime
+    worker_id: int
+    sequence: int
+
+
+_LEASE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS worker_leases (
+    worker_id INTEGER PRIMARY KEY,
+    holder TEXT NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+class WorkerIdLease:
+    """A worker ID leased from a SQLite table shared by every process.
+
+    ``acquire`` takes the lowest ID no live lease holds, in one ``BEGIN
+    IMMEDIATE`` transaction, so two processes never get the same ID. A
+    lease lasts ``ttl`` seconds and must be renewed before then; the ID of
+    a process that died is free again once its lease expires. ``renew``
+    returns the ID to use, which is a newly acquired one if the lease was
+    lost while the process was not renewing it.
+    """
+
+    def __init__(self, path: str, ttl: float = Config.TICKET_WORKER_LEASE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self.worker_id: Optional[int] = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call, so a forked child never shares one
+        connection = sqlite3.connect(self.path, isolation_level=None, timeout=5.0)
+        connection.execute(_LEASE_SCHEMA)
+        return connection
+
+    def acquire(self) -> int:
+        """Lease the lowest free worker ID and return it."""
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            connection.execute(
+                "DELETE FROM worker_leases WHERE expires_at <= ?", (now,)
+            )
+            held = {
+                worker_id
+                for (worker_id,) in connection.execute(
+                    "SELECT worker_id FROM worker_leases"
+                )
+            }
+            worker_id = next(
+                (i for i in range(MAX_WORKER_ID + 1) if i not in held), None
+            )
+            if worker_id is None:
+                connection.execute("ROLLBACK")
+                raise RuntimeError("Every ticket worker ID is leased")
+            connection.execute(
+                "INSERT INTO worker_leases VALUES (?, ?, ?)",
+                (worker_id, self.holder, now + self.ttl),
+            )
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+        self.worker_id = worker_id
+        return worker_id
+
+    def renew(self) -> int:
+        """Extend the lease, re-acquiring an ID if it was lost."""
+        if self.worker_id is None:
+            return self.acquire()
+        connection = self._connect()
+        try:
+            renewed = connection.execute(
+                "UPDATE worker_leases SET expires_at = ? "
+                "WHERE worker_id = ? AND holder = ?",
+                (time.time() + self.ttl, self.worker_id, self.holder),
+            ).rowcount
+        finally:
+            connection.close()
+        return self.worker_id if renewed else self.acquire()
+
+    def release(self) -> None:
+        """Give the worker ID back."""
+        if self.worker_id is None:
+            return
+        connection = self._connect()
+        try:
+            connection.execute(
+                "DELETE FROM worker_leases WHERE worker_id = ? AND holder = ?",
+                (self.worker_id, self.holder),
+            )
+        finally:
+            connection.close()
+        self.worker_id = None
+
+
+class TicketIdGenerator:
+    """Snowflake-style IDs: milliseconds, worker ID and a sequence number.
+
+    IDs are ``TICKET-`` followed by fixed-width hex (12 digits of Unix
+    milliseconds, 4 of worker ID, 8 of sequence), so they sort by creation
+    time as plain strings. The timestamp comes from a monotonic clock
+    anchored to wall-clock time, so IDs from one generator never go
+    backwards when the system clock is adjusted. The sequence is an
+    ``itertools.count``, whose ``next`` is atomic, so threads can share a
+    generator without a lock; it never resets, so IDs within a process are
+    unique even when many are issued in the same millisecond.
+
+    The worker ID is either given or taken from a ``WorkerIdLease``, which
+    is renewed (under a lock, with one SQLite write) once half its TTL has
+    passed, before the next ID is issued.
+    """
+
+    def __init__(
+        self, worker_id: Optional[int] = None, lease: Optional[WorkerIdLease] = None
+    ):
+        if (worker_id is None) == (lease is None):
+            raise ValueError("Give exactly one of worker_id and lease")
+        self._lease = lease
+        self._lock = threading.Lock()
+        if lease is not None:
+            worker_id = lease.acquire()
+            self._renew_at = time.monotonic() + lease.ttl / 2
+        self._set_worker_id(worker_id)
+        self._epoch_ns = time.time_ns() - time.monotonic_ns()
+        # A random start keeps a restarted worker from replaying sequences
+        self._sequence = itertools.count(random.getrandbits(SEQUENCE_BITS))
+
+    def _set_worker_id(self, worker_id: int) -> None:
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+        self.worker_id = worker_id
+        self._worker_hex = f"{worker_id:04X}"
+
+    def _renew(self) -> None:
+        with self._lock:
+            if time.monotonic() < self._renew_at:
+                return
+            self._set_worker_id(self._lease.renew())
+            self._renew_at = time.monotonic() + self._lease.ttl / 2
+
+    def __call__(self) -> str:
+        """Return a new ticket ID."""
+        if self._lease is not None and time.monotonic() >= self._renew_at:
+            self._renew()
+        millis = (self._epoch_ns + time.monotonic_ns()) // 1_000_000
+        sequence = next(self._sequence) & _SEQUENCE_MASK
+        return f"{PREFIX}{millis:012X}{self._worker_hex}{sequence:08X}"
+
+
+def parse_ticket_id(ticket_id: str) -> TicketIdParts:
+    """Decode the creation time, worker ID and sequence of a ticket ID."""
+    if not ticket_id.startswith(PREFIX) or len(ticket_id) != len(PREFIX) + 24:
+        raise ValueError(f"Not a ticket ID: {ticket_id!r}")
+    digits = ticket_id[len(PREFIX) :]
+    millis = int(digits[:12], 16)
+    return TicketIdParts(
+        created_at=datetime.fromtimestamp(millis / 1000, tz=timezone.utc),
+        worker_id=int(digits[12:16], 16),
+        sequence=int(digits[16:], 16),
+    )
+
+
+def worker_lease_path() -> str:
+    """Database of the worker ID leases.
+
+    The SQLite ticket store's own database, or one beside the JSONL file.
+    """
+    if Config.TICKET_BACKEND == "sqlite":
+        return Config.TICKET_STORE_PATH or "tickets.db"
+    return f"{Config.TICKET_STORE_PATH or 'tickets.jsonl'}.workers.db"
+
+
+def default_generator() -> TicketIdGenerator:
+    """Generator for ``TICKET_WORKER_ID``, else for a leased worker ID."""
+    if Config.TICKET_WORKER_ID is not None:
+        return TicketIdGenerator(Config.TICKET_WORKER_ID)
+    lease = WorkerIdLease(worker_lease_path())
+    generator = TicketIdGenerator(lease=lease)
+    atexit.register(lease.release)
+    return generator
+
+
+# Created on first use, so importing the module opens no database
+_generator: Optional[TicketIdGenerator] = None
+
+
+def _reset_after_fork() -> None:
+    # A forked worker must not share its parent's worker ID and sequence
+    global _generator
+    _generator = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def new_ticket_id() -> str:
+    """Return a new ticket ID from the process-wide generator."""
+    global _generator
+    if _generator is None:
+        _generator = default_generator()
+    return _generator()
@@ -0,0 +1,456 @@
+"""Persistent support tickets with write-behind batching."""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# always:   a call returns once its ticket is on disk (concurrent calls share
+#           one write and fsync)
+# batch:    calls return once queued; each batch is written and fsynced
+# interval: calls return once queued; batches are written as they flush and
+#           fsynced at most every ``fsync_interval`` seconds
+FSYNC_POLICIES = ("always", "batch", "interval")
+
+# A ticket dict and the idempotency key it was created with
+TicketRecord = Tuple[dict, Optional[str]]
+# The stored ticket for a record, or the error that kept it from being stored
+WriteResult = Union[dict, Exception]
+
+
+class TicketSink(ABC):
+    """Durable storage written by ``TicketStore``'s single writer thread."""
+
+    @abstractmethod
+    def write_batch(self, records: List[TicketRecord]) -> List[WriteResult]:
+        """Write ``records`` and return the stored ticket for each.
+
+        A record whose idempotency key is already stored is not written
+        again; the ticket stored under that key is returned instead. A
+        record that cannot be stored (its ``ticket_id`` is taken) gets the
+        error in its place and does not stop the rest of the batch.
+        """
+
+    @abstractmethod
+    def find_by_key(self, idempotency_key: str) -> Optional[dict]:
+        """Return the ticket stored under ``idempotency_key``, or ``None``."""
+
+    @abstractmethod
+    def get(self, ticket_id: str) -> Optional[dict]:
+        """Return the stored ticket with ``ticket_id``, or ``None``."""
+
+    @abstractmethod
+    def sync(self) -> None:
+        """Flush written tickets to stable storage."""
+
+    def close(self) -> None:
+        """Release the underlying file or connection."""
+
+
+_TICKET_FIELDS = (
+    "ticket_id",
+    "customer_id",
+    "subject",
+    "description",
+    "priority",
+    "status",
+    "created_at",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    ticket_id TEXT PRIMARY KEY,
+    customer_id TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    description TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    idempotency_key TEXT UNIQUE
+);
+"""
+
+_TICKET_COLUMNS = ", ".join(_TICKET_FIELDS)
+_INSERT = (
+    f"INSERT INTO tickets ({_TICKET_COLUMNS}, idempotency_key) "
+    f"VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_SELECT_BY_KEY = f"SELECT {_TICKET_COLUMNS} FROM tickets WHERE idempotency_key = ?"
+_SELECT_BY_ID = f"SELECT {_TICKET_COLUMNS} FROM tickets WHERE ticket_id = ?"
+
+
+class SQLiteTicketSink(TicketSink):
+    """Tickets in an SQLite table, one transaction per batch.
+
+    With ``sync_each_write`` every commit is fsynced (``synchronous=FULL``);
+    otherwise commits only reach the WAL and ``sync`` checkpoints it.
+    """
+
+    def __init__(self, path: str, sync_each_write: bool = True):
+        self.path = path
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            f"PRAGMA synchronous={'FULL' if sync_each_write else 'NORMAL'}"
+        )
+        self._connection.execute("PRAGMA busy_timeout=5000")
+        self._connection.executescript(_SCHEMA)
+
+    def write_batch(self, records: List[TicketRecord]) -> List[WriteResult]:
+        stored: List[WriteResult] = []
+        with self._connection as connection:
+            # The write lock is held from here, so no other worker can store
+            # a key between the lookup and the insert below
+            connection.execute("BEGIN IMMEDIATE")
+            for ticket, key in records:
+                if key is not None:
+                    existing = connection.execute(_SELECT_BY_KEY, (key,)).fetchone()
+                    if existing is not None:
+                        # Another worker stored this key first; keep its ticket
+                        stored.append(dict(zip(_TICKET_FIELDS, existing)))
+                        continue
+                row = tuple(ticket[field] for field in _TICKET_FIELDS) + (key,)
+                try:
+                    connection.execute(_INSERT, row)
+                except sqlite3.IntegrityError as e:
+                    # Only this statement is rolled back; the batch goes on
+                    stored.append(e)
+                else:
+                    stored.append(ticket)
+        return stored
+
+    def find_by_key(self, idempotency_key: str) -> Optional[dict]:
+        row = self._connection.execute(_SELECT_BY_KEY, (idempotency_key,)).fetchone()
+        return dict(zip(_TICKET_FIELDS, row)) if row else None
+
+    def get(self, ticket_id: str) -> Optional[dict]:
+        row = self._connection.execute(_SELECT_BY_ID, (ticket_id,)).fetchone()
+        return dict(zip(_TICKET_FIELDS, row)) if row else None
+
+    def sync(self) -> None:
+        self._connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class JsonlTicketSink(TicketSink):
+    """Tickets appended to a JSON Lines log, one write per batch.
+
+    Idempotency keys already in the log are indexed when it is opened.
+    With ``sync_each_write`` every batch is fsynced before it is reported
+    as written.
+    """
+
+    def __init__(self, path: str, sync_each_write: bool = True):
+        self.path = path
+        self.sync_each_write = sync_each_write
+        self._by_key: Dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                for line in file:
+                    ticket, key = self._parse(line)
+                    if ticket is not None and key is not None:
+                        self._by_key[key] = ticket
+        self._file = open(path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _parse(line: str) -> Tuple[Optional[dict], Optional[str]]:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None, None  # torn final line from a crash mid-write
+        key = record.pop("idempotency_key", None)
+        return record, key
+
+    def write_batch(self, records: List[TicketRecord]) -> List[WriteResult]:
+        stored: List[WriteResult] = []
+        lines = []
+        for ticket, key in records:
+            if key is not None and key in self._by_key:
+                stored.append(self._by_key[key])
+                continue
+            lines.append(json.dumps({**ticket, "idempotency_key": key}) + "\n")
+            if key is not None:
+                self._by_key[key] = ticket
+            stored.append(ticket)
+        if lines:
+            self._file.write("".join(lines))
+            self._file.flush()
+            if self.sync_each_write:
+                os.fsync(self._file.fileno())
+        return stored
+
+    def find_by_key(self, idempotency_key: str) -> Optional[dict]:
+        return self._by_key.get(idempotency_key)
+
+    def get(self, ticket_id: str) -> Optional[dict]:
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                ticket, _ = self._parse(line)
+                if ticket is not None and ticket.get("ticket_id") == ticket_id:
+                    return ticket
+        return None
+
+    def sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class TicketStore:
+    """Queue new tickets and write them to a sink in batches.
+
+    A background task started on first use drains the queue at most every
+    ``flush_interval`` seconds, or as soon as ``batch_size`` tickets are
+    waiting, on a single writer thread so the event loop never blocks on
+    disk. ``fsync`` picks one of ``FSYNC_POLICIES`` to trade latency for
+    durability.
+
+    Retried calls are deduplicated by idempotency key: the first call with a
+    key creates the ticket and later calls get that ticket back, including
+    calls that race with the first. Recent keys are remembered in memory
+    (up to ``key_cache_size``) and older ones are looked up in the sink.
+    A call with a key always waits for its write, whatever the ``fsync``
+    policy, because another worker may have stored the key first and its
+    ticket is the one to return.
+    """
+
+    def __init__(
+        self,
+        sink: TicketSink,
+        fsync: str = "batch",
+        batch_size: int = 100,
+        flush_interval: float = 0.05,
+        fsync_interval: float = 1.0,
+        key_cache_size: int = 10_000,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.sink = sink
+        self.fsync = fsync
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.key_cache_size = key_cache_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ticket-writer"
+        )
+        self._pending: List[Tuple[dict, Optional[str], Optional[asyncio.Future]]] = []
+        self._keys: "OrderedDict[str, Union[dict, asyncio.Task]]" = OrderedDict()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._unsynced = False
+        self._last_sync = time.monotonic()
+        self._closed = False
+        self._sink_closed = False
+        self.written = 0
+        self.batches = 0
+
+    async def _run(self, fn: Callable[[], T]) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn)
+
+    def _ensure_flusher(self) -> None:
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._flush_loop(), name="ticket-flusher")
+
+    async def add(self, ticket: dict, idempotency_key: Optional[str] = None) -> dict:
+        """Store ``ticket`` and return it (or the ticket already under the key)."""
+        if self._closed:
+            raise RuntimeError("Ticket store is closed")
+        if idempotency_key is None:
+            return await self._enqueue(ticket, None)
+
+        entry = self._keys.get(idempotency_key)
+        if entry is None:
+            entry = asyncio.ensure_future(self._add_once(ticket, idempotency_key))
+            entry.add_done_callback(lambda task: self._settle(idempotency_key, task))
+            self._remember(idempotency_key, entry)
+        else:
+            self._keys.move_to_end(idempotency_key)
+        if isinstance(entry, dict):
+            return entry
+        # Shielded so a cancelled caller does not cancel the shared creation
+        return await asyncio.shield(entry)
+
+    async def _add_once(self, ticket: dict, idempotency_key: str) -> dict:
+        existing = await self._run(lambda: self.sink.find_by_key(idempotency_key))
+        if existing is not None:
+            return existing
+        return await self._enqueue(ticket, idempotency_key)
+
+    def _remember(self, idempotency_key: str, entry) -> None:
+        self._keys[idempotency_key] = entry
+        while len(self._keys) > self.key_cache_size:
+            self._keys.popitem(last=False)
+
+    def _settle(self, idempotency_key: str, task: asyncio.Task) -> None:
+        if self._keys.get(idempotency_key) is not task:
+            return
+        if task.cancelled() or task.exception() is not None:
+            # Let a retry try again instead of replaying the failure
+            del self._keys[idempotency_key]
+        else:
+            self._keys[idempotency_key] = task.result()
+
+    async def _enqueue(self, ticket: dict, idempotency_key: Optional[str]) -> dict:
+        self._ensure_flusher()
+        if self.fsync == "always" or idempotency_key is not None:
+            written = asyncio.get_running_loop().create_future()
+            self._pending.append((ticket, idempotency_key, written))
+            self._wake.set()
+            return await written
+
+        self._pending.append((ticket, idempotency_key, None))
+        if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+            self._wake.set()
+        return ticket
+
+    async def _flush_loop(self) -> None:
+        while True:
+            if self._pending:
+                timeout = self.flush_interval  # retry after a failed write
+            elif self._unsynced:
+                timeout = self.fsync_interval  # the next interval fsync
+            else:
+                timeout = None  # idle until a ticket arrives
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            if not self._closed and self.fsync != "always":
+                if len(self._pending) < self.batch_size:
+                    # Give concurrent calls a moment to join this batch
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wake.clear()
+
+            await self.flush()
+            if self._closed:
+                return
+
+    async def flush(self) -> None:
+        """Write every queued ticket now."""
+        while self._pending:
+            batch = self._pending[: self.batch_size]
+            del self._pending[: self.batch_size]
+            records = [(ticket, key) for ticket, key, _ in batch]
+            try:
+                stored = await self._run(lambda: self.sink.write_batch(records))
+            except Exception as e:
+                logger.exception("Failed to write %d tickets", len(batch))
+                for ticket, key, written in batch:
+                    if written is not None and not written.done():
+                        written.set_exception(e)
+                # Callers that already returned keep their tickets queued
+                self._pending[:0] = [entry for entry in batch if entry[2] is None]
+                return
+
+            self.written += len(batch)
+            self.batches += 1
+            for (ticket, _, written), result in zip(batch, stored):
+                if isinstance(result, Exception):
+                    # Retrying cannot fix a taken ticket ID; fail this record only
+                    self.written -= 1
+                    logger.error(
+                        "Could not store ticket %s: %s", ticket["ticket_id"], result
+                    )
+                    if written is not None and not written.done():
+                        written.set_exception(result)
+                elif written is not None and not written.done():
+                    written.set_result(result)
+            if self.fsync == "interval":
+                self._unsynced = True
+
+        if self._unsynced and time.monotonic() - self._last_sync >= self.fsync_interval:
+            await self._run(self.sink.sync)
+            self._unsynced = False
+            self._last_sync = time.monotonic()
+
+    async def get(self, ticket_id: str) -> Optional[dict]:
+        """Return a queued or stored ticket by ID, or ``None``."""
+        for ticket, _, _ in self._pending:
+            if ticket["ticket_id"] == ticket_id:
+                return ticket
+        return await self._run(lambda: self.sink.get(ticket_id))
+
+    def stats(self) -> Dict[str, int]:
+        """Return queue and write counters."""
+        return {
+            "pending": len(self._pending),
+            "written": self.written,
+            "batches": self.batches,
+        }
+
+    async def close(self) -> None:
+        """Write queued tickets, fsync and close the sink."""
+        if self._sink_closed:
+            return
+        self._closed = True
+        if self._task is not None and not self._task.done():
+            # Let the flusher finish its current batch rather than cancel it
+            self._wake.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+        await self.flush()
+        await self._run(self.sink.sync)
+        self._executor.shutdown(wait=True)
+        self._sink_closed = True
+        self.sink.close()
+
+    def shutdown(self) -> None:
+        """Synchronously write queued tickets and close; for interpreter exit."""
+        if self._sink_closed:
+            return
+        self._closed = self._sink_closed = True
+        self._executor.shutdown(wait=True)
+        if self._pending:
+            self.sink.write_batch([(ticket, key) for ticket, key, _ in self._pending])
+            self._pending.clear()
+        self.sink.sync()
+        self.sink.close()
+
+
+def create_ticket_store(
+    backend: str,
+    path: str = "",
+    fsync: str = "batch",
+    batch_size: int = 100,
+    flush_interval: float = 0.05,
+    fsync_interval: float = 1.0,
+) -> TicketStore:
+    """Build the ticket store selected by ``backend`` ("sqlite" or "jsonl")."""
+    # Interval fsync skips the per-batch sync and relies on TicketStore.flush
+    sync_each_write = fsync != "interval"
+    if backend == "sqlite":
+        sink = SQLiteTicketSink(path or "tickets.db", sync_each_write)
+    elif backend == "jsonl":
+        sink = JsonlTicketSink(path or "tickets.jsonl", sync_each_write)
+    else:
+        raise ValueError(f"Unknown ticket backend: {backend}")
+    return TicketStore(
+        sink,
+        fsync=fsync,
+        batch_size=batch_size,
+        flush_interval=flush_interval,
+        fsync_interval=fsync_interval,
+    )
@@ -0,0 +1,92 @@
+"""Concurrent execution of model-requested MCP tool calls."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+
+@dataclass
+class ToolCall:
+    """A tool invocation requested by the model."""
+
+    id: str
+    name: str
+    arguments: dict
+
+
+@dataclass
+class ToolCallOutcome:
+    """The result, or the error, of one tool call."""
+
+    call: ToolCall
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+ToolInvoker = Callable[[ToolCall], Awaitable[Any]]
+
+
+class ToolCallScheduler:
+    """Start tool calls as soon as they are known and collect their outcomes.
+
+    Used when tool calls arrive one at a time, e.g. while a model response
+    is still streaming: each call starts running on ``submit`` instead of
+    waiting for the rest of the message.
+    """
+
+    def __init__(self, invoke: ToolInvoker, max_concurrency: Optional[int] = None):
+        self._invoke = invoke
+        self._limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._tasks: List["asyncio.Future[ToolCallOutcome]"] = []
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, call: ToolCall) -> None:
+        """Start running ``call`` in the background."""
+        self._tasks.append(asyncio.ensure_future(self._run(call)))
+
+    def reject(self, call: ToolCall, error: BaseException) -> None:
+        """Record ``call`` as failed without running it, in submission order."""
+        outcome = asyncio.get_running_loop().create_future()
+        outcome.set_result(ToolCallOutcome(call, error=error))
+        self._tasks.append(outcome)
+
+    async def _run(self, call: ToolCall) -> ToolCallOutcome:
+        try:
+            if self._limit is None:
+                return ToolCallOutcome(call, result=await self._invoke(call))
+            async with self._limit:
+                return ToolCallOutcome(call, result=await self._invoke(call))
+        except Exception as e:
+            return ToolCallOutcome(call, error=e)
+
+    async def outcomes(self) -> List[ToolCallOutcome]:
+        """Wait for every submitted call; outcomes are in submission order."""
+        return list(await asyncio.gather(*self._tasks))
+
+    def cancel(self) -> None:
+        """Cancel calls that are still running."""
+        for task in self._tasks:
+            task.cancel()
+
+
+async def execute_tool_calls(
+    calls: Sequence[ToolCall],
+    invoke: ToolInvoker,
+    max_concurrency: Optional[int] = None,
+) -> List[ToolCallOutcome]:
+    """Run ``calls`` concurrently and return outcomes in request order.
+
+    At most ``max_concurrency`` calls are in flight at once (unbounded when
+    ``None``; pass 1 for sequential execution). A call that raises is
+    recorded on its outcome and does not cancel its siblings.
+    """
+    scheduler = ToolCallScheduler(invoke, max_concurrency)
+    for call in calls:
+        scheduler.submit(call)
+    return await scheduler.outcomes()
@@ -0,0 +1,156 @@
+"""Client-side cache of MCP tool results, driven by the server's tool annotations."""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from config import Config
+
+# Key of a cached result: tool name and its arguments as canonical JSON
+ResultKey = Tuple[str, str]
+
+
+def result_key(name: str, arguments: Optional[dict]) -> ResultKey:
+    """Return the cache key of a call, independent of argument order."""
+    return name, json.dumps(
+        arguments or {}, sort_keys=True, separators=(",", ":"), default=str
+    )
+
+
+class ToolResultCache:
+    """LRU + TTL cache of tool results for tools the server marks cacheable.
+
+    ``register`` reads each tool's annotations: a ``cacheTtl`` (seconds)
+    makes its results cacheable for that long, keyed by tool name and
+    arguments. Calling a tool listed with ``invalidates`` drops the cached
+    results of the named tools. A tool without ``readOnlyHint`` that lists
+    nothing to invalidate may change anything, so calling it clears the
+    cache. Concurrent identical calls share one request, and error results
+    are never cached.
+    """
+
+    def __init__(
+        self,
+        max_size: int = Config.TOOL_RESULT_CACHE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self._clock = clock
+        self._ttls: Dict[str, float] = {}
+        # Tool name -> tools whose results it invalidates (None: all of them)
+        self._invalidates: Dict[str, Optional[frozenset]] = {}
+        self._entries: "OrderedDict[ResultKey, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[ResultKey, "asyncio.Task[Any]"] = {}
+        # Bumped on every invalidation, as in CachedCustomerRepository
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def register(self, tools: Iterable[Any]) -> None:
+        """Read caching hints from a server's MCP tool list."""
+        for tool in tools:
+            annotations = tool.annotations
+            ttl = getattr(annotations, "cacheTtl", None)
+            if ttl:
+                self._ttls[tool.name] = float(ttl)
+            else:
+                self._ttls.pop(tool.name, None)
+
+            invalidates = getattr(annotations, "invalidates", None)
+            if invalidates is not None:
+                self._invalidates[tool.name] = frozenset(invalidates)
+            elif annotations is not None and annotations.readOnlyHint:
+                self._invalidates[tool.name] = frozenset()
+            else:
+                self._invalidates[tool.name] = None
+
+    def _lookup(self, key: ResultKey) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        result, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _store(self, key: ResultKey, result: Any) -> None:
+        self._entries[key] = (result, self._clock() + self._ttls[key[0]])
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tools: Optional[Iterable[str]] = None) -> None:
+        """Drop cached results of ``tools``, or of every tool if None."""
+        self._version += 1
+        self.invalidations += 1
+        if tools is None:
+            self._entries.clear()
+            self._inflight.clear()
+            return
+        tools = frozenset(tools)
+        for store in (self._entries, self._inflight):
+            for key in [key for key in store if key[0] in tools]:
+                del store[key]
+
+    async def _load(self, key: ResultKey, call: Callable[[], Awaitable[Any]]) -> Any:
+        version = self._version
+        try:
+            result = await call()
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+        if version == self._version and not getattr(result, "isError", False):
+            self._store(key, result)
+        return result
+
+    async def call(
+        self,
+        name: str,
+        arguments: Optional[dict],
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the result of ``call()``, the tool call ``name(arguments)``.
+
+        Cacheable tools are answered from the cache while fresh; calls to
+        tools that change state invalidate the results they affect.
+        """
+        if name not in self._ttls or self.max_size <= 0:
+            try:
+                return await call()
+            finally:
+                affected = self._invalidates.get(name)
+                if affected is None or affected:
+                    self.invalidate(affected)
+
+        key = result_key(name, arguments)
+        result = self._lookup(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, call))
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+        # Shield so one cancelled caller does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """Return cache counters."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+        }
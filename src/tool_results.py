@@ -0,0 +1,77 @@
+"""Compact encoding of MCP tool results for model input."""
+
+import json
+from typing import Any, Iterable, Optional
+
+from config import Config
+
+# Fields dropped from every JSON object in a tool result, e.g. "phone,email"
+DEFAULT_DROP_FIELDS = frozenset(
+    field.strip()
+    for field in Config.TOOL_RESULT_DROP_FIELDS.split(",")
+    if field.strip()
+)
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _project(value: Any, drop_fields: frozenset) -> Any:
+    """Drop null values and ``drop_fields`` from every object in ``value``."""
+    if isinstance(value, dict):
+        return {
+            key: _project(item, drop_fields)
+            for key, item in value.items()
+            if item is not None and key not in drop_fields
+        }
+    if isinstance(value, list):
+        return [_project(item, drop_fields) for item in value]
+    return value
+
+
+def _encode_text(text: str, drop_fields: frozenset) -> str:
+    # Only JSON is re-encoded. JSON strings cannot hold a raw newline, so
+    # JSON without one is already compact and needs parsing only to drop fields
+    if not text or text[0] not in "[{" or (not drop_fields and "\n" not in text):
+        return text
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return text
+    return _encoder.encode(_project(value, drop_fields))
+
+
+def encode_tool_result(result: Any, drop_fields: Optional[Iterable[str]] = None) -> str:
+    """Encode a ``CallToolResult`` as compact text for a model.
+
+    Structured content is used when the server sent it. Otherwise each
+    text item is used. Indented JSON (the FastMCP default) is re-encoded
+    without whitespace or null values, and JSON of any layout loses
+    ``drop_fields`` (by default ``TOOL_RESULT_DROP_FIELDS``). Compact JSON
+    with nothing to drop passes through unparsed. Images, audio and other
+    binary content are replaced by a short placeholder, since their base64
+    data is of no use as text. Multiple items are joined by newlines.
+    """
+    drop = DEFAULT_DROP_FIELDS if drop_fields is None else frozenset(drop_fields)
+    structured = getattr(result, "structuredContent", None)
+    if structured is not None:
+        return _encoder.encode(_project(structured, drop))
+
+    parts = []
+    for item in result.content:
+        text = getattr(item, "text", None)
+        if text is not None:
+            parts.append(_encode_text(text, drop))
+        elif getattr(item, "type", None) == "resource":
+            resource = item.resource
+            resource_text = getattr(resource, "text", None)
+            parts.append(
+                _encode_text(resource_text, drop)
+                if resource_text is not None
+                else f"[resource {resource.uri}]"
+            )
+        else:
+            mime_type = getattr(item, "mimeType", None)
+            parts.append(
+                f"[{item.type} {mime_type}]" if mime_type else f"[{item.type}]"
+            )
+    return "\n".join(parts)
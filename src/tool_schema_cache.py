@@ -0,0 +1,124 @@
+"""On-disk cache of MCP tool schemas converted to provider formats."""
+
+import json
+import os
+import tempfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import Config
+from server_connections import tools_hash
+
+
+def to_openai_tool(tool) -> dict:
+    """Convert an MCP tool to the OpenAI function-calling format."""
+    return {
+        "type": "function",
+        "function": {
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": tool.inputSchema,
+        },
+    }
+
+
+def to_anthropic_tool(tool) -> dict:
+    """Convert an MCP tool to the Anthropic tool format."""
+    return {
+        "name": tool.name,
+        "description": tool.description,
+        "input_schema": tool.inputSchema,
+    }
+
+
+CONVERTERS: Dict[str, Callable[[object], dict]] = {
+    "openai": to_openai_tool,
+    "anthropic": to_anthropic_tool,
+}
+
+
+class ToolSchemaCache:
+    """Provider-format tool lists keyed by server identity and content hash.
+
+    Converted lists are memoized in memory and persisted to ``path`` so a
+    reconnect (or a restarted client) whose server reports the same tools
+    reuses the stored conversion. A changed tool list produces a new hash
+    and the entry is rebuilt. An empty ``path`` keeps the cache in memory.
+    """
+
+    def __init__(self, path: str = Config.TOOL_SCHEMA_CACHE_PATH):
+        self.path = path
+        self._memo: Dict[Tuple[str, str, str], List[dict]] = {}
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # A unique temporary file, so concurrent clients never share one
+        fd, temp_path = tempfile.mkstemp(
+            dir=directory or ".", prefix=f".{os.path.basename(self.path)}."
+        )
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(self._entries, file)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def provider_tools(
+        self,
+        server_id: str,
+        tools: list,
+        provider: str,
+        digest: Optional[str] = None,
+    ) -> List[dict]:
+        """Return ``tools`` converted to ``provider`` format, reusing the cache.
+
+        ``digest`` is the ``tools_hash`` of ``tools`` if the caller already
+        has it; otherwise it is computed here.
+        """
+        if digest is None:
+            digest = tools_hash(tools)
+        memo_key = (server_id, digest, provider)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+
+        entry = self._entries.get(server_id)
+        if entry is None or entry.get("hash") != digest:
+            # New server or its tool list changed: drop stale conversions
+            entry = self._entries[server_id] = {"hash": digest, "formats": {}}
+
+        converted = entry["formats"].get(provider)
+        if converted is None:
+            converted = [CONVERTERS[provider](tool) for tool in tools]
+            entry["formats"][provider] = converted
+            try:
+                self._save()
+            except OSError:
+                pass  # the cache is an optimization; keep serving from memory
+
+        self._memo[memo_key] = converted
+        return converted
+
+
+_default_cache = None
+
+
+def get_tool_schema_cache() -> ToolSchemaCache:
+    """Return the process-wide tool schema cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ToolSchemaCache()
+    return _default_cache
@@ -0,0 +1,20 @@
+"""Shared pytest configuration."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Client-side modules import their siblings as top-level modules (they are
+# run as scripts from src/), so make src/ importable for their tests.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# The server's tools open the ticket store and purchase ledger, and the
+# chatbots open a completion cache; keep their files out of the repo
+_state_dir = tempfile.mkdtemp()
+os.environ.setdefault("TICKET_STORE_PATH", os.path.join(_state_dir, "tickets.db"))
+os.environ.setdefault("PURCHASE_LEDGER_PATH", os.path.join(_state_dir, "purchases.npz"))
+os.environ.setdefault("PURCHASE_DB_PATH", os.path.join(_state_dir, "purchases.db"))
+os.environ.setdefault(
+    "COMPLETION_CACHE_PATH", os.path.join(_state_dir, "completions.db")
+)
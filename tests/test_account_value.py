@@ -0,0 +1,102 @@
+"""Tests for the vectorized account value summaries."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.account_value import (
+    decode_purchases,
+    encode_purchases,
+    summarize_cohort,
+    summarize_purchases,
+)
+
+
+def python_summary(purchases):
+    """The original calculate_account_value arithmetic."""
+    total = sum(purchases)
+    return round(total, 2), round(total / len(purchases), 2)
+
+
+def test_array_path_matches_python_sum():
+    """Test that NumPy totals round exactly like the original sum()."""
+    rng = random.Random(3)
+    for _ in range(500):
+        purchases = [
+            round(rng.uniform(0, 500), rng.choice([2, 3]))
+            for _ in range(rng.choice([1, 3, 50, 1000]))
+        ]
+        summary = summarize_purchases(
+            "c1", decode_purchases(encode_purchases(purchases))
+        )
+
+        expected = python_summary(purchases)
+        assert (summary["total_value"], summary["average_purchase"]) == expected
+        assert summary["purchase_count"] == len(purchases)
+
+
+def test_cancellation_falls_back_to_python_sum():
+    """Test that totals NumPy cannot round reliably are recomputed."""
+    purchases = [1e16, 1.0, -1e16, 0.005]
+
+    summary = summarize_purchases("c1", np.array(purchases))
+
+    assert summary["total_value"] == round(sum(purchases), 2)
+
+
+def test_empty_and_list_input():
+    """Test list input and empty histories keep the original results."""
+    assert summarize_purchases("c1", [100.0, 250.0, 75.0])["total_value"] == 425.0
+    assert summarize_purchases("c1", np.array([]))["average_purchase"] == 0.0
+
+
+def test_cohort_summaries():
+    """Test per-customer statistics from concatenated purchases."""
+    histories = {"a": [10.0, 20.0, 30.0, 40.0], "b": [], "c": [99.99]}
+    counts = [len(h) for h in histories.values()]
+    purchases = [p for h in histories.values() for p in h]
+
+    result = summarize_cohort(list(histories), counts, purchases, [0, 50, 100])
+    a, b, c = result["accounts"]
+
+    assert (a["total_value"], a["average_purchase"]) == python_summary(histories["a"])
+    assert (a["min_purchase"], a["max_purchase"]) == (10.0, 40.0)
+    assert a["percentiles"] == {"p0": 10.0, "p50": 25.0, "p100": 40.0}
+    assert b["purchase_count"] == 0 and b["min_purchase"] is None
+    assert c["percentiles"]["p50"] == 99.99
+    assert result["cohort"] == {
+        "customer_count": 3,
+        "purchase_count": 5,
+        "total_value": 199.99,
+        "average_purchase": 40.0,
+        "min_purchase": 10.0,
+        "max_purchase": 99.99,
+    }
+
+
+def test_cohort_matches_numpy_percentiles():
+    """Test segment percentiles agree with numpy.percentile per customer."""
+    rng = np.random.default_rng(5)
+    counts = rng.integers(1, 200, size=50)
+    purchases = np.round(rng.uniform(0, 500, counts.sum()), 2)
+
+    result = summarize_cohort([str(i) for i in range(50)], counts, purchases)
+
+    start = 0
+    for account, count in zip(result["accounts"], counts):
+        history = purchases[start : start + count]
+        start += count
+        expected = [round(float(v), 2) for v in np.percentile(history, [50, 90, 99])]
+        assert list(account["percentiles"].values()) == expected
+        assert account["total_value"] == round(sum(history.tolist()), 2)
+
+
+def test_invalid_input():
+    """Test malformed compact input and mismatched counts are rejected."""
+    with pytest.raises(ValueError):
+        decode_purchases("AAAA")  # 3 bytes
+    with pytest.raises(ValueError):
+        summarize_cohort(["a", "b"], [1, 1], [1.0])
+    with pytest.raises(ValueError):
+        summarize_cohort(["a"], [1], [1.0], percentiles=[101])
@@ -0,0 +1,106 @@
+"""Tests for tool calling in the Anthropic chatbot."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from anthropic.types import TextBlock, ToolUseBlock
+from mcp.types import CallToolResult, TextContent
+
+from anthropic_integration import AnthropicMCPChatBot
+from completion_cache import CompletionCache
+
+
+class _FakeMessages:
+    """Returns the queued responses in order and records each request."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    async def create(self, **kwargs):
+        # Copied, since the chatbot keeps appending to the same list
+        self.requests.append(list(kwargs["messages"]))
+        return SimpleNamespace(content=self.responses.pop(0))
+
+
+def _tool_use(block_id, name, arguments):
+    return ToolUseBlock(type="tool_use", id=block_id, name=name, input=arguments)
+
+
+def _chatbot(**kwargs):
+    bot = AnthropicMCPChatBot(
+        api_key="test",
+        stream=False,
+        completion_cache=CompletionCache(path="", ttl=60, max_entries=0),
+        **kwargs,
+    )
+    messages = _FakeMessages(
+        [
+            [
+                TextBlock(type="text", text="Let me check."),
+                _tool_use("a", "get_customers", {"customer_ids": ["12345"]}),
+                _tool_use("b", "create_support_ticket", {"customer_id": "00000"}),
+                _tool_use("c", "get_recent_customers", {"limit": 2}),
+            ],
+            [TextBlock(type="text", text="Done.")],
+        ]
+    )
+    bot.anthropic = SimpleNamespace(messages=messages)
+    return bot, messages
+
+
+def _recording_tool(events):
+    async def call_tool(call):
+        events.append(("start", call.id))
+        await asyncio.sleep(0.05)
+        events.append(("end", call.id))
+        if call.name == "create_support_ticket":
+            raise ValueError("Customer 00000 not found")
+        return CallToolResult(content=[TextContent(type="text", text=call.id)])
+
+    return call_tool
+
+
+@pytest.mark.asyncio
+async def test_tool_use_blocks_run_concurrently_and_reply_in_one_message():
+    """Test that a turn's tools overlap and all results share one user message."""
+    bot, messages = _chatbot()
+    events = []
+    bot.call_tool = _recording_tool(events)
+
+    await bot.process_query("Help customer 12345")
+
+    # Every call started before any finished
+    assert [kind for kind, _ in events[:3]] == ["start"] * 3
+    follow_up = messages.requests[1]
+    assert [m["role"] for m in follow_up] == ["user", "assistant", "user"]
+    results = follow_up[-1]["content"]
+    assert [r["tool_use_id"] for r in results] == ["a", "b", "c"]
+    assert all(r["type"] == "tool_result" for r in results)
+    assert results[0]["content"] == "a" and "is_error" not in results[0]
+    assert results[1]["content"] == "Error: Customer 00000 not found"
+    assert results[1]["is_error"] is True
+    assert results[2]["content"] == "c" and "is_error" not in results[2]
+
+
+@pytest.mark.asyncio
+async def test_tool_concurrency_of_one_runs_tools_in_order():
+    """Test that max_tool_concurrency=1 runs each tool after the previous one."""
+    bot, messages = _chatbot(max_tool_concurrency=1)
+    events = []
+    bot.call_tool = _recording_tool(events)
+
+    await bot.process_query("Help customer 12345")
+
+    assert events == [
+        ("start", "a"),
+        ("end", "a"),
+        ("start", "b"),
+        ("end", "b"),
+        ("start", "c"),
+        ("end", "c"),
+    ]
+    results = messages.requests[1][-1]["content"]
+    assert [r["tool_use_id"] for r in results] == ["a", "b", "c"]
+    assert [r.get("is_error", False) for r in results] == [False, True, False]
@@ -0,0 +1,119 @@
+"""Tests for the LLM completion cache."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from openai.types.chat import ChatCompletionMessage
+
+from completion_cache import CompletionCache, completion_key
+from openai_integration import OpenAIMCPChatBot
+
+MESSAGES = [{"role": "user", "content": "What is the status of customer 12345?"}]
+TOOLS = [{"type": "function", "function": {"name": "get_customer_info"}}]
+
+
+def test_key_is_exact_and_covers_tools():
+    """Test that content, whitespace, model and tools all change the key."""
+    key = completion_key("openai", "gpt", MESSAGES, TOOLS)
+    spaced = [{"role": "user", "content": "What is the status of\ncustomer 12345?"}]
+
+    assert completion_key("openai", "gpt", list(MESSAGES), list(TOOLS)) == key
+    assert completion_key("openai", "gpt", spaced, TOOLS) != key
+    assert completion_key("openai", "gpt", MESSAGES, []) != key
+    assert completion_key("openai", "other", MESSAGES, TOOLS) != key
+    assert completion_key("anthropic", "gpt", MESSAGES, TOOLS) != key
+    changed = [{"role": "user", "content": "What is the status of customer 67890?"}]
+    assert completion_key("openai", "gpt", changed, TOOLS) != key
+
+
+@pytest.mark.asyncio
+async def test_get_put_and_persistence(tmp_path):
+    """Test that stored completions survive reopening the database."""
+    path = str(tmp_path / "cache" / "completions.db")
+    cache = CompletionCache(path=path, ttl=60, max_entries=10)
+    assert await cache.get("a") is None
+
+    await cache.put("a", {"role": "assistant", "content": "Hello"})
+    cache.close()
+
+    reopened = CompletionCache(path=path, ttl=60, max_entries=10)
+    assert await reopened.get("a") == {"role": "assistant", "content": "Hello"}
+    assert (reopened.hits, reopened.misses) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    """Test that entries older than the TTL are misses."""
+    cache = CompletionCache(path="", ttl=0.05, max_entries=10)
+    await cache.put("a", "value")
+    assert await cache.get("a") == "value"
+
+    time.sleep(0.1)
+
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_evicted():
+    """Test that the cache stays within max_entries, keeping recent entries."""
+    cache = CompletionCache(path="", ttl=60, max_entries=2)
+    await cache.put("a", 1)
+    time.sleep(0.01)
+    await cache.put("b", 2)
+    time.sleep(0.01)
+    await cache.get("a")  # a is now more recently used than b
+    time.sleep(0.01)
+    await cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1 and await cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_size_zero_disables_the_cache():
+    """Test that max_entries=0, the default, stores nothing."""
+    cache = CompletionCache(path="", ttl=60, max_entries=0)
+    await cache.put("a", 1)
+
+    assert not cache.enabled
+    assert not CompletionCache(path="").enabled
+    assert await cache.get("a") is None
+    assert len(cache) == 0
+
+
+class _FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        message = ChatCompletionMessage(role="assistant", content="All good.")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.mark.asyncio
+async def test_chatbot_replays_cached_turns_without_the_api():
+    """Test that a repeated query is answered from the cache unless opted out."""
+    bot = OpenAIMCPChatBot(
+        api_key="test",
+        stream=False,
+        completion_cache=CompletionCache(path="", ttl=60, max_entries=10),
+    )
+    completions = _FakeCompletions()
+    bot.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    await bot.process_query("Is customer 12345 active?")
+    await bot.process_query("Is customer 12345 active?")
+    assert completions.calls == 1
+    # A streaming bot replays a cached turn rather than streaming it
+    bot.stream = True
+    await bot.process_query("Is customer 12345 active?")
+    assert completions.calls == 1
+    bot.stream = False
+    await bot.process_query("Is customer  12345 active?")
+    assert completions.calls == 2
+
+    await bot.process_query("Is customer 12345 active?", use_cache=False)
+    assert completions.calls == 3
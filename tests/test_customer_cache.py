@@ -0,0 +1,114 @@
+"""Tests for the customer cache."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.customer_cache import CachedCustomerRepository
+from src.customer_repository import InMemoryCustomerRepository
+from src.customer_store import CustomerStore
+from src.models import Customer
+
+
+class CountingRepository(InMemoryCustomerRepository):
+    """In-memory repository that counts and slows down reads."""
+
+    def __init__(self, store: CustomerStore):
+        super().__init__(store)
+        self.gets = 0
+        self.get_manys = 0
+
+    async def get(self, customer_id):
+        self.gets += 1
+        await asyncio.sleep(0.01)
+        return await super().get(customer_id)
+
+    async def get_many(self, customer_ids):
+        self.get_manys += 1
+        return await super().get_many(customer_ids)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _store(*ids: str) -> CustomerStore:
+    return CustomerStore(
+        Customer(id=cid, name=f"Customer {cid}", email=f"{cid}@example.com")
+        for cid in ids
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_are_coalesced():
+    """Test that concurrent misses for one ID trigger a single fetch."""
+    backend = CountingRepository(_store("a"))
+    cache = CachedCustomerRepository(backend)
+
+    results = await asyncio.gather(*(cache.get("a") for _ in range(10)))
+
+    assert all(c.id == "a" for c in results)
+    assert backend.gets == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 9
+
+    await cache.get("a")
+    assert backend.gets == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_and_lru_eviction():
+    """Test that entries expire after the TTL and the LRU entry is evicted."""
+    clock = FakeClock()
+    backend = CountingRepository(_store("a", "b", "c"))
+    cache = CachedCustomerRepository(backend, max_size=2, ttl_seconds=10, clock=clock)
+
+    await cache.get("a")
+    await cache.get("b")
+    await cache.get("a")  # a is now most recently used
+    await cache.get("c")  # evicts b
+    assert cache.stats()["evictions"] == 1
+
+    await cache.get("b")
+    assert backend.gets == 4
+
+    clock.now = 11
+    await cache.get("b")
+    assert backend.gets == 5
+    assert cache.stats()["expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_entries():
+    """Test that write paths drop the cached customer."""
+    backend = CountingRepository(_store("a", "b"))
+    cache = CachedCustomerRepository(backend)
+
+    await cache.get("a")
+    updated = await cache.record_interaction("a", datetime(2025, 1, 1))
+    assert (await cache.get("a")).last_interaction == updated.last_interaction
+    assert backend.gets == 2
+
+    await cache.upsert(Customer(id="a", name="Renamed", email="a@example.com"))
+    assert (await cache.get("a")).name == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_get_many_only_fetches_uncached_ids():
+    """Test that batched lookups reuse cached entries."""
+    backend = CountingRepository(_store("a", "b"))
+    cache = CachedCustomerRepository(backend)
+
+    await cache.get("a")
+    found = await cache.get_many(["a", "b", "missing"])
+
+    assert set(found) == {"a", "b"}
+    assert backend.get_manys == 1
+    assert "b" in (await cache.get_many(["b"]))
+    assert backend.get_manys == 1
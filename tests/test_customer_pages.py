@@ -0,0 +1,27 @@
+"""Tests for walking recent-customer pages from a client."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import Client
+
+from customer_pages import iter_recent_customers
+from src.main import mcp
+
+
+@pytest.mark.asyncio
+async def test_recent_customer_pages_cover_every_customer():
+    """Test that walking cursor pages returns the same customers as one call."""
+    async with Client(mcp) as client:
+        session = SimpleNamespace(call_tool=client.call_tool_mcp)
+        walked = [c async for c in iter_recent_customers(session, page_size=1)]
+        projected = [
+            c async for c in iter_recent_customers(session, 1, fields=["name"])
+        ]
+        whole = await client.call_tool_mcp("get_recent_customers", {"limit": 100})
+
+    expected = json.loads(whole.content[0].text)
+    assert expected["next_cursor"] is None
+    assert walked == expected["customers"]
+    assert projected == [{"id": c["id"], "name": c["name"]} for c in walked]
@@ -0,0 +1,136 @@
+"""Tests for the customer repository backends."""
+
+from datetime import datetime
+
+import pytest
+
+from src.customer_repository import (
+    InMemoryCustomerRepository,
+    SQLiteCustomerRepository,
+    create_customer_repository,
+)
+from src.customer_store import recency_key
+from src.models import Customer
+
+SEED = [
+    Customer(
+        id="12345",
+        name="Alice Johnson",
+        email="alice@example.com",
+        phone="+1-555-0123",
+        last_interaction=datetime(2025, 1, 2, 9, 30),
+    ),
+    Customer(
+        id="67890",
+        name="Bob Smith",
+        email="bob@example.com",
+        account_status="suspended",
+    ),
+    Customer(
+        id="24680",
+        name="Carol White",
+        email="carol@example.com",
+        last_interaction=datetime(2025, 1, 1),
+    ),
+]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+async def repository(request, tmp_path):
+    repo = create_customer_repository(
+        request.param, seed=SEED, db_path=str(tmp_path / "customers.db")
+    )
+    yield repo
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_get_and_exists(repository):
+    """Test looking customers up by ID."""
+    customer = await repository.get("12345")
+    assert customer == SEED[0]
+    assert await repository.exists("67890")
+
+    assert await repository.get("99999") is None
+    assert not await repository.exists("99999")
+
+
+@pytest.mark.asyncio
+async def test_get_many(repository):
+    """Test batched lookups return only the customers that exist."""
+    found = await repository.get_many(["67890", "99999", "12345"])
+    assert set(found) == {"12345", "67890"}
+    assert found["67890"] == SEED[1]
+
+    assert await repository.get_many([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_recent_orders_by_last_interaction(repository):
+    """Test that recent() returns the most recently active customers first."""
+    recent = await repository.recent(10)
+    assert [c.id for c in recent] == ["12345", "24680", "67890"]
+    assert [c.id for c in await repository.recent(1)] == ["12345"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_size", [1, 2, 5])
+async def test_recent_pages_walk_every_customer_once(repository, page_size):
+    """Test that keyset pages, including never-active customers, cover all."""
+    for customer_id, when in [
+        ("11111", None),
+        ("99999", None),
+        ("24681", datetime(2025, 1, 1)),  # ties with 24680 on last_interaction
+    ]:
+        await repository.upsert(
+            Customer(
+                id=customer_id, name="X", email="x@example.com", last_interaction=when
+            )
+        )
+
+    walked, before = [], None
+    while True:
+        page = await repository.recent(page_size, before)
+        walked += [c.id for c in page]
+        if len(page) < page_size:
+            break
+        before = recency_key(page[-1])
+
+    assert walked == [c.id for c in await repository.recent(10)]
+    assert walked == ["12345", "24681", "24680", "99999", "67890", "11111"]
+
+
+@pytest.mark.asyncio
+async def test_writes_update_recency(repository):
+    """Test that upserts and recorded interactions reorder customers."""
+    updated = await repository.record_interaction("67890", datetime(2025, 2, 1))
+    assert updated.last_interaction == datetime(2025, 2, 1)
+    assert (await repository.get("67890")).last_interaction == datetime(2025, 2, 1)
+
+    await repository.upsert(
+        Customer(
+            id="13579",
+            name="Dan Brown",
+            email="dan@example.com",
+            last_interaction=datetime(2025, 3, 1),
+        )
+    )
+    assert [c.id for c in await repository.recent(2)] == ["13579", "67890"]
+
+    with pytest.raises(ValueError):
+        await repository.record_interaction("99999")
+
+
+def test_create_customer_repository_backends(tmp_path):
+    """Test backend selection."""
+    assert isinstance(
+        create_customer_repository("memory", seed=SEED), InMemoryCustomerRepository
+    )
+    sqlite_repo = create_customer_repository(
+        "sqlite", seed=SEED, db_path=str(tmp_path / "customers.db")
+    )
+    assert isinstance(sqlite_repo, SQLiteCustomerRepository)
+    sqlite_repo.pool.close()
+
+    with pytest.raises(ValueError):
+        create_customer_repository("postgres")
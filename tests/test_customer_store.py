@@ -0,0 +1,80 @@
+"""Tests for the indexed customer store."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.customer_store import CustomerStore, decode_cursor, encode_cursor, recency_key
+from src.models import Customer
+
+
+def _customer(customer_id: str, minutes_ago=None) -> Customer:
+    last_interaction = (
+        datetime(2025, 1, 1) - timedelta(minutes=minutes_ago)
+        if minutes_ago is not None
+        else None
+    )
+    return Customer(
+        id=customer_id,
+        name=f"Customer {customer_id}",
+        email=f"{customer_id}@example.com",
+        last_interaction=last_interaction,
+    )
+
+
+def test_recent_returns_most_recent_first():
+    """Test that recent() matches a full sort by last interaction."""
+    store = CustomerStore(
+        [_customer("a", 30), _customer("b", 5), _customer("c"), _customer("d", 10)]
+    )
+
+    assert [c.id for c in store.recent(10)] == ["b", "d", "a", "c"]
+    assert [c.id for c in store.recent(2)] == ["b", "d"]
+    assert store.recent(0) == []
+
+
+def test_recent_pages_continue_after_the_cursor():
+    """Test that recent(before=...) returns the page after that key."""
+    store = CustomerStore(
+        [_customer("a", 30), _customer("b", 5), _customer("c"), _customer("d", 10)]
+    )
+
+    first = store.recent(2)
+    second = store.recent(2, recency_key(first[-1]))
+    last = store.recent(2, recency_key(second[-1]))
+
+    assert [c.id for c in first + second] == ["b", "d", "a", "c"]
+    assert last == []
+
+
+def test_cursor_round_trip():
+    """Test that cursors decode to the key they encode, nulls included."""
+    for customer in (_customer("a", 30), _customer("c")):
+        key = recency_key(customer)
+        assert decode_cursor(encode_cursor(key)) == key
+
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+
+
+def test_upsert_and_record_interaction_reindex():
+    """Test that writes move customers within the recency index."""
+    store = CustomerStore([_customer("a", 30), _customer("b", 5)])
+
+    store.upsert(_customer("a", 1))
+    assert [c.id for c in store.recent(2)] == ["a", "b"]
+
+    updated = store.record_interaction("b", datetime(2025, 6, 1))
+    assert updated.last_interaction == datetime(2025, 6, 1)
+    assert store["b"].last_interaction == datetime(2025, 6, 1)
+    assert [c.id for c in store.recent(2)] == ["b", "a"]
+    assert len(store) == 2
+
+
+def test_remove_drops_customer_from_index():
+    """Test removing a customer."""
+    store = CustomerStore([_customer("a", 30), _customer("b", 5)])
+
+    store.remove("b")
+    assert "b" not in store
+    assert [c.id for c in store.recent(10)] == ["a"]
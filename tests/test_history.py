@@ -0,0 +1,92 @@
+"""Tests for conversation history compaction."""
+
+from mcp.types import TextContent
+
+from history import compact_history, estimate_tokens
+
+BIG = "x" * 4000
+
+
+def _openai_history(rounds):
+    messages = [{"role": "user", "content": "Summarize customer 12345"}]
+    for n in range(rounds):
+        messages.append({"role": "assistant", "content": None, "tool_calls": [n]})
+        messages.append({"role": "tool", "tool_call_id": f"call_{n}", "content": BIG})
+    return messages
+
+
+def _anthropic_history(rounds):
+    messages = [{"role": "user", "content": "Summarize customer 12345"}]
+    for n in range(rounds):
+        messages.append({"role": "assistant", "content": [{"type": "tool_use"}]})
+        messages.append(
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": f"toolu_{n}",
+                        "content": [TextContent(type="text", text=BIG)],
+                    }
+                ],
+            }
+        )
+    return messages
+
+
+def test_within_budget_is_untouched():
+    """Test that a history under the budget is left as it is."""
+    messages = _openai_history(2)
+    original = list(messages)
+
+    total = compact_history(messages, max_tokens=100_000)
+
+    assert messages == original
+    assert total == sum(estimate_tokens(message) for message in messages)
+
+
+def test_old_openai_results_are_truncated_oldest_first():
+    """Test that old tool messages shrink and the latest round is kept."""
+    messages = _openai_history(3)
+
+    total = compact_history(messages, max_tokens=1500, truncated_chars=100)
+
+    assert total <= 1500
+    assert messages[2]["content"].startswith("x" * 100 + "... [truncated 3900")
+    assert messages[2]["tool_call_id"] == "call_0"
+    assert messages[6]["content"] == BIG  # latest round, not yet seen by the model
+    assert [m["role"] for m in messages] == [m["role"] for m in _openai_history(3)]
+
+
+def test_anthropic_tool_results_keep_their_pairing():
+    """Test that tool_result blocks keep type and tool_use_id when truncated."""
+    messages = _anthropic_history(3)
+    original_block = messages[2]["content"][0]
+
+    compact_history(messages, max_tokens=1000, truncated_chars=50)
+
+    block = messages[2]["content"][0]
+    assert block["type"] == "tool_result" and block["tool_use_id"] == "toolu_0"
+    assert block["content"].startswith("x" * 50 + "... [truncated")
+    assert original_block["content"][0].text == BIG  # copied, not mutated
+    assert messages[-1]["content"][0]["content"][0].text == BIG
+
+
+def test_compaction_is_stable_across_turns():
+    """Test that a truncated result is not truncated again on the next pass."""
+    messages = _openai_history(3)
+    compact_history(messages, max_tokens=10, truncated_chars=100)
+    once = [message["content"] for message in messages]
+
+    compact_history(messages, max_tokens=10, truncated_chars=100)
+
+    assert [message["content"] for message in messages] == once
+
+
+def test_zero_budget_disables_compaction():
+    """Test that max_tokens=0 never truncates."""
+    messages = _openai_history(3)
+
+    compact_history(messages, max_tokens=0)
+
+    assert all(m["content"] == BIG for m in messages if m["role"] == "tool")
@@ -0,0 +1,100 @@
+"""Tests for the queue-backed logging setup."""
+
+import json
+import logging
+import threading
+
+import pytest
+
+from src.logging_setup import (
+    JsonFormatter,
+    SampledLogger,
+    configure_logging,
+    stop_logging,
+    tool_log,
+)
+
+
+@pytest.fixture
+def restore_logging():
+    """Put the root logger back the way pytest configured it."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    switches = ("_srcfile", "logThreads", "logProcesses", "logMultiprocessing")
+    saved = {name: getattr(logging, name) for name in switches}
+    yield
+    for name, value in saved.items():
+        setattr(logging, name, value)
+    stop_logging()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    tool_log.rate = 1.0
+
+
+def test_json_formatter_includes_extra_fields():
+    """Test that records render as one JSON object with their extras."""
+    record = logging.LogRecord(
+        "src.main", logging.INFO, __file__, 1, "Saved %d tickets", (3,), None
+    )
+    record.customer_id = "12345"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "Saved 3 tickets"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "src.main"
+    assert entry["customer_id"] == "12345"
+
+
+def test_sampled_logger_keeps_warnings():
+    """Test that sampling drops INFO calls but never warnings."""
+    logger = logging.getLogger("test_sampled")
+    logger.setLevel(logging.INFO)
+    drop_all = SampledLogger(logger, rate=0.0)
+
+    assert not drop_all.isEnabledFor(logging.INFO)
+    assert drop_all.isEnabledFor(logging.WARNING)
+    assert SampledLogger(logger, rate=1.0).isEnabledFor(logging.INFO)
+
+
+def test_records_are_fixed_at_the_call_and_formatted_on_the_listener(
+    restore_logging, capsys, monkeypatch
+):
+    """Test that arguments and tracebacks are fixed before JSON is written."""
+    format_threads = []
+    json_format = JsonFormatter.format
+
+    def recording_format(self, record):
+        format_threads.append(threading.current_thread())
+        return json_format(self, record)
+
+    monkeypatch.setattr(JsonFormatter, "format", recording_format)
+    items = ["before"]
+    configure_logging("INFO", "json", tool_call_sample_rate=0.0)
+    logger = logging.getLogger("src.main")
+    logger.info("items %s", items, extra={"customer_id": "12345"})
+    items.append("after")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+    tool_log.info("sampled out")
+    tool_log.warning("kept")
+    logger.debug("below the level")
+    stop_logging()
+
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert [line["message"] for line in lines] == ["items ['before']", "failed", "kept"]
+    assert lines[0]["customer_id"] == "12345"
+    assert "ValueError: boom" in lines[1]["exception"]
+    assert len(format_threads) == 3
+    assert threading.current_thread() not in format_threads
+
+
+def test_unknown_log_format_is_rejected():
+    """Test that a misspelt LOG_FORMAT fails loudly."""
+    with pytest.raises(ValueError):
+        configure_logging("INFO", "xml")
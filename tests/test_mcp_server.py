@@ -1,11 +1,31 @@
 """Tests for MCP Customer Service Server."""
 
 import asyncio
+import json
+import os
+import subprocess
+import sys
 from datetime import datetime
 
 import pytest
-
-from src.main import CUSTOMERS_DB, Customer, TicketRequest
+from fastmcp import Client
+
+import src.main as main_module
+from src.config import Config
+from src.main import (
+    CUSTOMERS_DB,
+    MAX_RECENT_PAGE,
+    SAMPLE_PURCHASES,
+    Customer,
+    TicketRequest,
+    create_http_app,
+    mcp,
+    parse_args,
+    prometheus_metrics,
+)
+from src.metrics import MetricsRegistry, instrument
+from src.purchase_ledger import create_purchase_ledger
+from src.ticket_store import create_ticket_store
 
 
 # Helper functions that replicate the logic without FastMCP decorators
@@ -189,3 +209,241 @@ def test_ticket_request_validation():
             description="Test description",
             priority="invalid",
         )
+
+
+def test_parse_args_http_transport():
+    """Test selecting the HTTP transport from the command line."""
+    args = parse_args(["--transport", "streamable-http", "--port", "9000"])
+    assert args.transport == "streamable-http"
+    assert args.port == 9000
+    assert args.workers == 1
+
+
+def test_parse_args_rejects_unshared_workers():
+    """Test that multiple workers need HTTP and a shared customer backend."""
+    with pytest.raises(SystemExit):
+        parse_args(["--workers", "2"])
+    with pytest.raises(SystemExit):
+        # The default in-memory backend is not shared between workers
+        parse_args(["--transport", "streamable-http", "--workers", "2"])
+
+
+def test_parse_args_rejects_workers_with_memory_ledger(monkeypatch):
+    """Test that multiple workers need the shared SQLite purchase ledger."""
+    monkeypatch.setattr(Config, "CUSTOMER_BACKEND", "sqlite")
+    monkeypatch.setattr(Config, "TICKET_BACKEND", "sqlite")
+    argv = ["--transport", "streamable-http", "--workers", "2"]
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+
+    monkeypatch.setattr(Config, "PURCHASE_BACKEND", "sqlite")
+    assert parse_args(argv).workers == 2
+
+
+def test_parse_args_rejects_workers_sharing_a_ticket_worker_id(monkeypatch):
+    """Test that workers lease ticket worker IDs rather than inherit one."""
+    for backend in ("CUSTOMER_BACKEND", "TICKET_BACKEND", "PURCHASE_BACKEND"):
+        monkeypatch.setattr(Config, backend, "sqlite")
+    monkeypatch.setattr(Config, "TICKET_WORKER_ID", 3)
+    with pytest.raises(SystemExit):
+        parse_args(["--transport", "streamable-http", "--workers", "2"])
+
+
+def test_server_import_defers_backends():
+    """Test that NumPy, the stores and metrics load on first use, not import."""
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    deferred = [
+        "numpy",
+        "src.customer_repository",
+        "src.metrics",
+        "src.purchase_ledger",
+        "src.ticket_store",
+    ]
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, src.main; print([m for m in {deferred} if m in sys.modules])",
+        ],
+        cwd=repo_root,
+        env=dict(os.environ, PYTHONPATH=repo_root),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_create_http_app_routes_mcp_path(monkeypatch):
+    """Test the worker app factory serves the MCP endpoint."""
+    monkeypatch.setattr(main_module, "_prepare_server", lambda: None)
+    app = create_http_app()
+    assert any(getattr(route, "path", None) == "/mcp" for route in app.routes)
+
+
+@pytest.mark.asyncio
+async def test_prompt_accepts_json_encoded_steps():
+    """Test the prompt over MCP, where arguments arrive as strings."""
+    async with Client(mcp) as client:
+        result = await client.get_prompt(
+            "customer_service_response",
+            {
+                "customer_name": "Alice Johnson",
+                "issue_type": "Account Access",
+                "resolution_steps": json.dumps(["Reset password", "Log in"]),
+            },
+        )
+
+    text = result.messages[0].content.text
+    assert "1. Reset password" in text
+    assert "2. Log in" in text
+
+
+@pytest.mark.asyncio
+async def test_create_support_ticket_is_idempotent(monkeypatch, tmp_path):
+    """Test that retrying with an idempotency key returns the same ticket."""
+    store = create_ticket_store("jsonl", path=str(tmp_path / "tickets.jsonl"))
+    monkeypatch.setattr(main_module, "_tickets", store)
+    interactions = []
+    customers = main_module.get_customer_repository()
+    record_interaction = customers.record_interaction
+
+    async def counting_record_interaction(customer_id):
+        interactions.append(customer_id)
+        await record_interaction(customer_id)
+
+    monkeypatch.setattr(customers, "record_interaction", counting_record_interaction)
+    request = {
+        "customer_id": "12345",
+        "subject": "Login issue",
+        "description": "Cannot log in",
+        "idempotency_key": "retry-42",
+    }
+
+    async with Client(mcp) as client:
+        first = await client.call_tool("create_support_ticket", {"request": request})
+        retry = await client.call_tool("create_support_ticket", {"request": request})
+    await store.close()
+
+    assert json.loads(first[0].text) == json.loads(retry[0].text)
+    assert store.written == 1
+    # Only the call that created the ticket counts as an interaction
+    assert interactions == ["12345"]
+
+
+def test_server_import_opens_no_database(tmp_path):
+    """Test that importing the server creates no database in the cwd."""
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=repo_root)
+    env.pop("TICKET_STORE_PATH", None)
+    subprocess.run(
+        [sys.executable, "-c", "import src.main"],
+        cwd=tmp_path,
+        env=env,
+        check=True,
+    )
+
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_calculate_account_value_from_ledger():
+    """Test valuing an account by customer ID from recorded purchases."""
+    async with Client(mcp) as client:
+        all_time = await client.call_tool(
+            "calculate_account_value", {"customer_id": "12345"}
+        )
+        since_february = await client.call_tool(
+            "calculate_account_value",
+            {"customer_id": "12345", "start_date": "2025-02-01T00:00:00"},
+        )
+
+    assert json.loads(all_time[0].text)["total_value"] == 425.0
+    assert json.loads(since_february[0].text)["total_value"] == 325.0
+
+
+@pytest.mark.asyncio
+async def test_purchase_tools_with_sqlite_ledger(monkeypatch, tmp_path):
+    """Test recording and valuing purchases in the shared SQLite ledger."""
+    ledger = create_purchase_ledger(
+        "sqlite", db_path=str(tmp_path / "purchases.db"), seed=SAMPLE_PURCHASES
+    )
+    monkeypatch.setattr(main_module, "_purchases", ledger)
+
+    async with Client(mcp) as client:
+        recorded = await client.call_tool(
+            "record_purchase", {"customer_id": "67890", "amount": 50.01}
+        )
+        cohort = await client.call_tool(
+            "calculate_cohort_account_values", {"customer_ids": ["12345", "67890"]}
+        )
+    ledger.close()
+
+    assert json.loads(recorded[0].text)["total_value"] == 100.0
+    totals = [
+        account["total_value"] for account in json.loads(cohort[0].text)["accounts"]
+    ]
+    assert totals == [425.0, 100.0]
+
+
+@pytest.mark.asyncio
+async def test_requests_are_instrumented(monkeypatch):
+    """Test that tools, resources and prompts are timed and sized."""
+    registry = MetricsRegistry()
+    monkeypatch.setattr(main_module, "_metrics", registry)
+    # Instrument a copy of the handlers, so other tests run unwrapped
+    handlers = dict(mcp._mcp_server.request_handlers)
+    monkeypatch.setattr(mcp._mcp_server, "request_handlers", handlers)
+    instrument(mcp, registry)
+
+    async with Client(mcp) as client:
+        await client.call_tool("get_customers", {"customer_ids": ["12345"]})
+        await client.call_tool("calculate_account_value", {"customer_id": "12345"})
+        await client.read_resource("customer://12345")
+        with pytest.raises(Exception):
+            await client.read_resource("customer://00000")
+        await client.get_prompt(
+            "customer_service_response",
+            {
+                "customer_name": "Alice",
+                "issue_type": "Billing",
+                "resolution_steps": "Check invoice",
+            },
+        )
+        response = await prometheus_metrics(None)
+
+    summary = registry.summary()
+    assert summary["tool:get_customers"]["calls"] == 1
+    assert summary["tool:get_customers"]["response_bytes"] > 0
+    assert summary["resource:customer://{customer_id}"]["calls"] == 2
+    assert summary["resource:customer://{customer_id}"]["errors"] == 1
+    assert summary["prompt:customer_service_response"]["calls"] == 1
+    assert b'mcp_requests_total{kind="tool",name="get_customers"} 1' in response.body
+
+
+@pytest.mark.asyncio
+async def test_recent_customer_limits_are_validated():
+    """Test that oversized pages and unknown fields are rejected."""
+    async with Client(mcp) as client:
+        too_many = await client.call_tool_mcp(
+            "get_recent_customers", {"limit": MAX_RECENT_PAGE + 1}
+        )
+        unknown = await client.call_tool_mcp(
+            "get_recent_customers", {"fields": ["password"]}
+        )
+        bad_cursor = await client.call_tool_mcp(
+            "get_recent_customers", {"cursor": "bogus"}
+        )
+
+    assert too_many.isError and unknown.isError and bad_cursor.isError
+
+
+@pytest.mark.asyncio
+async def test_recent_customers_with_zero_limit_is_an_empty_last_page():
+    """Test that limit=0 returns no customers and no cursor."""
+    async with Client(mcp) as client:
+        result = await client.call_tool_mcp("get_recent_customers", {"limit": 0})
+
+    assert not result.isError
+    assert json.loads(result.content[0].text) == {"customers": [], "next_cursor": None}
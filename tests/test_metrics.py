@@ -0,0 +1,54 @@
+"""Tests for the request metrics registry."""
+
+from src.metrics import LATENCY_BUCKETS, SIZE_BUCKETS, Histogram, MetricsRegistry
+
+
+def test_histogram_buckets_and_quantiles():
+    """Test that observations land in the first bucket that bounds them."""
+    histogram = Histogram((1, 10, 100))
+    for value in (0.5, 1, 5, 50, 500):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.count == 5
+    assert histogram.sum == 556.5
+    assert histogram.quantile(0.4) == 1
+    assert histogram.quantile(0.8) == 100
+    assert histogram.quantile(1.0) == float("inf")
+    assert Histogram((1,)).quantile(0.5) is None
+
+
+def test_summary_reports_calls_errors_and_latency():
+    """Test the compact per-series summary."""
+    registry = MetricsRegistry()
+    registry.observe("tool", "get_customers", 0.002, False, 20, 300)
+    registry.observe("tool", "get_customers", 0.004, True, 20, 0)
+
+    summary = registry.summary()["tool:get_customers"]
+
+    assert summary["calls"] == 2
+    assert summary["errors"] == 1
+    assert summary["mean_ms"] == 3.0
+    assert summary["p50_ms"] == 2.5
+    assert summary["response_bytes"] == 300
+
+
+def test_prometheus_exposition():
+    """Test counters and cumulative histogram buckets in the text format."""
+    registry = MetricsRegistry()
+    registry.observe("tool", 'odd"name', 0.003, False, 10, 100)
+    registry.observe("tool", 'odd"name', 20.0, True, 10, 100)
+
+    text = registry.render_prometheus()
+    labels = 'kind="tool",name="odd\\"name"'
+
+    assert "# TYPE mcp_requests_total counter" in text
+    assert f"mcp_requests_total{{{labels}}} 2" in text
+    assert f"mcp_request_errors_total{{{labels}}} 1" in text
+    assert f'mcp_request_duration_seconds_bucket{{{labels},le="0.0025"}} 0' in text
+    assert f'mcp_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in text
+    assert f'mcp_request_duration_seconds_bucket{{{labels},le="10.0"}} 1' in text
+    assert f'mcp_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"mcp_request_duration_seconds_count{{{labels}}} 2" in text
+    assert f'mcp_response_payload_bytes_bucket{{{labels},le="256"}} 2' in text
+    assert text.count("_bucket{") == len(LATENCY_BUCKETS) + 2 * len(SIZE_BUCKETS) + 3
@@ -0,0 +1,249 @@
+"""Tests for tool calling in the OpenAI chatbot."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from mcp.types import CallToolResult, TextContent
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessage
+
+from completion_cache import CompletionCache
+from openai_integration import OpenAIMCPChatBot
+
+
+class _FakeCompletions:
+    """Returns the queued responses in order and records each request."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    async def create(self, **kwargs):
+        # Copied, since the chatbot keeps appending to the same list
+        self.requests.append([dict(m) for m in kwargs["messages"]])
+        return self.responses.pop(0)
+
+
+def _completion(content=None, tool_calls=None):
+    message = ChatCompletionMessage.model_validate(
+        {"role": "assistant", "content": content, "tool_calls": tool_calls}
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _tool_call(call_id, name, arguments):
+    return {
+        "id": call_id,
+        "type": "function",
+        "function": {"name": name, "arguments": arguments},
+    }
+
+
+def _chatbot(responses, **kwargs):
+    bot = OpenAIMCPChatBot(
+        api_key="test",
+        completion_cache=CompletionCache(path="", ttl=60, max_entries=0),
+        **kwargs,
+    )
+    completions = _FakeCompletions(responses)
+    bot.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return bot, completions
+
+
+def _tool_messages(messages):
+    return [m for m in messages if m["role"] == "tool"]
+
+
+@pytest.mark.asyncio
+async def test_malformed_arguments_fail_only_their_call():
+    """Test that bad JSON becomes an error message while siblings still run."""
+    bot, completions = _chatbot(
+        [
+            _completion(
+                tool_calls=[
+                    _tool_call("a", "get_customers", '{"customer_ids": ["12345"]}'),
+                    _tool_call("b", "get_customers", '{"customer_ids": ['),
+                    _tool_call("c", "get_recent_customers", '{"limit": 5}'),
+                ]
+            ),
+            _completion(content="Done."),
+        ],
+        stream=False,
+    )
+    called = []
+
+    async def call_tool(call):
+        called.append(call.id)
+        await asyncio.sleep(0.1)
+        return CallToolResult(content=[TextContent(type="text", text=call.id)])
+
+    bot.call_tool = call_tool
+    start = time.perf_counter()
+    await bot.process_query("Look up customer 12345")
+    elapsed = time.perf_counter() - start
+
+    assert sorted(called) == ["a", "c"]
+    assert elapsed < 0.2  # the two valid calls ran concurrently
+    results = _tool_messages(completions.requests[1])
+    assert [m["tool_call_id"] for m in results] == ["a", "b", "c"]
+    assert results[0]["content"] == "a" and results[2]["content"] == "c"
+    assert results[1]["content"].startswith(
+        "Error: Invalid arguments for get_customers:"
+    )
+
+
+class _FakeStream:
+    """Yields chunks; a callable in the list is awaited instead of yielded."""
+
+    def __init__(self, items):
+        self.items = items
+
+    async def create(self, **kwargs):
+        assert kwargs["stream"] is True
+
+        async def chunks():
+            for item in self.items:
+                if callable(item):
+                    await item()
+                else:
+                    yield item
+
+        return chunks()
+
+
+def _chunk(content=None, tool_calls=None):
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "test",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": content, "tool_calls": tool_calls},
+                    "finish_reason": None,
+                }
+            ],
+        }
+    )
+
+
+def _tool_delta(index, arguments, call_id=None, name=None):
+    delta = {"index": index, "function": {"arguments": arguments}}
+    if call_id:
+        delta["id"] = call_id
+        delta["type"] = "function"
+        delta["function"]["name"] = name
+    return delta
+
+
+def _streaming_chatbot(items, **kwargs):
+    bot = OpenAIMCPChatBot(
+        api_key="test",
+        completion_cache=CompletionCache(path="", ttl=60, max_entries=10),
+        stream=True,
+        **kwargs,
+    )
+    bot.client = SimpleNamespace(chat=SimpleNamespace(completions=_FakeStream(items)))
+    return bot
+
+
+async def _echo_tool(call):
+    return CallToolResult(
+        content=[TextContent(type="text", text=json.dumps(call.arguments))]
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_assembles_interleaved_text_and_split_arguments(capsys):
+    """Test that text and tool deltas interleave and fragments are joined."""
+    bot = _streaming_chatbot(
+        [
+            _chunk(content="Let me "),
+            _chunk(tool_calls=[_tool_delta(0, '{"customer_', "a", "get_customers")]),
+            _chunk(content="check"),
+            _chunk(tool_calls=[_tool_delta(0, 'ids": ["12345"]}')]),
+            _chunk(tool_calls=[_tool_delta(1, '{"lim', "b", "get_recent_customers")]),
+            _chunk(tool_calls=[_tool_delta(1, 'it": 2')]),
+            _chunk(content="."),
+            _chunk(tool_calls=[_tool_delta(1, "}")]),
+            _chunk(tool_calls=[_tool_delta(2, "", "c", "get_recent_customers")]),
+        ]
+    )
+    bot.call_tool = _echo_tool
+
+    messages = [{"role": "user", "content": "Who is customer 12345?"}]
+    assistant_message, outcomes = await bot._stream_turn(messages, key="turn")
+
+    # Printed as it arrives, with a line break where a tool call started
+    assert capsys.readouterr().out == "Let me check\n.\n"
+    assert [o.call.arguments for o in outcomes] == [
+        {"customer_ids": ["12345"]},
+        {"limit": 2},
+        {},
+    ]
+    assert all(o.ok for o in outcomes)
+    assert assistant_message["content"] == "Let me check."
+    assert [c["function"]["arguments"] for c in assistant_message["tool_calls"]] == [
+        '{"customer_ids": ["12345"]}',
+        '{"limit": 2}',
+        "",
+    ]
+    # The assembled message is what a later identical turn replays
+    assert await bot.completion_cache.get("turn") == assistant_message
+
+
+@pytest.mark.asyncio
+async def test_stream_starts_tools_before_the_stream_ends():
+    """Test that a finished tool call runs while later calls still stream."""
+    started = asyncio.Event()
+
+    async def wait_for_first_tool():
+        await asyncio.wait_for(started.wait(), timeout=1)
+
+    bot = _streaming_chatbot(
+        [
+            _chunk(tool_calls=[_tool_delta(0, "{}", "a", "get_customers")]),
+            _chunk(tool_calls=[_tool_delta(1, "{", "b", "get_recent_customers")]),
+            wait_for_first_tool,
+            _chunk(tool_calls=[_tool_delta(1, "}")]),
+        ]
+    )
+
+    async def call_tool(call):
+        if call.id == "a":
+            started.set()
+        return await _echo_tool(call)
+
+    bot.call_tool = call_tool
+    _, outcomes = await bot._stream_turn([{"role": "user", "content": "Hi"}])
+
+    assert [o.call.id for o in outcomes] == ["a", "b"]
+    assert all(o.ok for o in outcomes)
+
+
+@pytest.mark.asyncio
+async def test_stream_malformed_arguments_fail_only_their_call():
+    """Test that bad streamed JSON fails its call and the turn continues."""
+    bot = _streaming_chatbot(
+        [
+            _chunk(
+                tool_calls=[_tool_delta(0, '{"customer_ids": [', "a", "get_customers")]
+            ),
+            _chunk(
+                tool_calls=[_tool_delta(1, '{"limit": 2}', "b", "get_recent_customers")]
+            ),
+        ]
+    )
+    bot.call_tool = _echo_tool
+
+    messages = [{"role": "user", "content": "Hi"}]
+    assistant_message, outcomes = await bot._stream_turn(messages, key="turn")
+
+    assert [o.ok for o in outcomes] == [False, True]
+    assert "Invalid arguments for get_customers" in str(outcomes[0].error)
+    assert outcomes[1].call.arguments == {"limit": 2}
+    assert len(assistant_message["tool_calls"]) == 2
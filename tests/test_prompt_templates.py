@@ -0,0 +1,142 @@
+"""Tests for the compiled prompt template cache."""
+
+import os
+
+import pytest
+
+from src.prompt_templates import PromptTemplate, PromptTemplateRegistry, format_steps
+
+
+def original_prompt(customer_name, issue_type, steps_text):
+    """The f-string ``customer_service_response`` used to build."""
+    return f"""
+You are a professional customer service representative.
+Generate a helpful and empathetic response for the customer.
+
+Customer: {customer_name}
+Issue Type: {issue_type}
+
+Resolution Steps:
+{steps_text}
+
+Guidelines:
+- Be professional but warm
+- Acknowledge the customer's concern
+- Provide clear, actionable steps
+- End with an offer for further assistance
+- Keep the tone positive and solution-focused
+
+Generate a complete customer service response
+following these guidelines.
+"""
+
+
+def test_bundled_template_matches_original_prompt():
+    """Test that the bundled template renders byte for byte like the f-string."""
+    registry = PromptTemplateRegistry()
+    fields = {
+        "customer_name": "Alice {Johnson}",
+        "issue_type": "Billing",
+        "steps_text": "1. Check the invoice\n2. Refund {duplicate} charge",
+    }
+
+    rendered = registry.render("customer_service_response", **fields)
+
+    assert rendered == original_prompt(**fields)
+
+
+def test_repeated_arguments_are_memoized():
+    """Test that identical renders are served from the cache."""
+    template = PromptTemplate("greeting", "Hello {name}, about {topic}.")
+
+    first = template.render(name="Alice", topic="billing")
+    second = template.render(name="Alice", topic="billing")
+    template.render(name="Bob", topic="billing")
+
+    assert first == second == "Hello Alice, about billing."
+    assert second is first
+    info = template.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the render cache stays within its size."""
+    template = PromptTemplate("greeting", "Hello {name}", cache_size=2)
+
+    template.render(name="a")
+    template.render(name="b")
+    template.render(name="a")
+    template.render(name="c")
+    template.render(name="b")
+
+    info = template.cache_info()
+    assert info.misses == 4
+    assert info.currsize == 2
+
+
+def test_invalid_templates_and_missing_fields():
+    """Test that unsupported fields fail at compile time, missing ones at render."""
+    with pytest.raises(ValueError):
+        PromptTemplate("bad", "Total: {amount:.2f}")
+    with pytest.raises(ValueError):
+        PromptTemplate("bad", "Hello {customer.name}")
+    with pytest.raises(ValueError):
+        PromptTemplate("bad", "Hello {class}")
+    with pytest.raises(TypeError):
+        PromptTemplate("greeting", "Hello {name}").render(topic="billing")
+
+
+def test_template_text_is_not_evaluated():
+    """Test that quotes, braces and backslashes in the text render verbatim."""
+    source = "It's \"{{literal}}\" \\n {name} '''{{__import__}}\n"
+    template = PromptTemplate("tricky", source, cache_size=0)
+
+    assert template.render(name="x") == source.format(name="x")
+    assert template.cache_info() is None
+
+
+def test_changed_template_is_reloaded(tmp_path):
+    """Test that an edited template file is picked up without a restart."""
+    path = tmp_path / "greeting.txt"
+    path.write_text("Hello {name}")
+    registry = PromptTemplateRegistry(str(tmp_path), reload_interval=0)
+
+    old = registry.get("greeting")
+    assert registry.render("greeting", name="Alice") == "Hello Alice"
+
+    path.write_text("Hi {name}!")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert registry.render("greeting", name="Alice") == "Hi Alice!"
+    assert registry.get("greeting").version != old.version
+    assert registry.versions()["greeting"]["misses"] == 1
+
+
+def test_reload_checks_are_throttled(tmp_path):
+    """Test that the file is not re-checked within the reload interval."""
+    path = tmp_path / "greeting.txt"
+    path.write_text("Hello {name}")
+    registry = PromptTemplateRegistry(str(tmp_path), reload_interval=3600)
+
+    registry.render("greeting", name="Alice")
+    path.write_text("Hi {name}!")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert registry.render("greeting", name="Alice") == "Hello Alice"
+
+
+def test_format_steps_accepts_every_argument_form():
+    """Test that JSON, newline-separated and tuple steps number the same."""
+    expected = "1. Reset your password\n2. Clear browser cache"
+
+    assert format_steps('["Reset your password", "Clear browser cache"]') == expected
+    assert format_steps("Reset your password\nClear browser cache") == expected
+    assert format_steps(("Reset your password", "Clear browser cache")) == expected
+
+
+@pytest.mark.parametrize("steps", ["42", "true", "null", '"Reset password"', "[1, 2]"])
+def test_format_steps_treats_other_json_as_text(steps):
+    """Test that JSON other than a list of strings is a single text step."""
+    assert format_steps(steps) == f"1. {steps}"
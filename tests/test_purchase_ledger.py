@@ -0,0 +1,151 @@
+"""Tests for the customer purchase ledger."""
+
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from src.purchase_ledger import (
+    PurchaseLedger,
+    SQLitePurchaseLedger,
+    create_purchase_ledger,
+    open_purchase_ledger,
+    write_snapshot,
+)
+
+
+def test_running_total_matches_sum():
+    """Test the incremental total equals sum() of the history bit for bit."""
+    rng = random.Random(11)
+    ledger = PurchaseLedger()
+    amounts = [
+        rng.choice([round(rng.uniform(0, 500), 2), rng.uniform(-1e15, 1e15), 1e-3])
+        for _ in range(2000)
+    ]
+    for amount in amounts:
+        ledger.record("c1", amount)
+
+    summary = ledger.summary("c1")
+    assert ledger.history("c1") == amounts
+    assert summary["total_value"] == round(sum(amounts), 2)
+    assert summary["average_purchase"] == round(sum(amounts) / len(amounts), 2)
+    assert summary["purchase_count"] == len(amounts)
+
+
+def test_date_range_summary():
+    """Test filtering purchases to a half-open date range."""
+    ledger = PurchaseLedger()
+    ledger.record("c1", 100.0, datetime(2025, 1, 15))
+    ledger.record("c1", 250.0, datetime(2025, 2, 3))
+    ledger.record("c1", 75.0, datetime(2025, 3, 1))
+
+    february = ledger.summary("c1", datetime(2025, 2, 1), datetime(2025, 3, 1))
+    since_february = ledger.summary("c1", start=datetime(2025, 2, 1))
+
+    assert (february["total_value"], february["purchase_count"]) == (250.0, 1)
+    assert since_february["total_value"] == 325.0
+    assert ledger.summary("unknown")["purchase_count"] == 0
+
+
+def test_save_and_load(tmp_path):
+    """Test the columnar file round-trips purchases and totals."""
+    path = str(tmp_path / "purchases.npz")
+    ledger = PurchaseLedger()
+    for i in range(20):
+        ledger.record("c1", 10.5 + i, datetime(2025, 1, 1 + i))
+    ledger.record("c2", 99.99)
+    assert ledger.dirty
+    ledger.save(path)
+    assert not ledger.dirty
+
+    loaded = open_purchase_ledger(path, seed=[("ignored", 1.0, datetime.now())])
+
+    assert "ignored" not in loaded
+    assert loaded.history("c1") == ledger.history("c1")
+    assert loaded.summary("c2") == ledger.summary("c2")
+    assert loaded.summary("c1", start=datetime(2025, 1, 10)) == ledger.summary(
+        "c1", start=datetime(2025, 1, 10)
+    )
+
+
+def test_cohort_purchases():
+    """Test concatenating several customers' purchases for a cohort."""
+    ledger = PurchaseLedger()
+    ledger.record("a", 1.0)
+    ledger.record("b", 2.0)
+    ledger.record("a", 3.0)
+
+    counts, purchases = ledger.cohort_purchases(["a", "missing", "b"])
+
+    assert counts == [2, 0, 1]
+    assert purchases.tolist() == [1.0, 3.0, 2.0]
+
+
+def test_rejects_non_finite_amounts():
+    """Test that NaN and infinite amounts are rejected."""
+    with pytest.raises(ValueError):
+        PurchaseLedger().record("c1", float("nan"))
+
+
+def test_concurrent_saves_use_separate_temp_files(tmp_path):
+    """Test that writers racing on one path each write their own temp file."""
+    path = str(tmp_path / "purchases.npz")
+    ledgers = [PurchaseLedger(), PurchaseLedger()]
+    ledgers[0].record("a", 1.0)
+    ledgers[1].record("b", 2.0)
+
+    with ThreadPoolExecutor(2) as pool:
+        for _ in range(20):
+            list(
+                pool.map(
+                    lambda ledger: write_snapshot(path, ledger.snapshot()), ledgers
+                )
+            )
+
+    assert len(open_purchase_ledger(path)) == 1
+    assert os.listdir(tmp_path) == ["purchases.npz"]
+
+
+def test_sqlite_ledger_is_shared_between_processes(tmp_path):
+    """Test two SQLite ledgers on one file (as two workers) see every purchase."""
+    path = str(tmp_path / "purchases.db")
+    seed = [("a", 5.0, datetime(2025, 1, 1))]
+    first = create_purchase_ledger("sqlite", db_path=path, seed=seed)
+    second = create_purchase_ledger("sqlite", db_path=path, seed=seed)
+
+    first.record("a", 10.0, datetime(2025, 2, 1))
+    second.record("b", 2.5)
+
+    # Seeded once, and no save needed for the other worker to see purchases
+    assert second.history("a") == [5.0, 10.0]
+    assert first.summary("b")["total_value"] == 2.5
+    assert first.summary("a", start=datetime(2025, 1, 15))["purchase_count"] == 1
+    assert len(first) == 2 and "b" in first and "missing" not in first
+    first.close()
+    second.close()
+
+
+def test_sqlite_ledger_matches_memory_ledger(tmp_path):
+    """Test the SQLite ledger's totals and cohorts equal the in-memory ledger's."""
+    rng = random.Random(5)
+    memory = PurchaseLedger()
+    sqlite = SQLitePurchaseLedger(str(tmp_path / "purchases.db"))
+    for i in range(300):
+        customer_id = rng.choice("abc")
+        amount = rng.choice([round(rng.uniform(0, 500), 2), rng.uniform(-1e15, 1e15)])
+        when = datetime(2025, 1, 1 + i % 28)
+        memory.record(customer_id, amount, when)
+        sqlite.record(customer_id, amount, when)
+
+    for customer_id in "abcd":
+        assert sqlite.summary(customer_id) == memory.summary(customer_id)
+    start, end = datetime(2025, 1, 5), datetime(2025, 1, 20)
+    counts, purchases = sqlite.cohort_purchases(["c", "d", "a"], start, end)
+    expected_counts, expected = memory.cohort_purchases(["c", "d", "a"], start, end)
+    assert counts == expected_counts
+    assert purchases.tolist() == expected.tolist()
+    with pytest.raises(ValueError):
+        sqlite.record("a", float("inf"))
+    sqlite.close()
@@ -0,0 +1,128 @@
+"""Tests for concurrent MCP server connections."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from mcp.types import Tool
+
+import server_connections
+from server_connections import (
+    MCPServerConnection,
+    connect_servers,
+    format_connect_report,
+)
+
+TOOLS = [
+    Tool(name="get_customers", inputSchema={"type": "object"}),
+    Tool(name="create_support_ticket", inputSchema={"type": "object"}),
+]
+
+
+class FakeSession:
+    """Stands in for ClientSession; ``config["behavior"]`` picks how it starts."""
+
+    def __init__(self, config, write):
+        self.behavior = config["behavior"]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def initialize(self):
+        if self.behavior == "hang":
+            await asyncio.sleep(3600)
+        if self.behavior == "raise":
+            raise ConnectionError("server exited")
+        await asyncio.sleep(0.05)
+
+    async def list_tools(self):
+        return SimpleNamespace(tools=TOOLS)
+
+
+@pytest.fixture(autouse=True)
+def fake_servers(monkeypatch):
+    @asynccontextmanager
+    async def transport(self):
+        # The "read stream" is the config, so the fake session can see it
+        yield self.config, None
+
+    monkeypatch.setattr(MCPServerConnection, "_transport", transport)
+    monkeypatch.setattr(server_connections, "ClientSession", FakeSession)
+
+
+@pytest.mark.asyncio
+async def test_connect_lists_tools_and_closes():
+    """Test that a connection initializes, lists tools and shuts down."""
+    connection = MCPServerConnection("ok", {"behavior": "ok"})
+
+    await connection.connect(timeout=1)
+
+    assert connection.connected
+    assert [t.name for t in connection.tools] == [
+        "get_customers",
+        "create_support_ticket",
+    ]
+    assert connection.connect_seconds >= 0.05
+    await connection.close()
+    assert not connection.connected
+
+
+@pytest.mark.asyncio
+async def test_connect_raises_and_records_failures():
+    """Test that connect raises a timeout or server error and records it."""
+    hanging = MCPServerConnection("hang", {"behavior": "hang"})
+    with pytest.raises(asyncio.TimeoutError):
+        await hanging.connect(timeout=0.1)
+    assert isinstance(hanging.error, asyncio.TimeoutError)
+    assert not hanging.connected
+
+    broken = MCPServerConnection("raise", {"behavior": "raise"})
+    with pytest.raises(ConnectionError):
+        await broken.connect(timeout=1)
+    assert isinstance(broken.error, ConnectionError)
+    assert not broken.connected
+
+
+@pytest.mark.asyncio
+async def test_connect_servers_isolates_slow_and_failing_servers():
+    """Test that a hung server times out without delaying the others."""
+    servers = {
+        "slow": {"behavior": "hang"},
+        "fast": {"behavior": "ok"},
+        "broken": {"behavior": "raise"},
+        "second": {"behavior": "ok"},
+    }
+
+    start = time.perf_counter()
+    connections = await connect_servers(servers, timeout=0.3)
+    elapsed = time.perf_counter() - start
+
+    # Bounded by the one timeout, not a sum of per-server waits
+    assert elapsed < 0.5
+    assert [c.name for c in connections] == ["slow", "fast", "broken", "second"]
+    slow, fast, broken, second = connections
+    assert isinstance(slow.error, asyncio.TimeoutError)
+    assert slow.connect_seconds >= 0.3
+    assert fast.connected and second.connected
+    assert fast.connect_seconds < 0.2
+    assert isinstance(broken.error, ConnectionError)
+
+    report = format_connect_report(connections).splitlines()
+    assert report[0] == "Server connect timings:"
+    assert report[1].startswith("   - slow: 0.3") and report[1].endswith("(timed out)")
+    assert report[2].endswith("(2 tools)")
+    assert report[3].endswith("(failed: server exited)")
+    assert [line.split(":")[0] for line in report[1:]] == [
+        "   - slow",
+        "   - fast",
+        "   - broken",
+        "   - second",
+    ]
+
+    for connection in connections:
+        await connection.close()
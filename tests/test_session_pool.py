@@ -0,0 +1,166 @@
+"""Tests for the shared MCP session pool."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from mcp.types import Tool, ToolAnnotations
+
+import session_pool
+from session_pool import MCPSessionPool, server_key
+
+TOOLS = [
+    Tool(
+        name="ping_tool",
+        inputSchema={"type": "object"},
+        annotations=ToolAnnotations(readOnlyHint=True),
+    ),
+    Tool(
+        name="upsert_tool",
+        inputSchema={"type": "object"},
+        annotations=ToolAnnotations(readOnlyHint=False, idempotentHint=True),
+    ),
+    Tool(
+        name="create_tool",
+        inputSchema={"type": "object"},
+        annotations=ToolAnnotations(readOnlyHint=False),
+    ),
+]
+
+
+class FakeSession:
+    def __init__(self):
+        self.alive = True
+        self.pings = 0
+        self.drop_on_call = False
+
+    async def send_ping(self):
+        self.pings += 1
+        if not self.alive:
+            raise ConnectionError("server gone")
+
+    async def list_tools(self):
+        return SimpleNamespace(tools=TOOLS)
+
+    async def call_tool(self, name, arguments=None):
+        if self.drop_on_call:
+            self.alive = False
+        if not self.alive:
+            raise ConnectionError("server gone")
+        return f"{name}:{arguments}"
+
+
+class FakeConnection:
+    started = 0
+
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+        self.session = None
+        self.closed = False
+
+    @property
+    def connected(self):
+        return self.session is not None and self.session.alive and not self.closed
+
+    async def connect(self, timeout=None):
+        FakeConnection.started += 1
+        await asyncio.sleep(0.01)
+        self.session = FakeSession()
+
+    async def close(self):
+        self.closed = True
+
+
+CONFIG = {"command": "python", "args": ["src/main.py"]}
+
+
+@pytest.fixture(autouse=True)
+def fake_connections(monkeypatch):
+    FakeConnection.started = 0
+    monkeypatch.setattr(session_pool, "MCPServerConnection", FakeConnection)
+
+
+def test_server_key_is_order_independent():
+    """Test that the pool key ignores dict ordering."""
+    assert server_key({"a": 1, "b": [2]}) == server_key({"b": [2], "a": 1})
+    assert server_key({"a": 1}) != server_key({"a": 2})
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_reused():
+    """Test that released sessions are handed to the next borrower."""
+    pool = MCPSessionPool(size=2)
+
+    async with pool.session(CONFIG) as first:
+        pass
+    async with pool.session(CONFIG) as second:
+        pass
+
+    assert first is second
+    assert FakeConnection.started == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_size_bounds_open_connections():
+    """Test that borrowers wait once the pool is at capacity."""
+    pool = MCPSessionPool(size=2)
+    in_use = 0
+    peak = 0
+
+    async def borrow():
+        nonlocal in_use, peak
+        async with pool.session(CONFIG):
+            in_use += 1
+            peak = max(peak, in_use)
+            await asyncio.sleep(0.01)
+            in_use -= 1
+
+    await asyncio.gather(*(borrow() for _ in range(6)))
+
+    assert peak == 2
+    assert FakeConnection.started == 2
+
+
+@pytest.mark.asyncio
+async def test_dead_sessions_are_replaced():
+    """Test health checks and reconnect on failure."""
+    pool = MCPSessionPool(size=1, health_check_interval=0)
+
+    async with pool.session(CONFIG) as session:
+        pass
+    session.alive = False
+
+    async with pool.session(CONFIG) as replacement:
+        assert replacement is not session
+        assert replacement.alive
+    assert FakeConnection.started == 2
+
+    replacement.alive = False
+    pool.health_check_interval = 3600
+    assert await pool.call_tool(CONFIG, "ping_tool", {"x": 1}) == "ping_tool:{'x': 1}"
+    assert FakeConnection.started == 3
+
+    await pool.close()
+    with pytest.raises(RuntimeError):
+        await pool.acquire(CONFIG)
+
+
+@pytest.mark.asyncio
+async def test_only_safe_tools_are_retried_after_a_dropped_connection():
+    """Test a call that may have run is retried only if repeating it is safe."""
+    pool = MCPSessionPool(size=1, health_check_interval=3600)
+
+    async def call_dropping_connection(tool_name, retry_safe=None):
+        async with pool.session(CONFIG) as session:
+            session.drop_on_call = True
+        return await pool.call_tool(CONFIG, tool_name, retry_safe=retry_safe)
+
+    with pytest.raises(ConnectionError):
+        await call_dropping_connection("create_tool")
+    assert await call_dropping_connection("upsert_tool") == "upsert_tool:None"
+    assert await call_dropping_connection("ping_tool") == "ping_tool:None"
+    assert await call_dropping_connection("create_tool", retry_safe=True)
+    with pytest.raises(ConnectionError):
+        await call_dropping_connection("ping_tool", retry_safe=False)
+    await pool.close()
@@ -0,0 +1,95 @@
+"""Tests for the ticket ID generator."""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.ticket_ids import (
+    TicketIdGenerator,
+    WorkerIdLease,
+    new_ticket_id,
+    parse_ticket_id,
+)
+
+
+def test_ids_are_unique_and_sorted():
+    """Test that IDs issued in a burst never collide and sort by issue order."""
+    generate = TicketIdGenerator(worker_id=7)
+    ids = [generate() for _ in range(10_000)]
+
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+
+
+def test_ids_are_unique_across_threads():
+    """Test that threads sharing a generator get distinct IDs."""
+    generate = TicketIdGenerator(worker_id=1)
+    results = [[] for _ in range(8)]
+
+    def worker(out):
+        out.extend(generate() for _ in range(2_000))
+
+    threads = [threading.Thread(target=worker, args=(out,)) for out in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [ticket_id for out in results for ticket_id in out]
+    assert len(set(ids)) == len(ids)
+
+
+def test_workers_do_not_collide():
+    """Test that generators with different worker IDs never share an ID."""
+    first = TicketIdGenerator(worker_id=1)
+    second = TicketIdGenerator(worker_id=2)
+
+    assert not {first() for _ in range(1000)} & {second() for _ in range(1000)}
+
+
+def test_parse_ticket_id_round_trip():
+    """Test decoding the fields of a generated ID."""
+    ticket_id = TicketIdGenerator(worker_id=0xBEEF)()
+    parts = parse_ticket_id(ticket_id)
+
+    assert ticket_id.startswith("TICKET-")
+    assert parts.worker_id == 0xBEEF
+    assert abs(parts.created_at - datetime.now(timezone.utc)) < timedelta(seconds=5)
+    assert parse_ticket_id(new_ticket_id()).worker_id >= 0
+
+
+def test_invalid_worker_id_and_ticket_id():
+    """Test that out-of-range worker IDs and malformed IDs are rejected."""
+    with pytest.raises(ValueError):
+        TicketIdGenerator(worker_id=1 << 16)
+    with pytest.raises(ValueError):
+        TicketIdGenerator()
+    with pytest.raises(ValueError):
+        parse_ticket_id("TICKET-20240101120000")
+
+
+def test_leases_give_each_process_its_own_worker_id(tmp_path):
+    """Test that leases on one database never hand out the same ID twice."""
+    path = str(tmp_path / "tickets.db")
+    leases = [WorkerIdLease(path) for _ in range(3)]
+    assert [lease.acquire() for lease in leases] == [0, 1, 2]
+
+    # A released ID is reused; an expired lease is taken over
+    leases[1].release()
+    stale = WorkerIdLease(path, ttl=-1)
+    assert WorkerIdLease(path).acquire() == 1
+    assert stale.acquire() == 3
+    assert WorkerIdLease(path).acquire() == 3
+
+
+def test_lost_lease_is_replaced_on_renewal(tmp_path):
+    """Test a worker whose lease expired and was taken gets a new ID."""
+    path = str(tmp_path / "tickets.db")
+    generate = TicketIdGenerator(lease=WorkerIdLease(path, ttl=-1))
+    assert generate.worker_id == 0
+    thief = WorkerIdLease(path)
+    assert thief.acquire() == 0
+
+    assert parse_ticket_id(generate()).worker_id == 1
+    assert thief.renew() == 0
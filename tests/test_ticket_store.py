@@ -0,0 +1,137 @@
+"""Tests for the write-behind ticket store."""
+
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from src.ticket_store import create_ticket_store
+
+
+def make_ticket(ticket_id: str, customer_id: str = "12345") -> dict:
+    return {
+        "ticket_id": ticket_id,
+        "customer_id": customer_id,
+        "subject": "Login issue",
+        "description": "Cannot log in",
+        "priority": "high",
+        "status": "open",
+        "created_at": "2025-01-02T09:30:00",
+    }
+
+
+@pytest.fixture(params=["sqlite", "jsonl"])
+def store_factory(request, tmp_path):
+    stores = []
+
+    def factory(**kwargs):
+        path = str(tmp_path / f"tickets.{request.param}")
+        store = create_ticket_store(request.param, path=path, **kwargs)
+        stores.append(store)
+        return store
+
+    yield factory
+    for store in stores:
+        store.shutdown()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fsync", ["always", "batch", "interval"])
+async def test_tickets_are_persisted(store_factory, fsync):
+    """Test that queued tickets reach the sink in batches under each policy."""
+    store = store_factory(fsync=fsync, batch_size=10, flush_interval=0.01)
+    await asyncio.gather(*(store.add(make_ticket(f"T{i}")) for i in range(25)))
+    await store.close()
+
+    assert store.written == 25
+    assert store.batches < 25
+
+    reopened = store_factory()
+    assert (await reopened.get("T7"))["subject"] == "Login issue"
+    assert await reopened.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_always_waits_for_the_write(store_factory):
+    """Test that the per-write policy returns only after the ticket is stored."""
+    store = store_factory(fsync="always")
+    await store.add(make_ticket("T1"))
+
+    assert store.stats()["pending"] == 0
+    assert store.sink.get("T1") is not None
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_deduplicates_retries(store_factory):
+    """Test that concurrent and later retries get the original ticket."""
+    store = store_factory(flush_interval=0.01)
+    results = await asyncio.gather(
+        *(store.add(make_ticket(f"T{i}"), "retry-1") for i in range(5))
+    )
+    later = await store.add(make_ticket("T9"), "retry-1")
+    await store.close()
+
+    assert {ticket["ticket_id"] for ticket in results} == {"T0"}
+    assert later["ticket_id"] == "T0"
+    assert store.written == 1
+
+    # The key survives a restart through the sink
+    reopened = store_factory()
+    assert (await reopened.add(make_ticket("T10"), "retry-1"))["ticket_id"] == "T0"
+
+
+@pytest.mark.asyncio
+async def test_queued_tickets_written_on_shutdown(tmp_path):
+    """Test that tickets still queued at exit are written synchronously."""
+    path = tmp_path / "tickets.jsonl"
+    store = create_ticket_store("jsonl", path=str(path), flush_interval=60)
+    await store.add(make_ticket("T1"))
+    store.shutdown()
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["ticket_id"] for line in lines] == ["T1"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fsync", ["batch", "interval"])
+async def test_idempotency_key_is_shared_across_workers(tmp_path, fsync):
+    """Test that a retry on another worker gets the ticket that was stored."""
+    path = str(tmp_path / "tickets.db")
+    first = create_ticket_store("sqlite", path=path, fsync=fsync)
+    second = create_ticket_store("sqlite", path=path, fsync=fsync)
+    try:
+        created = await first.add(make_ticket("T-A"), "retry-1")
+        retried = await second.add(make_ticket("T-B"), "retry-1")
+    finally:
+        await first.close()
+        await second.close()
+
+    assert created["ticket_id"] == retried["ticket_id"] == "T-A"
+
+
+@pytest.mark.asyncio
+async def test_ticket_id_collision_fails_only_that_ticket(tmp_path):
+    """Test that a taken ticket ID is reported, not retried, and spares the batch."""
+    store = create_ticket_store("sqlite", path=str(tmp_path / "tickets.db"))
+    try:
+        await store.add(make_ticket("T1"), "first")
+        results = await asyncio.gather(
+            store.add(make_ticket("T1"), "second"),
+            store.add(make_ticket("T2"), "third"),
+            return_exceptions=True,
+        )
+        assert isinstance(results[0], sqlite3.IntegrityError)
+        assert results[1]["ticket_id"] == "T2"
+        assert store.stats()["pending"] == 0
+        assert (await store.get("T1"))["ticket_id"] == "T1"
+    finally:
+        await store.close()
+
+
+def test_unknown_policy_and_backend(tmp_path):
+    """Test that invalid configuration is rejected."""
+    with pytest.raises(ValueError):
+        create_ticket_store("jsonl", path=str(tmp_path / "t.jsonl"), fsync="never")
+    with pytest.raises(ValueError):
+        create_ticket_store("postgres")
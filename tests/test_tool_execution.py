@@ -0,0 +1,90 @@
+"""Tests for concurrent tool call execution."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.tool_execution import ToolCall, ToolCallScheduler, execute_tool_calls
+
+
+@pytest.mark.asyncio
+async def test_calls_run_concurrently_and_keep_order():
+    """Test that latency is the max, not the sum, and order is preserved."""
+
+    async def invoke(call: ToolCall):
+        await asyncio.sleep(call.arguments["delay"])
+        return call.name
+
+    calls = [
+        ToolCall(id=str(i), name=f"tool{i}", arguments={"delay": delay})
+        for i, delay in enumerate([0.2, 0.05, 0.1])
+    ]
+
+    start = time.perf_counter()
+    outcomes = await execute_tool_calls(calls, invoke)
+    elapsed = time.perf_counter() - start
+
+    assert [o.call.id for o in outcomes] == ["0", "1", "2"]
+    assert [o.result for o in outcomes] == ["tool0", "tool1", "tool2"]
+    assert elapsed < 0.3
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_is_respected():
+    """Test that no more than max_concurrency calls run at once."""
+    running = 0
+    peak = 0
+
+    async def invoke(call: ToolCall):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    calls = [ToolCall(id=str(i), name="tool", arguments={}) for i in range(10)]
+    await execute_tool_calls(calls, invoke, max_concurrency=3)
+
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_do_not_cancel_siblings():
+    """Test that a failing call is captured without affecting the others."""
+
+    async def invoke(call: ToolCall):
+        if call.name == "broken":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.01)
+        return "done"
+
+    calls = [
+        ToolCall(id="1", name="broken", arguments={}),
+        ToolCall(id="2", name="working", arguments={}),
+    ]
+    outcomes = await execute_tool_calls(calls, invoke)
+
+    assert not outcomes[0].ok
+    assert str(outcomes[0].error) == "boom"
+    assert outcomes[1].ok
+    assert outcomes[1].result == "done"
+
+
+@pytest.mark.asyncio
+async def test_rejected_calls_keep_submission_order():
+    """Test that a call rejected before running is reported in its place."""
+
+    async def invoke(call: ToolCall):
+        await asyncio.sleep(0.01)
+        return call.name
+
+    scheduler = ToolCallScheduler(invoke)
+    scheduler.submit(ToolCall(id="1", name="first", arguments={}))
+    scheduler.reject(ToolCall(id="2", name="bad", arguments={}), ValueError("bad"))
+    scheduler.submit(ToolCall(id="3", name="third", arguments={}))
+    outcomes = await scheduler.outcomes()
+
+    assert [o.call.id for o in outcomes] == ["1", "2", "3"]
+    assert [o.ok for o in outcomes] == [True, False, True]
+    assert str(outcomes[1].error) == "bad"
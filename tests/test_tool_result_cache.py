@@ -0,0 +1,151 @@
+"""Tests for the client-side tool result cache."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import Client
+from mcp.types import Tool, ToolAnnotations
+
+from src.main import mcp
+from tool_result_cache import ToolResultCache
+
+
+def _tool(name, **annotations):
+    return Tool(
+        name=name,
+        inputSchema={"type": "object"},
+        annotations=ToolAnnotations(**annotations) if annotations else None,
+    )
+
+
+TOOLS = [
+    _tool("lookup", readOnlyHint=True, cacheTtl=30),
+    _tool("recent", readOnlyHint=True, cacheTtl=30),
+    _tool("update", readOnlyHint=False, invalidates=["lookup"]),
+    _tool("unannotated"),
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _counting_call(calls, result="ok"):
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return SimpleNamespace(content=result, isError=False)
+
+    return call
+
+
+@pytest.mark.asyncio
+async def test_cacheable_results_are_reused_per_arguments():
+    """Test that repeated calls hit the cache regardless of argument order."""
+    cache = ToolResultCache(max_size=10)
+    cache.register(TOOLS)
+    calls = []
+
+    await cache.call("lookup", {"id": "1", "full": True}, _counting_call(calls))
+    await cache.call("lookup", {"full": True, "id": "1"}, _counting_call(calls))
+    await cache.call("lookup", {"id": "2", "full": True}, _counting_call(calls))
+
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_the_tool_ttl():
+    """Test that a result is fetched again once its cacheTtl has passed."""
+    clock = FakeClock()
+    cache = ToolResultCache(max_size=10, clock=clock)
+    cache.register(TOOLS)
+    calls = []
+
+    await cache.call("lookup", {"id": "1"}, _counting_call(calls))
+    clock.now = 29
+    await cache.call("lookup", {"id": "1"}, _counting_call(calls))
+    clock.now = 31
+    await cache.call("lookup", {"id": "1"}, _counting_call(calls))
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_mutating_tools_invalidate_related_results():
+    """Test that a write drops the tools it names, and unknown writes drop all."""
+    cache = ToolResultCache(max_size=10)
+    cache.register(TOOLS)
+    calls = []
+    for name in ("lookup", "recent"):
+        await cache.call(name, {}, _counting_call(calls))
+
+    await cache.call("update", {}, _counting_call([]))
+    await cache.call("lookup", {}, _counting_call(calls))
+    await cache.call("recent", {}, _counting_call(calls))
+    assert len(calls) == 3  # only lookup was fetched again
+
+    await cache.call("unannotated", {}, _counting_call([]))
+    await cache.call("recent", {}, _counting_call(calls))
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_tools_and_errors_are_not_cached():
+    """Test that tools without cacheTtl and error results always run."""
+    cache = ToolResultCache(max_size=10)
+    cache.register(TOOLS)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        return SimpleNamespace(content="boom", isError=True)
+
+    await cache.call("lookup", {}, failing)
+    await cache.call("lookup", {}, failing)
+    assert len(calls) == 2
+    assert cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_are_coalesced():
+    """Test that identical in-flight calls share one request."""
+    cache = ToolResultCache(max_size=10)
+    cache.register(TOOLS)
+    calls = []
+
+    results = await asyncio.gather(
+        *(cache.call("lookup", {"id": "1"}, _counting_call(calls)) for _ in range(5))
+    )
+
+    assert len(calls) == 1
+    assert len({id(result) for result in results}) == 1
+
+
+@pytest.mark.asyncio
+async def test_server_annotations_drive_the_cache():
+    """Test that the server's tools declare TTLs and invalidations."""
+    async with Client(mcp) as client:
+        tools = await client.list_tools()
+    cache = ToolResultCache(max_size=10)
+    cache.register(tools)
+    calls = []
+
+    await cache.call(
+        "calculate_account_value", {"customer_id": "1"}, _counting_call(calls)
+    )
+    await cache.call(
+        "calculate_account_value", {"customer_id": "1"}, _counting_call(calls)
+    )
+    assert len(calls) == 1
+
+    await cache.call("record_purchase", {"customer_id": "1"}, _counting_call([]))
+    await cache.call(
+        "calculate_account_value", {"customer_id": "1"}, _counting_call(calls)
+    )
+    assert len(calls) == 2
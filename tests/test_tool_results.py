@@ -0,0 +1,67 @@
+"""Tests for compact tool result encoding."""
+
+import json
+
+import pytest
+from fastmcp import Client
+from mcp.types import CallToolResult, ImageContent, TextContent
+
+from src.main import mcp
+from tool_results import encode_tool_result
+
+
+def _result(*items, **fields):
+    return CallToolResult(content=list(items), **fields)
+
+
+def _text(text):
+    return TextContent(type="text", text=text)
+
+
+def test_indented_json_is_minified_without_nulls():
+    """Test that indented JSON loses whitespace and null values."""
+    value = [{"id": "1", "phone": None, "tags": [{"a": None, "b": 2}]}]
+    result = _result(_text(json.dumps(value, indent=2)))
+
+    assert encode_tool_result(result) == '[{"id":"1","tags":[{"b":2}]}]'
+
+
+def test_drop_fields_projects_every_object():
+    """Test that dropped fields are removed at any depth."""
+    text = '{"customers":[{"id":"1","email":"a@example.com"}],"email":"x"}'
+
+    encoded = encode_tool_result(_result(_text(text)), drop_fields=["email"])
+
+    assert encoded == '{"customers":[{"id":"1"}]}'
+
+
+def test_plain_text_and_binary_content():
+    """Test that text passes through and binary data becomes a placeholder."""
+    result = _result(
+        _text("Ticket created."),
+        ImageContent(type="image", data="aGVsbG8=", mimeType="image/png"),
+    )
+
+    assert encode_tool_result(result) == "Ticket created.\n[image image/png]"
+
+
+def test_structured_content_is_preferred():
+    """Test that structured content is encoded instead of the text items."""
+    result = _result(_text("ignored"), structuredContent={"total": 1, "x": None})
+
+    assert encode_tool_result(result) == '{"total":1}'
+
+
+@pytest.mark.asyncio
+async def test_server_results_are_compact_and_pass_through():
+    """Test that the server sends compact JSON the client does not re-parse."""
+    async with Client(mcp) as client:
+        result = await client.call_tool_mcp("get_recent_customers", {"limit": 5})
+
+    text = result.content[0].text
+    assert "\n" not in text
+    assert all(None not in c.values() for c in json.loads(text)["customers"])
+    assert encode_tool_result(result) == text
+    projected = json.loads(encode_tool_result(result, drop_fields=["email"]))
+    customers = projected["customers"]
+    assert customers and all("email" not in customer for customer in customers)
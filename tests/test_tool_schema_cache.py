@@ -0,0 +1,108 @@
+"""Tests for the tool schema cache."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from mcp.types import Tool
+
+import tool_schema_cache
+from tool_schema_cache import ToolSchemaCache
+
+TOOLS = [
+    Tool(
+        name="get_recent_customers",
+        description="Retrieve recently active customers.",
+        inputSchema={"type": "object", "properties": {"limit": {"type": "integer"}}},
+    )
+]
+
+
+def _count_conversions(monkeypatch):
+    calls = []
+    original = tool_schema_cache.CONVERTERS["openai"]
+
+    def counting(tool):
+        calls.append(tool.name)
+        return original(tool)
+
+    monkeypatch.setitem(tool_schema_cache.CONVERTERS, "openai", counting)
+    return calls
+
+
+def test_provider_formats():
+    """Test conversion to the OpenAI and Anthropic tool formats."""
+    cache = ToolSchemaCache(path="")
+
+    assert cache.provider_tools("server", TOOLS, "openai") == [
+        {
+            "type": "function",
+            "function": {
+                "name": "get_recent_customers",
+                "description": "Retrieve recently active customers.",
+                "parameters": TOOLS[0].inputSchema,
+            },
+        }
+    ]
+    assert cache.provider_tools("server", TOOLS, "anthropic") == [
+        {
+            "name": "get_recent_customers",
+            "description": "Retrieve recently active customers.",
+            "input_schema": TOOLS[0].inputSchema,
+        }
+    ]
+
+
+def test_unchanged_tools_skip_conversion_across_instances(tmp_path, monkeypatch):
+    """Test that a reconnect with the same tools reuses the disk cache."""
+    calls = _count_conversions(monkeypatch)
+    path = str(tmp_path / "cache" / "tools.json")
+
+    first = ToolSchemaCache(path).provider_tools("server", TOOLS, "openai")
+    second = ToolSchemaCache(path).provider_tools("server", TOOLS, "openai")
+
+    assert first == second
+    assert calls == ["get_recent_customers"]
+
+
+def test_changed_tools_refresh_the_entry(tmp_path, monkeypatch):
+    """Test that a changed tool list is converted again."""
+    calls = _count_conversions(monkeypatch)
+    cache = ToolSchemaCache(str(tmp_path / "tools.json"))
+    cache.provider_tools("server", TOOLS, "openai")
+
+    changed = [TOOLS[0].model_copy(update={"description": "Updated."})]
+    converted = cache.provider_tools("server", changed, "openai")
+
+    assert converted[0]["function"]["description"] == "Updated."
+    assert len(calls) == 2
+
+
+def test_known_digest_skips_hashing(monkeypatch):
+    """Test that a connection's precomputed digest is used as the key."""
+    cache = ToolSchemaCache(path="")
+    digest = tool_schema_cache.tools_hash(TOOLS)
+
+    def fail(tools):
+        raise AssertionError("tool list hashed again")
+
+    monkeypatch.setattr(tool_schema_cache, "tools_hash", fail)
+    first = cache.provider_tools("server", TOOLS, "openai", digest=digest)
+    assert cache.provider_tools("server", TOOLS, "openai", digest=digest) is first
+
+
+def test_concurrent_saves_use_separate_temp_files(tmp_path):
+    """Test that clients saving one cache file never share a temp file."""
+    path = str(tmp_path / "tools.json")
+    caches = [ToolSchemaCache(path) for _ in range(2)]
+
+    with ThreadPoolExecutor(2) as pool:
+        for i in range(20):
+            list(
+                pool.map(
+                    lambda cache: cache.provider_tools(f"server-{i}", TOOLS, "openai"),
+                    caches,
+                )
+            )
+
+    assert os.listdir(tmp_path) == ["tools.json"]
+    assert "server-19" in ToolSchemaCache(path)._entries